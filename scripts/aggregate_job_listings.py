@@ -1,29 +1,88 @@
-import os
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 import pandas as pd
-from job_scraping import scrape_job_listings
+from scripts.job_scraping import scrape_job_listings
+
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_PER_HOST_LIMIT = 4
+
+def _scrape_source(source):
+    return scrape_job_listings(
+        content=source['content'],
+        title_selector=source['title_selector'],
+        description_selector=source['description_selector'],
+        is_url=source['is_url']
+    )
+
+async def gather_job_listings(sources, max_concurrency=DEFAULT_MAX_CONCURRENCY, per_host_limit=DEFAULT_PER_HOST_LIMIT):
+    """
+    Scrape all sources concurrently and return their job listings in source order.
+
+    The blocking fetch and parse of each source runs in a worker thread. At most
+    `max_concurrency` sources are scraped at once, and at most `per_host_limit`
+    of those may target the same host.
+
+    Args:
+        sources (list): A list of source dictionaries, as for aggregate_job_listings.
+        max_concurrency (int): The maximum number of sources scraped at the same time.
+        per_host_limit (int): The maximum number of concurrent requests to a single host.
 
-def aggregate_job_listings(sources):
+    Returns:
+        list: A list with one list of job details per source.
+    """
+    loop = asyncio.get_running_loop()
+    global_limit = asyncio.Semaphore(max_concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host_limit))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        async def run_in_worker(source):
+            async with global_limit:
+                return await loop.run_in_executor(executor, _scrape_source, source)
+
+        async def scrape(source):
+            if not source['is_url']:
+                return await run_in_worker(source)
+            # Take the host slot first so a busy host does not hold a global slot
+            async with host_limits[urlparse(source['content']).netloc]:
+                return await run_in_worker(source)
+
+        return await asyncio.gather(*(scrape(source) for source in sources))
+
+def aggregate_job_listings(sources, concurrent=False, max_concurrency=DEFAULT_MAX_CONCURRENCY, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                           dedup_index=None):
     """
     Aggregate job listings from multiple sources into a single DataFrame.
 
     Args:
         sources (list): A list of dictionaries containing source information.
                         Each dictionary should have the keys 'content', 'title_selector', 'description_selector', and 'is_url'.
+        concurrent (bool): Scrape the sources concurrently with asyncio instead of one at a time.
+        max_concurrency (int): The maximum number of sources scraped at the same time in concurrent mode.
+        per_host_limit (int): The maximum number of concurrent requests to a single host in concurrent mode.
+        dedup_index (NearDuplicateIndex): Optional index used to drop listings that are near-duplicates of
+            listings from another source or an earlier run.
 
     Returns:
         pd.DataFrame: A DataFrame containing aggregated job listings.
     """
     all_job_listings = []
 
-    for source in sources:
-        job_listings = scrape_job_listings(
-            content=source['content'],
-            title_selector=source['title_selector'],
-            description_selector=source['description_selector'],
-            is_url=source['is_url']
-        )
+    if concurrent:
+        results = asyncio.run(gather_job_listings(sources, max_concurrency, per_host_limit))
+    else:
+        results = (_scrape_source(source) for source in sources)
+
+    for job_listings in results:
         all_job_listings.extend(job_listings)
 
+    if dedup_index is not None:
+        listing_count = len(all_job_listings)
+        all_job_listings = list(dedup_index.unique_listings(all_job_listings))
+        print(f"Dropped {listing_count - len(all_job_listings)} near-duplicate job listings")
+
     # Convert the list of job listings to a DataFrame
     job_listings_df = pd.DataFrame(all_job_listings)
 
@@ -59,5 +118,5 @@ if __name__ == "__main__":
         }
     ]
 
-    job_listings_df = aggregate_job_listings(sources)
+    job_listings_df = aggregate_job_listings(sources, concurrent=True)
     print(job_listings_df)
@@ -0,0 +1,69 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.job_level_categorizer import JobLevelCategorizer, legacy_categorize_job_title
+
+TITLE_WORDS = [
+    'intern', 'junior', 'entry', 'assistant', 'trainee', 'senior', 'lead', 'manager', 'specialist', 'director',
+    'vp', 'vice', 'president', 'chief', 'head', 'principal', 'engineer', 'analyst', 'accountant', 'clerk',
+    'nurse', 'officer', 'technician', 'inspector', 'counsel', 'scientist', 'developer', 'aide', 'program',
+    'data', 'software', 'tax', 'health', 'parks', 'operations', 'research',
+]
+
+def make_titles(count, unique=50000, seed=0):
+    """
+    Generate `count` job titles drawn from `unique` distinct ones, like a long title history.
+    """
+    generator = np.random.RandomState(seed)
+    pool = np.empty(unique, dtype=object)
+    for i in range(unique):
+        words = generator.choice(TITLE_WORDS, generator.randint(1, 5))
+        pool[i] = f"{' '.join(words).title()} {i}"
+    return pd.Series(pool[generator.randint(0, unique, count)])
+
+def benchmark_categorizer(titles, methods=('legacy', 'categorize', 'categorize_series')):
+    """
+    Measure how many titles per second each way of categorizing them processes.
+
+    Args:
+        titles (pd.Series): The job titles.
+        methods (iterable): Any of 'legacy' (three regex searches per row), 'categorize' (the compiled
+            pattern per row) and 'categorize_series' (vectorized over the distinct titles).
+
+    Returns:
+        list: One dictionary per method with its elapsed seconds and titles/sec.
+    """
+    categorizer = JobLevelCategorizer()
+    functions = {
+        'legacy': lambda: titles.map(legacy_categorize_job_title),
+        'categorize': lambda: titles.map(categorizer.categorize),
+        'categorize_series': lambda: categorizer.categorize_series(titles),
+    }
+    results = []
+    expected = None
+    for method in methods:
+        start = time.perf_counter()
+        levels = functions[method]().astype(object)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = levels
+        elif not levels.equals(expected):
+            raise AssertionError(f"{method} disagrees with {methods[0]}")
+        results.append({'method': method, 'elapsed': elapsed, 'titles_per_sec': len(titles) / elapsed})
+    return results
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the job title level categorizer.")
+    arg_parser.add_argument('--titles', type=int, default=10000000, help="Number of titles to categorize")
+    arg_parser.add_argument('--unique', type=int, default=50000, help="Number of distinct titles among them")
+    arg_parser.add_argument('--methods', nargs='+', default=['legacy', 'categorize', 'categorize_series'],
+                            choices=['legacy', 'categorize', 'categorize_series'])
+    args = arg_parser.parse_args()
+
+    titles = make_titles(args.titles, args.unique)
+    print(f"Categorizing {len(titles)} titles ({args.unique} distinct)")
+    for result in benchmark_categorizer(titles, args.methods):
+        print(f"{result['method']:>17}: {result['elapsed']:8.2f}s {result['titles_per_sec']:12.0f} titles/sec")
@@ -0,0 +1,58 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import time
+
+from scripts.job_scraping import available_parsers, parse_job_listings
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '../tests/fixtures')
+
+def benchmark_parsers(pages, title_selector, description_selector, repeat=20, parsers=None):
+    """
+    Measure how many pages per second each parser backend can parse.
+
+    Args:
+        pages (list): The HTML content of the pages to parse.
+        title_selector (str): The CSS selector for job titles.
+        description_selector (str): The CSS selector for job descriptions.
+        repeat (int): How many times every page is parsed per backend.
+        parsers (list): The backends to measure; defaults to all available ones.
+
+    Returns:
+        list: One dictionary per backend with its pages/sec and listings parsed per pass.
+    """
+    results = []
+    for parser in parsers or available_parsers():
+        listings = 0
+        # parse_job_listings prints every listing; keep that out of the measurement
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for page in pages:
+                    listings += len(parse_job_listings(page, title_selector, description_selector, parser))
+            elapsed = time.perf_counter() - start
+        results.append({
+            'parser': parser,
+            'pages_per_sec': len(pages) * repeat / elapsed,
+            'listings_per_pass': listings // repeat
+        })
+    return results
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the job_scraping parser backends on stored fixture pages.")
+    arg_parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help="Directory of .html fixture pages")
+    arg_parser.add_argument('--repeat', type=int, default=20, help="Number of passes over the fixture pages")
+    arg_parser.add_argument('--title-selector', default='h2.job-title')
+    arg_parser.add_argument('--description-selector', default='div.job-description')
+    args = arg_parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.fixtures, '*.html'))):
+        with open(path, 'rb') as page_file:
+            pages.append(page_file.read())
+
+    print(f"Parsing {len(pages)} fixture pages {args.repeat} times per backend")
+    for result in benchmark_parsers(pages, args.title_selector, args.description_selector, args.repeat):
+        print(f"{result['parser']:>12}: {result['pages_per_sec']:8.1f} pages/sec ({result['listings_per_pass']} listings per pass)")
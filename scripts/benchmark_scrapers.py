@@ -0,0 +1,177 @@
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+
+from scripts import http_client
+from scripts.mock_job_board import MockJobBoard
+from scripts.rate_limiter import AdaptiveRateLimiter
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def _limiter(args):
+    return AdaptiveRateLimiter(rate=args.rate, max_rate=args.rate)
+
+def _run_scrape_job_listings(board_url, args):
+    from scripts.scrape_job_listings import scrape_job_listings
+    return len(scrape_job_listings(
+        f"{board_url}/jobs", prefetch=args.prefetch, parse_workers=args.parse_workers, rate_limiter=_limiter(args)
+    ))
+
+def _run_collect_job_listings(board_url, args):
+    from scripts.collect_job_listings import collect_job_listings
+    return len(collect_job_listings(
+        f"{board_url}/jobs?q=engineer", 'h2.job-title', 'div.description', max_pages=args.pages,
+        parse_workers=args.parse_workers
+    ))
+
+def _run_job_scraping(board_url, args):
+    from scripts.job_scraping import iter_scrape_job_listings
+    return sum(
+        sum(1 for _ in iter_scrape_job_listings(f"{board_url}/jobs?page={page}", 'h2.job-title', 'div.job-description'))
+        for page in range(1, args.pages + 1)
+    )
+
+def _run_aggregate_job_listings(board_url, args):
+    from scripts.aggregate_job_listings import aggregate_job_listings
+    sources = [{
+        'content': f"{board_url}/jobs?page={page}",
+        'title_selector': 'h2.job-title',
+        'description_selector': 'div.job-description',
+        'is_url': True
+    } for page in range(1, args.pages + 1)]
+    return len(aggregate_job_listings(sources, concurrent=True))
+
+def _run_google_job_search(board_url, args):
+    from scripts.google_job_search import google_job_search
+    return len(google_job_search(
+        'software+engineer', num_pages=args.pages, rate_limiter=_limiter(args), base_url=f"{board_url}/search?q="
+    ))
+
+SCRAPERS = {
+    'scrape_job_listings': _run_scrape_job_listings,
+    'collect_job_listings': _run_collect_job_listings,
+    'job_scraping': _run_job_scraping,
+    'aggregate_job_listings': _run_aggregate_job_listings,
+    'google_job_search': _run_google_job_search,
+}
+
+def percentile(values, q):
+    """
+    Return the q-th percentile (0-100) of values, by the nearest-rank method.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(-(-q * len(ordered) // 100)))
+    return ordered[rank - 1]
+
+def measure_scraper(name, board_url, args):
+    """
+    Run one scraper against the board in this process and measure it.
+
+    Every call to http_client.get is timed, so the page latency includes
+    retries and cache lookups but not the rate limiter's waits.
+
+    Returns:
+        dict: pages, listings, elapsed seconds, pages/sec, listings/sec,
+        p50/p99 page latency in milliseconds and peak RSS in MB.
+    """
+    # Scraper names are their module names; import them before the clock starts
+    importlib.import_module(f"scripts.{name}")
+    latencies = []
+    get = http_client.get
+
+    def timed_get(*get_args, **get_kwargs):
+        start = time.perf_counter()
+        try:
+            return get(*get_args, **get_kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    http_client.get = timed_get
+    try:
+        # The scrapers print every page and listing; keep that out of the measurement
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            start = time.perf_counter()
+            listings = SCRAPERS[name](board_url, args)
+            elapsed = time.perf_counter() - start
+    finally:
+        http_client.get = get
+
+    return {
+        'scraper': name,
+        'pages': len(latencies),
+        'listings': listings,
+        'elapsed': elapsed,
+        'pages_per_sec': len(latencies) / elapsed,
+        'listings_per_sec': listings / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+def run_benchmark(board_url, scrapers, args):
+    """
+    Benchmark each scraper in its own Python process, so peak RSS is measured per scraper.
+
+    Returns:
+        list: One result dictionary per scraper, as returned by measure_scraper, or
+        {'scraper': name, 'error': message} if the scraper could not run.
+    """
+    results = []
+    for name in scrapers:
+        command = [
+            sys.executable, '-m', 'scripts.benchmark_scrapers', '--child', name, '--board-url', board_url,
+            '--pages', str(args.pages), '--rate', str(args.rate), '--prefetch', str(args.prefetch)
+        ]
+        if args.parse_workers:
+            command += ['--parse-workers', str(args.parse_workers)]
+        completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            error = (completed.stderr.strip().splitlines() or [f"exited with status {completed.returncode}"])[-1]
+            results.append({'scraper': name, 'error': error})
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return results
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the scrapers against a local mock job board.")
+    arg_parser.add_argument('--scrapers', nargs='+', choices=sorted(SCRAPERS), default=sorted(SCRAPERS))
+    arg_parser.add_argument('--pages', type=int, default=20, help="Pages with listings on the board")
+    arg_parser.add_argument('--listings-per-page', type=int, default=20)
+    arg_parser.add_argument('--latency', type=float, default=0.05, help="Seconds each response is delayed by")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500")
+    arg_parser.add_argument('--rate-limit', type=float, default=None, help="Board requests per second before 429")
+    arg_parser.add_argument('--rate', type=float, default=50.0, help="Starting request rate of rate-limited scrapers")
+    arg_parser.add_argument('--prefetch', type=int, default=4)
+    arg_parser.add_argument('--parse-workers', type=int, default=None)
+    arg_parser.add_argument('--board-url', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--child', help=argparse.SUPPRESS)
+    return arg_parser
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+
+    if args.child:
+        print(json.dumps(measure_scraper(args.child, args.board_url, args)))
+        sys.exit(0)
+
+    with MockJobBoard(args.pages, args.listings_per_page, args.latency, args.error_rate, args.rate_limit) as board:
+        print(f"Benchmarking against {board.url}: {args.pages} pages x {args.listings_per_page} listings, "
+              f"{args.latency * 1000:.0f}ms latency, {args.error_rate:.0%} errors")
+        for result in run_benchmark(board.url, args.scrapers, args):
+            if 'error' in result:
+                print(f"{result['scraper']:>24}: failed ({result['error']})")
+                continue
+            print(f"{result['scraper']:>24}: {result['pages_per_sec']:7.1f} pages/sec "
+                  f"{result['listings_per_sec']:8.1f} listings/sec "
+                  f"p50 {result['p50_ms']:6.1f}ms p99 {result['p99_ms']:6.1f}ms "
+                  f"peak RSS {result['peak_rss_mb']:6.1f}MB")
+        print(f"Board stats: {board.stats}")
@@ -1,34 +1,111 @@
+import collections
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+from scripts.columnar_store import is_csv, write_table
 
 # Define the path to the features file
 features_file = '../data/job_listings_features.csv'
 cleaned_features_file = '../data/job_listings_features_cleaned.csv'
 
+DEFAULT_CHUNKSIZE = 5000
+
+def clean_chunk(chunk):
+    """
+    Coerce every column of a chunk to numeric and drop the rows with missing numeric values.
+    """
+    # Convert only numeric columns to numeric, coercing errors to NaN
+    numeric_columns = chunk.select_dtypes(include=['number']).columns
+    chunk[numeric_columns] = chunk[numeric_columns].apply(pd.to_numeric, errors='coerce')
+    # Identify and handle non-numeric columns
+    for column in chunk.columns:
+        if chunk[column].dtype == 'object':
+            # Convert non-numeric columns to numeric, coercing errors to NaN
+            chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
+    # Drop rows with NaN values in numeric columns
+    chunk.dropna(subset=numeric_columns, inplace=True)
+    return chunk
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux; worker processes are counted separately
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own / 1024, workers / 1024
+
+def _write_chunk(chunk, output_path, index):
+    if is_csv(output_path):
+        chunk.to_csv(output_path, mode='a' if index else 'w', header=not index, index=False)
+    else:
+        # A directory of numbered part files, readable with columnar_store.read_table
+        write_table(chunk, os.path.join(output_path, f"part-{index:05d}.parquet"))
+
 # Define a function to clean the data
-def clean_data(file_path):
-    # Initialize an empty dataframe to hold the cleaned data
-    cleaned_df = pd.DataFrame()
+def clean_data(file_path, output_path=cleaned_features_file, chunksize=DEFAULT_CHUNKSIZE, workers=None,
+               max_pending=None):
+    """
+    Clean a features CSV chunk by chunk, writing each cleaned chunk as soon as it is ready.
+
+    Only the chunks being cleaned or waiting to be written are in memory, so
+    the file can be larger than RAM. With `workers`, chunks are cleaned in a
+    process pool while the main process reads and writes; results are still
+    written in input order.
+
+    Args:
+        file_path (str): The features CSV file.
+        output_path (str): A .csv file, or a directory that receives one Parquet file per chunk.
+        chunksize (int): The number of rows per chunk.
+        workers (int): The number of processes cleaning chunks; None or 1 cleans in this process.
+        max_pending (int): The maximum number of chunks submitted but not yet written; defaults to 2 * workers.
+
+    Returns:
+        str: The output path.
+    """
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if not is_csv(output_path) and os.path.isdir(output_path):
+        # Part files of an earlier, possibly longer, run would otherwise be read back with this one
+        for name in os.listdir(output_path):
+            if name.startswith('part-') and name.endswith('.parquet'):
+                os.remove(os.path.join(output_path, name))
+    start = time.perf_counter()
+    rows_in = rows_out = written = 0
+
+    def write(cleaned):
+        nonlocal rows_out, written
+        _write_chunk(cleaned, output_path, written)
+        rows_out += len(cleaned)
+        written += 1
 
     # Load the data in chunks
-    for chunk in pd.read_csv(file_path, chunksize=5000, low_memory=False):
-        # Convert only numeric columns to numeric, coercing errors to NaN
-        numeric_columns = chunk.select_dtypes(include=['number']).columns
-        chunk[numeric_columns] = chunk[numeric_columns].apply(pd.to_numeric, errors='coerce')
-        # Identify and handle non-numeric columns
-        for column in chunk.columns:
-            if chunk[column].dtype == 'object':
-                # Convert non-numeric columns to numeric, coercing errors to NaN
-                chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
-        # Drop rows with NaN values in numeric columns
-        chunk.dropna(subset=numeric_columns, inplace=True)
-        # Append the cleaned chunk to the cleaned dataframe
-        cleaned_df = pd.concat([cleaned_df, chunk], ignore_index=True)
-
-    # Save the cleaned data to a new CSV file
-    cleaned_df.to_csv(cleaned_features_file, index=False)
-    return cleaned_features_file
+    chunks = pd.read_csv(file_path, chunksize=chunksize, low_memory=False)
+    if workers and workers > 1:
+        max_pending = max_pending or 2 * workers
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in chunks:
+                rows_in += len(chunk)
+                # Wait for the oldest chunk before reading further, so memory stays bounded
+                if len(pending) >= max_pending:
+                    write(pending.popleft().result())
+                pending.append(executor.submit(clean_chunk, chunk))
+            while pending:
+                write(pending.popleft().result())
+    else:
+        for chunk in chunks:
+            rows_in += len(chunk)
+            write(clean_chunk(chunk))
+
+    elapsed = time.perf_counter() - start
+    own_rss, worker_rss = _peak_rss_mb()
+    print(f"Cleaned {rows_in} rows ({rows_out} kept) in {elapsed:.2f}s, "
+          f"{rows_in / elapsed if elapsed else 0:.0f} rows/sec, "
+          f"peak RSS {own_rss:.0f}MB (largest worker {worker_rss:.0f}MB)")
+    return output_path
 
 # Run the cleaning function
 if __name__ == "__main__":
-    cleaned_file_path = clean_data(features_file)
+    cleaned_file_path = clean_data(features_file, workers=os.cpu_count())
     print(f"Cleaned data saved to {cleaned_file_path}")
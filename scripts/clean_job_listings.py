@@ -1,20 +1,36 @@
 import json
 import os
+import sys
 
-def clean_job_listings(json_filename):
+from scripts.jsonl_store import JsonlStore
+
+def is_valid_listing(job):
+    # Listings saved by the Google scraper use job_title, older exports use jobTitle
+    title = job.get('job_title') or job.get('jobTitle') or ''
+    return "More results" not in title and "Try again" not in title
+
+def convert_json_to_jsonl(json_filename, jsonl_filename):
+    """
+    Move a legacy JSON array of listings into a JSON Lines store.
+    """
     with open(json_filename, 'r') as json_file:
         job_listings = json.load(json_file)
+    return JsonlStore(jsonl_filename).append(job_listings)
 
-    # Filter out invalid job listings
-    cleaned_job_listings = [
-        job for job in job_listings
-        if "More results" not in job['jobTitle'] and "Try again" not in job['jobTitle']
-    ]
+def clean_job_listings(jsonl_filename):
+    """
+    Drop invalid job listings from a JSON Lines store, streaming it into a compacted copy.
 
-    # Save the cleaned job listings back to the JSON file
-    with open(json_filename, 'w') as json_file:
-        json.dump(cleaned_job_listings, json_file, indent=4)
+    Returns:
+        tuple: The number of listings kept and the number dropped.
+    """
+    kept, dropped = JsonlStore(jsonl_filename).compact(is_valid_listing)
+    print(f"Kept {kept} job listings, dropped {dropped} invalid ones from {jsonl_filename}")
+    return kept, dropped
 
 if __name__ == "__main__":
-    json_filename = '../data/job_listings.json'
-    clean_job_listings(json_filename)
+    jsonl_filename = sys.argv[1] if len(sys.argv) > 1 else '../data/job_listings.jsonl'
+    legacy_filename = os.path.splitext(jsonl_filename)[0] + '.json'
+    if not os.path.exists(jsonl_filename) and os.path.exists(legacy_filename):
+        convert_json_to_jsonl(legacy_filename, jsonl_filename)
+    clean_job_listings(jsonl_filename)
@@ -1,47 +1,127 @@
-import requests
+import functools
+from contextlib import closing
+
 from bs4 import BeautifulSoup
+from scripts.crawl_pipeline import fetch_content, run_pipeline
+from scripts.fingerprint_store import UnchangedPage
+from scripts.response_cache import ResponseCache
 
-def collect_job_listings(url, title_selector, description_selector, max_pages=5):
+def parse_articles(html_content, title_selector, description_selector):
     """
-    Collect job listings from the given URL and return a list of job details.
+    Parse the job listings out of one page of search results.
 
     Args:
-        url (str): The URL of the job listings page to scrape.
+        html_content (bytes): The HTML content of the page.
         title_selector (str): The CSS selector for job titles.
         description_selector (str): The CSS selector for job descriptions.
-        max_pages (int): The maximum number of pages to scrape.
 
     Returns:
         list: A list of dictionaries containing job details.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
     job_listings = []
-    for page in range(1, max_pages + 1):
-        response = requests.get(f"{url}&page={page}", headers=headers)
-        if response.status_code != 200:
-            print(f"Failed to retrieve page {page}. Status code: {response.status_code}")
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for job_listing in soup.select("article"):
+        try:
+            title_element = job_listing.select_one(title_selector)
+            description_element = job_listing.select_one(description_selector)
+            title = title_element.text.strip() if title_element else "No title provided."
+            description = description_element.text.strip() if description_element else "No description provided."
+            print(f"Debug: Found job listing - Title: {title}, Description: {description}")
+        except AttributeError:
+            print("Error parsing job element, skipping...")
             continue
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        for job_listing in soup.select("article"):
-            try:
-                title_element = job_listing.select_one(title_selector)
-                description_element = job_listing.select_one(description_selector)
-                title = title_element.text.strip() if title_element else "No title provided."
-                description = description_element.text.strip() if description_element else "No description provided."
-                print(f"Debug: Found job listing - Title: {title}, Description: {description}")
-            except AttributeError:
-                print("Error parsing job element, skipping...")
+        job_listings.append({
+            'title': title,
+            'description': description
+        })
+    return job_listings
+
+def _fetch_page(page_url, cache=None, fingerprints=None):
+    content = fetch_content(page_url, cache=cache)
+    if content is not None and fingerprints is not None:
+        content = fingerprints.filter_page(page_url, content)
+    return content
+
+def _parse_page(content, title_selector, description_selector):
+    # Pages that have not changed since the last run are passed through without parsing
+    if isinstance(content, UnchangedPage):
+        return content
+    return parse_articles(content, title_selector, description_selector)
+
+def iter_collect_job_listings(url, title_selector, description_selector, max_pages=5, cache=None, parse_workers=None,
+                              frontier=None, fingerprints=None):
+    """
+    Collect job listings from the given URL, yielding them one at a time as each page is parsed.
+
+    Takes the same arguments as collect_job_listings.
+
+    Yields:
+        dict: The details of one job listing.
+    """
+    page_urls = [f"{url}&page={page}" for page in range(1, max_pages + 1)]
+    if frontier is not None:
+        page_urls = frontier.pending(page_urls)
+
+    if parse_workers:
+        results = run_pipeline(
+            page_urls, _parse_page, (title_selector, description_selector),
+            fetch=functools.partial(_fetch_page, cache=cache, fingerprints=fingerprints), parse_workers=parse_workers
+        )
+    else:
+        def fetch_and_parse():
+            for page_url in page_urls:
+                content = _fetch_page(page_url, cache, fingerprints)
+                yield page_url, _parse_page(content, title_selector, description_selector) if content is not None else None
+        results = fetch_and_parse()
+
+    with closing(results):
+        for page_url, page_listings in results:
+            if page_listings is None:
+                if frontier is not None:
+                    frontier.fail(page_url)
                 continue
 
-            job_listings.append({
-                'title': title,
-                'description': description
-            })
+            if isinstance(page_listings, UnchangedPage):
+                print(f"Debug: {page_url} is unchanged since the last run, skipped parsing")
+                page_listings, listing_count = [], None
+            else:
+                listing_count = len(page_listings)
+            if fingerprints is not None:
+                page_listings = list(fingerprints.new_listings(page_listings))
 
-    print(f"Debug: Final job listings - {job_listings}")
+            if frontier is not None:
+                frontier.complete(page_url, page_listings)
+            yield from page_listings
+            if fingerprints is not None and listing_count is not None:
+                fingerprints.record_page(page_url, listing_count)
+
+def collect_job_listings(url, title_selector, description_selector, max_pages=5, cache=None, parse_workers=None,
+                         frontier=None, fingerprints=None):
+    """
+    Collect job listings from the given URL and return a list of job details.
+
+    Args:
+        url (str): The URL of the job listings page to scrape.
+        title_selector (str): The CSS selector for job titles.
+        description_selector (str): The CSS selector for job descriptions.
+        max_pages (int): The maximum number of pages to scrape.
+        cache (ResponseCache): Optional response cache used to skip downloading unchanged pages.
+        parse_workers (int): If set, fetch pages in background threads and parse them in this many processes.
+        frontier (CrawlFrontier): Optional frontier that checkpoints each page, so an interrupted crawl
+            resumes where it stopped. The result then includes the listings of earlier runs of the crawl.
+        fingerprints (FingerprintStore): Optional store used to skip parsing pages that have not changed
+            and to drop listings already collected by an earlier run.
+
+    Returns:
+        list: A list of dictionaries containing job details.
+    """
+    job_listings = list(iter_collect_job_listings(
+        url, title_selector, description_selector, max_pages, cache, parse_workers, frontier, fingerprints
+    ))
+    if frontier is not None:
+        job_listings = list(frontier.listings())
+    print(f"Debug: Collected {len(job_listings)} job listings")
     return job_listings
 
 if __name__ == "__main__":
@@ -49,5 +129,6 @@ if __name__ == "__main__":
     url = "https://www.monster.com/jobs/search/?q=Software-Engineer&where=USA"
     title_selector = "h3 a"
     description_selector = "div"
-    job_listings = collect_job_listings(url, title_selector, description_selector)
+    with ResponseCache() as cache:
+        job_listings = collect_job_listings(url, title_selector, description_selector, cache=cache)
     print(job_listings)
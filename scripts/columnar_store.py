@@ -0,0 +1,134 @@
+import operator
+import os
+import uuid
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+_OPERATORS = {
+    '==': operator.eq,
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+def is_csv(path):
+    return str(path).lower().endswith('.csv')
+
+def _filter_frame(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op == 'in':
+            mask &= df[column].isin(value)
+        elif op == 'not in':
+            mask &= ~df[column].isin(value)
+        else:
+            mask &= _OPERATORS[op](df[column], value)
+    return df[mask]
+
+def read_table(path, columns=None, filters=None, **csv_kwargs):
+    """
+    Read a dataset from a CSV file, a Parquet file or a partitioned Parquet directory.
+
+    For Parquet, only the requested columns are read and the filters are
+    pushed down, so whole partitions and row groups that cannot match are
+    skipped; partition columns come back as categoricals. For CSV, the
+    columns are passed to read_csv as usecols and the filters are applied
+    after reading.
+
+    Args:
+        path (str): A .csv file, a .parquet file or a directory of partitions.
+        columns (list): The columns to read; defaults to all of them.
+        filters (list): (column, op, value) tuples that rows must all match, with op one of
+            ==, !=, <, <=, >, >=, in and not in. Partition columns such as date and source can be used.
+        **csv_kwargs: Extra arguments for pd.read_csv.
+
+    Returns:
+        pd.DataFrame: The matching rows.
+    """
+    if is_csv(path):
+        df = pd.read_csv(path, usecols=columns, **csv_kwargs)
+        return _filter_frame(df, filters).reset_index(drop=True) if filters else df
+
+    return pq.read_table(path, columns=columns, filters=filters or None).to_pandas()
+
+def iter_table_chunks(path, columns=None, chunksize=100000, **csv_kwargs):
+    """
+    Read a CSV file, a Parquet file or a partitioned Parquet directory as DataFrames of at most `chunksize` rows.
+
+    Only one chunk is in memory at a time, so the dataset can be larger than RAM.
+
+    Args:
+        path (str): A .csv file, a .parquet file or a directory of partitions.
+        columns (list): The columns to read; defaults to all of them.
+        chunksize (int): The maximum number of rows per chunk.
+        **csv_kwargs: Extra arguments for pd.read_csv.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+    if is_csv(path):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize, **csv_kwargs)
+        return
+
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+def write_table(df, path, partition_cols=None):
+    """
+    Write a DataFrame to a CSV file, a Parquet file or a partitioned Parquet directory.
+
+    With `partition_cols`, the rows are written as new files under
+    `path/<column>=<value>/...`, next to the files already there, so adding
+    data never rewrites what was written before.
+
+    Args:
+        df (pd.DataFrame): The data to write.
+        path (str): A .csv file, a .parquet file or, with partition_cols, a directory.
+        partition_cols (list): The columns to partition the dataset by.
+    """
+    directory = os.path.dirname(path) if partition_cols is None else path
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if is_csv(path):
+        df.to_csv(path, index=False)
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if partition_cols:
+        pq.write_to_dataset(table, path, partition_cols=list(partition_cols),
+                            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet")
+    else:
+        pq.write_table(table, path)
+
+def append_listings(listings, root, source, partition_date=None):
+    """
+    Append scraped listings to a dataset partitioned by scrape date and source.
+
+    Each call adds one new file under `root/date=<date>/source=<source>/`.
+
+    Args:
+        listings (list or pd.DataFrame): The listings to append.
+        root (str): The dataset directory.
+        source (str): The name of the site the listings were scraped from.
+        partition_date (date): The scrape date; defaults to today.
+
+    Returns:
+        int: The number of listings written.
+    """
+    df = pd.DataFrame(listings)
+    if df.empty:
+        return 0
+    df['date'] = (partition_date or date.today()).isoformat()
+    df['source'] = source
+    write_table(df, root, partition_cols=['date', 'source'])
+    return len(df)
@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_FRONTIER_PATH = os.path.join(os.path.dirname(__file__), '../data/crawl_frontier.db')
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+class CrawlFrontier:
+    """
+    Persistent crawl frontier stored in SQLite.
+
+    Every URL of a crawl is tracked as queued, in flight, done or failed, and
+    the listings extracted from a page are checkpointed together with the
+    page being marked done. If a crawl dies, reopening the frontier puts the
+    in-flight URLs back in the queue, so the next run fetches exactly the
+    pages that were not finished and the listings of the finished ones are
+    still available from listings().
+    """
+
+    def __init__(self, path=DEFAULT_FRONTIER_PATH, crawl_id='default', checkpoint_every=1):
+        """
+        Args:
+            path (str): The SQLite file the frontier is stored in.
+            crawl_id (str): Identifies the crawl; one file can hold several crawls.
+            checkpoint_every (int): The number of completed pages between two commits.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.crawl_id = crawl_id
+        self.checkpoint_every = checkpoint_every
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                crawl_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (crawl_id, url)
+            );
+            CREATE INDEX IF NOT EXISTS frontier_state ON frontier (crawl_id, state, position);
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                crawl_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                listing TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS listings_crawl ON listings (crawl_id, id);
+        """)
+        # Pages that were in flight when the last run stopped were never finished
+        self._conn.execute(
+            "UPDATE frontier SET state = ? WHERE crawl_id = ? AND state = ?",
+            (QUEUED, crawl_id, IN_FLIGHT)
+        )
+        self._conn.commit()
+
+    def enqueue(self, urls):
+        """
+        Add URLs to the queue; URLs the crawl already knows about keep their state.
+        """
+        with self._lock:
+            next_position = self._conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM frontier WHERE crawl_id = ?", (self.crawl_id,)
+            ).fetchone()[0]
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier (crawl_id, url, position, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                ((self.crawl_id, url, next_position + offset, QUEUED, now) for offset, url in enumerate(urls))
+            )
+            self._conn.commit()
+
+    def claim(self):
+        """
+        Mark the oldest queued URL as in flight and return it, or None if the queue is empty.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url FROM frontier WHERE crawl_id = ? AND state = ? ORDER BY position LIMIT 1",
+                (self.crawl_id, QUEUED)
+            ).fetchone()
+            if row is None:
+                return None
+            self._set_state(row[0], IN_FLIGHT, attempted=True)
+            return row[0]
+
+    def pending(self, urls=()):
+        """
+        Enqueue `urls` and yield every queued URL of the crawl in order, claiming each one.
+        """
+        self.enqueue(urls)
+        while True:
+            url = self.claim()
+            if url is None:
+                return
+            yield url
+
+    def complete(self, url, listings):
+        """
+        Checkpoint the listings extracted from `url` and mark it done.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO listings (crawl_id, url, listing) VALUES (?, ?, ?)",
+                ((self.crawl_id, url, json.dumps(listing)) for listing in listings)
+            )
+            self._set_state(url, DONE)
+            self._uncommitted += 1
+            if self._uncommitted >= self.checkpoint_every:
+                self._commit()
+
+    def fail(self, url):
+        """
+        Mark `url` as failed; it is not fetched again unless requeue_failed() is called.
+        """
+        with self._lock:
+            self._set_state(url, FAILED)
+            self._commit()
+
+    def release(self, url):
+        """
+        Put an in-flight URL back in the queue, for example when the crawl stops early.
+        """
+        with self._lock:
+            self._set_state(url, QUEUED)
+            self._commit()
+
+    def requeue_failed(self):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE frontier SET state = ? WHERE crawl_id = ? AND state = ?", (QUEUED, self.crawl_id, FAILED)
+            )
+            self._commit()
+
+    def listings(self):
+        """
+        Yield every listing checkpointed by this crawl, in the order it was extracted.
+        """
+        with self._lock:
+            self._commit()
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, listing FROM listings WHERE crawl_id = ? AND id > ? ORDER BY id LIMIT 1000",
+                    (self.crawl_id, last_id)
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, listing in rows:
+                yield json.loads(listing)
+
+    def counts(self):
+        """
+        Return the number of URLs in each state.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM frontier WHERE crawl_id = ? GROUP BY state", (self.crawl_id,)
+            ).fetchall()
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        counts.update(rows)
+        return counts
+
+    def clear(self):
+        """
+        Forget every URL and listing of this crawl, for example once its results are saved.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM frontier WHERE crawl_id = ?", (self.crawl_id,))
+            self._conn.execute("DELETE FROM listings WHERE crawl_id = ?", (self.crawl_id,))
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _set_state(self, url, state, attempted=False):
+        self._conn.execute(
+            "UPDATE frontier SET state = ?, attempts = attempts + ?, updated_at = ? WHERE crawl_id = ? AND url = ?",
+            (state, 1 if attempted else 0, time.time(), self.crawl_id, url)
+        )
+
+    def _commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
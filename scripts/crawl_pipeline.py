@@ -0,0 +1,142 @@
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from scripts import http_client
+
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+
+# Sent by every fetcher thread when it stops, with the exception that stopped it, if any
+_FetcherDone = namedtuple('_FetcherDone', ['error'])
+
+def fetch_content(url, cache=None):
+    """
+    Fetch a page through the shared HTTP client and return its raw bytes.
+
+    Returns:
+        bytes: The page content, or None if the page could not be retrieved.
+    """
+    response = http_client.get(url, cache=cache)
+    if response.status_code != 200:
+        print(f"Failed to retrieve {url}. Status code: {response.status_code}")
+        return None
+    return response.content
+
+def _put(fetched, item, stop):
+    # Block while the queue is full, but give up once the pipeline is stopped
+    while not stop.is_set():
+        try:
+            fetched.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+def run_pipeline(requests, parse_func, parse_args=(), fetch=fetch_content, fetch_workers=DEFAULT_FETCH_WORKERS,
+                 parse_workers=None, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Fetch and parse pages in two decoupled stages and yield the results in request order.
+
+    Threads fetch the raw page bytes (I/O stage) and hand them over a bounded
+    queue to a process pool running parse_func (CPU stage), so parsing is not
+    serialized on the GIL. At most queue_size + fetch_workers requests are in
+    flight at any time: when parsing falls behind, the fetchers wait.
+
+    Closing the generator early (for example breaking out of the loop once an
+    empty page marks the end of a board) stops the fetchers and drops any
+    results that have not been yielded. An exception raised by the requests
+    iterable is raised again by the generator.
+
+    Args:
+        requests (iterable): The requests to fetch, for example URLs; may be unbounded.
+        parse_func (callable): A picklable top-level function called as parse_func(content, *parse_args).
+        parse_args (tuple): Extra arguments passed to parse_func.
+        fetch (callable): Called with each request in a fetcher thread; returns bytes or None on failure.
+        fetch_workers (int): The number of fetcher threads.
+        parse_workers (int): The number of parser processes; defaults to the number of CPUs.
+        queue_size (int): The maximum number of fetched pages waiting to be parsed.
+
+    Yields:
+        tuple: (request, result), where result is None if the fetch failed.
+    """
+    fetched = queue.Queue(maxsize=queue_size)
+    window = threading.Semaphore(queue_size + fetch_workers)
+    stop = threading.Event()
+    request_iter = enumerate(requests)
+    request_lock = threading.Lock()
+
+    def fetcher():
+        error = None
+        try:
+            while not stop.is_set():
+                if not window.acquire(timeout=0.1):
+                    continue
+                with request_lock:
+                    item = next(request_iter, None)
+                if item is None:
+                    break
+                index, request = item
+                try:
+                    content = fetch(request)
+                except Exception as e:
+                    print(f"Error fetching {request}: {e}")
+                    content = None
+                _put(fetched, (index, request, content), stop)
+        except BaseException as e:
+            error = e
+        finally:
+            # Always tell the consumer, or it would wait for this fetcher forever
+            _put(fetched, _FetcherDone(error), stop)
+
+    threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(fetch_workers)]
+    for thread in threads:
+        thread.start()
+
+    pending = {}
+    next_index = 0
+    finished_fetchers = 0
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+    try:
+        while True:
+            # Hand back every result that is ready, in request order
+            while next_index in pending:
+                request, future = pending[next_index]
+                if future is not None and not future.done():
+                    break
+                del pending[next_index]
+                next_index += 1
+                window.release()
+                yield request, future.result() if future is not None else None
+
+            if finished_fetchers == fetch_workers:
+                if not pending:
+                    break
+                pending[next_index][1].result()
+                continue
+
+            if next_index in pending:
+                # The oldest page is being parsed; wait on it unless another page is ready
+                try:
+                    item = fetched.get_nowait()
+                except queue.Empty:
+                    wait([pending[next_index][1]], timeout=0.1)
+                    continue
+            else:
+                item = fetched.get()
+            if isinstance(item, _FetcherDone):
+                if item.error is not None:
+                    raise item.error
+                finished_fetchers += 1
+                continue
+            index, request, content = item
+            future = executor.submit(parse_func, content, *parse_args) if content is not None else None
+            pending[index] = (request, future)
+    finally:
+        stop.set()
+        for _, future in pending.values():
+            if future is not None:
+                future.cancel()
+        executor.shutdown(wait=True)
+        for thread in threads:
+            thread.join()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import create_engine, inspect, Column, Integer, String, ForeignKey, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 import os
@@ -24,6 +24,10 @@ class Job(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     location = Column(String, nullable=True)
+    company = Column(String, nullable=True)
+    url = Column(String, nullable=True)
+    # Hash of the normalized title, company, location and URL of a scraped listing
+    listing_key = Column(String, unique=True, nullable=True)
     applications = relationship('Application', back_populates='job')
     watchlist = relationship('Watchlist', back_populates='job')
     screening_questions = relationship('ScreeningQuestion', back_populates='job')
@@ -83,6 +87,34 @@ class CandidateEvaluation(Base):
     feedback = Column(String, nullable=True)
     candidate = relationship('Candidate', back_populates='evaluations')
 
+# Columns added to `jobs` for scraped listings after the table was first created
+JOBS_LISTING_COLUMNS = ('company', 'url', 'listing_key')
+
+def migrate_jobs_table(engine):
+    """
+    Bring an existing `jobs` table up to date with the Job model.
+
+    Adds the company, url and listing_key columns that are missing and a
+    unique index on listing_key if no unique constraint or index covers it,
+    which the listing upserts conflict on. Running it again changes nothing.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(Job.__tablename__):
+        return
+    existing = {column['name'] for column in inspector.get_columns(Job.__tablename__)}
+    unique_columns = [constraint['column_names'] for constraint in inspector.get_unique_constraints(Job.__tablename__)]
+    unique_columns += [index['column_names'] for index in inspector.get_indexes(Job.__tablename__) if index['unique']]
+    table = Job.__table__
+    with engine.begin() as connection:
+        for name in JOBS_LISTING_COLUMNS:
+            if name not in existing:
+                column_type = table.c[name].type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+                print(f"Added column {table.name}.{name}")
+        if ['listing_key'] not in unique_columns:
+            connection.exec_driver_sql(f"CREATE UNIQUE INDEX ix_{table.name}_listing_key ON {table.name} (listing_key)")
+            print(f"Added unique index on {table.name}.listing_key")
+
 def create_database():
     database_url = os.getenv('DATABASE_URL', 'sqlite:///home/ubuntu/jobsearching-agent/data/test_jobsearching_agent.db')
     print(f"Using DATABASE_URL: {database_url}")
@@ -96,6 +128,8 @@ def create_database():
         print(f"Directory exists: {directory}")
     try:
         Base.metadata.create_all(engine)
+        # create_all leaves tables that already exist as they are
+        migrate_jobs_table(engine)
         print("Database schema created successfully.")
         # Add diagnostic output to list tables
         with engine.connect() as connection:
@@ -1,43 +1,141 @@
-import requests
+import json
+
 import pandas as pd
 from bs4 import BeautifulSoup
+from scripts import http_client
+
+JOB_COLUMNS = ('title', 'description', 'requirements', 'qualifications')
+DEFAULT_PAGE_SIZE = 100
+
+# Where paginated APIs commonly put the records of a page
+RECORD_KEYS = ('jobs', 'results', 'data', 'items')
 
-def fetch_job_listings(api_url, headers):
-    response = requests.get(api_url, headers=headers)
+def fetch_job_listings(api_url, headers=None):
+    response = http_client.get(api_url, headers=headers)
     if response.status_code == 200:
         return response.json()
     else:
         print(f"Failed to fetch data: {response.status_code}")
         return None
 
+def _page_records(body, records_key=None):
+    if isinstance(body, list):
+        return body
+    if records_key is not None:
+        return body.get(records_key) or []
+    for key in RECORD_KEYS:
+        if isinstance(body.get(key), list):
+            return body[key]
+    return []
+
+def iter_api_pages(api_url, headers=None, params=None, pagination='cursor', page_size=DEFAULT_PAGE_SIZE,
+                   records_key=None, cursor_param='cursor', cursor_key='next_cursor', offset_param='offset',
+                   limit_param='limit', total_key='total'):
+    """
+    Fetch a paginated API one page at a time and yield the records of each page.
+
+    Only one page is held in memory at a time: each response body is decoded
+    on its own and dropped before the next page is requested. A page is
+    decoded whole with json.loads, not incrementally, since that would need
+    a streaming JSON parser the project does not depend on; keep page_size
+    small enough for one page to fit in memory comfortably.
+
+    Offset pagination stops at the first empty page, or once the offset
+    reaches the total the server reports under `total_key`, so a server
+    that caps pages below page_size is still read to the end. Cursor
+    pagination stops if the server sends a cursor it already sent, which
+    would otherwise loop forever.
+
+    Args:
+        api_url (str): The URL of the first page.
+        headers (dict): Optional extra request headers.
+        params (dict): Optional query parameters sent with every page request.
+        pagination (str): 'cursor' follows `cursor_key` in the body, 'offset' pages with
+            `offset_param`/`limit_param`, and 'link' follows the rel="next" Link header.
+        page_size (int): The number of records requested per page.
+        records_key (str): The body key holding the records; by default a bare list body or
+            the first of RECORD_KEYS that holds a list.
+        cursor_param (str): The query parameter the cursor is sent in.
+        cursor_key (str): The body key holding the cursor of the next page.
+        offset_param (str): The query parameter the offset is sent in.
+        limit_param (str): The query parameter the page size is sent in.
+        total_key (str): The body key holding the total number of records, if the server reports it.
+
+    Yields:
+        list: The records of one page, as decoded from JSON.
+    """
+    if pagination not in ('cursor', 'offset', 'link'):
+        raise ValueError(f"Unknown pagination style: {pagination}")
+
+    url = api_url
+    page_params = dict(params or {})
+    if pagination != 'link':
+        page_params[limit_param] = page_size
+    offset = 0
+    seen_cursors = set()
+
+    while url:
+        response = http_client.get(url, params=page_params or None, headers=headers)
+        if response.status_code != 200:
+            print(f"Failed to fetch data: {response.status_code}")
+            return
+        body = json.loads(response.content)
+        records = _page_records(body, records_key)
+        if records:
+            yield records
+
+        if pagination == 'cursor':
+            cursor = body.get(cursor_key) if isinstance(body, dict) else None
+            if not cursor:
+                return
+            if cursor in seen_cursors:
+                print(f"The API returned the cursor {cursor!r} twice, stopping")
+                return
+            seen_cursors.add(cursor)
+            page_params[cursor_param] = cursor
+        elif pagination == 'offset':
+            offset += len(records)
+            total = body.get(total_key) if isinstance(body, dict) else None
+            if not records or (isinstance(total, int) and offset >= total):
+                return
+            page_params[offset_param] = offset
+        else:
+            # The next link already carries the query string
+            url = response.links.get('next', {}).get('url')
+            page_params = {}
+
+def records_to_frame(records, columns=JOB_COLUMNS):
+    """
+    Build a DataFrame from records column by column, with missing fields as empty strings.
+    """
+    return pd.DataFrame({column: [record.get(column, '') for record in records] for column in columns},
+                        columns=list(columns))
+
+def iter_job_frames(api_url, columns=JOB_COLUMNS, **kwargs):
+    """
+    Stream a paginated job listings API as one DataFrame chunk per page.
+
+    Takes the same keyword arguments as iter_api_pages.
+
+    Yields:
+        pd.DataFrame: The listings of one page, with `columns` in order.
+    """
+    for records in iter_api_pages(api_url, **kwargs):
+        yield records_to_frame(records, columns)
+
 def preprocess_job_data(job_data):
-    processed_data = []
-    for job in job_data:
-        job_title = job.get('title', '')
-        job_description = job.get('description', '')
-        job_requirements = job.get('requirements', '')
-        job_qualifications = job.get('qualifications', '')
-
-        processed_data.append({
-            'title': job_title,
-            'description': job_description,
-            'requirements': job_requirements,
-            'qualifications': job_qualifications
-        })
-
-    return pd.DataFrame(processed_data)
+    return records_to_frame(job_data)
 
 def main():
     api_url = "https://api.example.com/job_listings"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    job_data = fetch_job_listings(api_url, headers)
-    if job_data:
-        job_df = preprocess_job_data(job_data)
-        job_df.to_csv('job_listings.csv', index=False)
-        print("Job listings data saved to job_listings.csv")
+
+    # Write each page as it arrives instead of holding the whole export in memory
+    rows = 0
+    for chunk in iter_job_frames(api_url):
+        chunk.to_csv('job_listings.csv', mode='a' if rows else 'w', header=not rows, index=False)
+        rows += len(chunk)
+    if rows:
+        print(f"{rows} job listings saved to job_listings.csv")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+from scripts.columnar_store import is_csv, read_table, write_table
+
+CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+# The columns of the title and salary listing, with the dtypes they are parsed as; the counts
+# are nullable integers so blank cells read as missing instead of failing the parse
+RAW_LISTING_SCHEMA = {
+    'Title Code': 'Int64',
+    'Title Name': 'object',
+    'Grade': 'object',
+    'Jurisdictional Classification': 'category',
+    'Jurisdictional Classification Description': 'category',
+    'Negotiating Unit': 'category',
+    'Negotiating Unit Description': 'category',
+    'Federal Occupational Code': 'float64',
+    'Federal Occupational Code Description': 'category',
+    'Job Level': 'category',
+    'Job Level Description': 'category',
+    'Standard Number': 'object',
+    'Agency Code': 'category',
+    'Agency Description': 'category',
+    'Filled Positions': 'Int64',
+    'Effective Date': 'object',
+}
+
+# The columns written by preprocess_job_listings
+PREPROCESSED_SCHEMA = {
+    'job_title': 'object',
+    'grade': 'object',
+    'jurisdictional_classification': 'category',
+    'negotiating_unit': 'category',
+    'job_level': 'category',
+    'agency_description': 'category',
+}
+
+def file_digest(path):
+    """
+    Return the SHA-256 hex digest of a file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _schema_key(schema):
+    text = json.dumps([CACHE_VERSION, sorted(schema.items())])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+def _parse_csv(path, schema):
+    # Categoricals are converted after parsing, so numeric codes such as the negotiating unit keep
+    # numeric categories and are written back out exactly as before
+    categorical = [column for column, dtype in schema.items() if dtype == 'category']
+    parse_dtypes = {column: dtype for column, dtype in schema.items() if dtype != 'category'}
+    df = pd.read_csv(path, usecols=list(schema), dtype=parse_dtypes)
+    return df.astype({column: 'category' for column in categorical})[list(schema)]
+
+def _load_manifest(path):
+    try:
+        with open(path) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+def _replace_json(data, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as manifest_file:
+        json.dump(data, manifest_file)
+    os.replace(tmp_path, path)
+
+def read_cached_csv(path, schema, columns=None, cache_dir=None):
+    """
+    Read a CSV file through a typed Parquet cache that is rebuilt only when the file changes.
+
+    The first read parses the schema's columns with their declared dtypes
+    and stores the result as Parquet, named after the SHA-256 of the CSV.
+    Later reads compare the file's size and modification time with those
+    recorded for the cache and, only if they differ, hash the file again;
+    as long as the content is unchanged the CSV is not parsed at all.
+    Parquet files and datasets are read directly.
+
+    Args:
+        path (str): The CSV file, or a Parquet file or directory.
+        schema (dict): The columns to parse, mapped to their dtypes; 'category' columns are stored
+            dictionary-encoded.
+        columns (list): The columns to return; defaults to all the columns of the schema.
+        cache_dir (str): Where the cache is kept; defaults to a .cache directory next to the file.
+
+    Returns:
+        pd.DataFrame: The typed data.
+    """
+    if not is_csv(path):
+        return read_table(path, columns=columns)
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), '.cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    schema_key = _schema_key(schema)
+    manifest_path = os.path.join(cache_dir, f"{os.path.basename(path)}.{schema_key}.json")
+    manifest = _load_manifest(manifest_path)
+
+    stat = os.stat(path)
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    cache_path = None
+    if manifest is not None:
+        cache_path = os.path.join(cache_dir, manifest['cache_file'])
+        if not os.path.exists(cache_path):
+            manifest = None
+        elif {key: manifest[key] for key in signature} != signature:
+            # Touched or copied files keep their cache when the content is the same
+            if manifest['sha256'] == file_digest(path):
+                _replace_json(dict(manifest, **signature), manifest_path)
+            else:
+                os.remove(cache_path)
+                manifest = None
+
+    if manifest is None:
+        digest = file_digest(path)
+        cache_file = f"{digest}-{schema_key}.parquet"
+        cache_path = os.path.join(cache_dir, cache_file)
+        df = _parse_csv(path, schema)
+        write_table(df, f"{cache_path}.tmp")
+        os.replace(f"{cache_path}.tmp", cache_path)
+        _replace_json(dict(signature, sha256=digest, cache_file=cache_file), manifest_path)
+        print(f"Cached {len(df)} rows of {path} in {cache_path}")
+
+    # Read back even after a rebuild, so the dtypes are the same on every run; Parquet only keeps
+    # the dictionary encoding of string columns, so numeric categoricals are converted again
+    df = pq.read_table(cache_path, columns=columns).to_pandas()
+    categorical = [column for column in df.columns if schema[column] == 'category']
+    return df.astype({column: 'category' for column in categorical})
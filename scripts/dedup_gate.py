@@ -0,0 +1,243 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+DEFAULT_GATE_PATH = os.path.join(os.path.dirname(__file__), '../data/dedup_gate.db')
+DEFAULT_INITIAL_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.001
+GROWTH_FACTOR = 4  # each new filter holds this many times more keys than the last
+TIGHTENING_RATIO = 0.5  # and has this fraction of its error rate, so the total stays bounded
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|gclid|fbclid|ref|src)$')
+
+def is_missing(value):
+    """
+    Return True for None, an empty string and NaN, the way a missing field comes back from a CSV file.
+    """
+    return value is None or (pd.api.types.is_scalar(value) and (value == '' or pd.isna(value)))
+
+def listing_field(listing, *names):
+    """
+    Return the first of the named fields that a listing has a value for, or None.
+    """
+    for name in names:
+        value = listing.get(name)
+        if not is_missing(value):
+            return value
+    return None
+
+def _normalize_text(value):
+    return '' if is_missing(value) else ' '.join(re.findall(r'\w+', str(value).casefold()))
+
+def normalize_url(url):
+    """
+    Normalize a listing URL: lowercase scheme and host, no fragment, tracking parameters or trailing slash.
+    """
+    if is_missing(url) or url == 'N/A':
+        return ''
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query)
+                             if not _TRACKING_PARAMS.match(key)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+
+def canonical_key(listing):
+    """
+    Return the canonical identity of a listing: its normalized title, company, location and URL.
+    """
+    return '\x1f'.join((
+        _normalize_text(listing_field(listing, 'job_title', 'title', 'jobTitle')),
+        _normalize_text(listing_field(listing, 'company', 'company_name', 'companyName')),
+        _normalize_text(listing_field(listing, 'location')),
+        normalize_url(listing_field(listing, 'url')),
+    ))
+
+def listing_key(listing):
+    """
+    Return a fixed-length hash of a listing's canonical key.
+    """
+    return hashlib.sha256(canonical_key(listing).encode('utf-8')).hexdigest()
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter using double hashing over a SHA-256 digest of the key.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:16], 'little') | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+class DedupGate:
+    """
+    Exact-dedup gate for scraped listings, backed by a persistent scalable Bloom filter.
+
+    A listing's canonical key is first looked up in the Bloom filter. A miss
+    means the listing is new for certain, so it is let through without
+    touching the database. Only Bloom hits are confirmed against the exact
+    key table in SQLite, which rules out false positives. When the current
+    filter is full, a larger one with a tighter error rate is added, so the
+    filter grows with the history.
+
+    The keys of new listings are held in memory until commit(), which adds
+    them to the filter and the key table in one transaction; the consumer
+    calls it once the listings are stored. rollback() forgets them, so
+    listings that were never stored are let through again next time.
+    Leaving the gate as a context manager commits, or rolls back on an
+    exception.
+    """
+
+    def __init__(self, path=DEFAULT_GATE_PATH, initial_capacity=DEFAULT_INITIAL_CAPACITY,
+                 error_rate=DEFAULT_ERROR_RATE):
+        """
+        Args:
+            path (str): The SQLite file holding the filters and the exact keys.
+            initial_capacity (int): The number of keys the first filter is sized for.
+            error_rate (float): The false positive rate of the first filter.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.stats = {'checked': 0, 'bloom_hits': 0, 'false_positives': 0, 'duplicates': 0}
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._dirty = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS filters (
+                level INTEGER PRIMARY KEY,
+                capacity INTEGER NOT NULL,
+                error_rate REAL NOT NULL,
+                count INTEGER NOT NULL,
+                bits BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY) WITHOUT ROWID;
+        """)
+        self._filters = [
+            BloomFilter(capacity, filter_error_rate, bits, count)
+            for capacity, filter_error_rate, count, bits in self._conn.execute(
+                "SELECT capacity, error_rate, count, bits FROM filters ORDER BY level"
+            )
+        ]
+        if not self._filters:
+            self._add_filter()
+
+    def _add_filter(self):
+        level = len(self._filters)
+        self._filters.append(BloomFilter(
+            self.initial_capacity * GROWTH_FACTOR ** level, self.error_rate * TIGHTENING_RATIO ** level
+        ))
+        self._dirty.add(level)
+
+    def _exists(self, key):
+        return self._conn.execute("SELECT 1 FROM keys WHERE key = ?", (key,)).fetchone() is not None
+
+    def add(self, listing):
+        """
+        Record a listing; return True if it is new and False if it was seen before.
+        """
+        key = listing_key(listing)
+        with self._lock:
+            self.stats['checked'] += 1
+            if key in self._pending:
+                self.stats['duplicates'] += 1
+                return False
+            if any(key in bloom for bloom in self._filters):
+                self.stats['bloom_hits'] += 1
+                if self._exists(key):
+                    self.stats['duplicates'] += 1
+                    return False
+                self.stats['false_positives'] += 1
+            self._pending.add(key)
+            return True
+
+    def seen(self, listing):
+        """
+        Return True if the listing was recorded before, without recording it.
+        """
+        key = listing_key(listing)
+        with self._lock:
+            return key in self._pending or any(key in bloom for bloom in self._filters) and self._exists(key)
+
+    def new_listings(self, listings):
+        """
+        Yield the listings that have not been seen before, recording each one.
+        """
+        for listing in listings:
+            if self.add(listing):
+                yield listing
+
+    def commit(self):
+        """
+        Store the keys recorded since the last commit(), once their listings are safely written.
+        """
+        with self._lock:
+            for key in self._pending:
+                if self._filters[-1].full:
+                    self._add_filter()
+                self._filters[-1].add(key)
+                self._dirty.add(len(self._filters) - 1)
+            self._conn.executemany("INSERT OR IGNORE INTO keys (key) VALUES (?)", ((key,) for key in self._pending))
+            for level in self._dirty:
+                bloom = self._filters[level]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO filters (level, capacity, error_rate, count, bits) VALUES (?, ?, ?, ?, ?)",
+                    (level, bloom.capacity, bloom.error_rate, bloom.count, bytes(bloom.bits))
+                )
+            self._conn.commit()
+            self._pending.clear()
+            self._dirty.clear()
+
+    def rollback(self):
+        """
+        Forget the keys recorded since the last commit(), so their listings count as new again.
+        """
+        with self._lock:
+            self._pending.clear()
+
+    def close(self):
+        """
+        Close the gate; keys recorded since the last commit() are not stored.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
@@ -1,29 +1,36 @@
+import os
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import joblib
+from scripts.columnar_store import read_table
+from scripts.model_registry import ModelRegistry
+from scripts.sparse_features import is_features, load_features
 
 def evaluate_model(model_path, test_csv):
-    # Load the trained model
-    model = joblib.load(model_path)
+    # Load the trained model together with the label classes it was trained on
+    bundle = ModelRegistry(os.path.dirname(model_path)).bundle()
+    model = bundle.model
 
-    # Read the test CSV file
-    df = pd.read_csv(test_csv, low_memory=False)
+    if is_features(test_csv):
+        # Evaluate on the sparse feature matrix as is, labeled rows only
+        X, y = load_features(test_csv).labeled('job_level')
+    else:
+        # Read the test CSV file or Parquet dataset
+        df = read_table(test_csv, low_memory=False)
 
-    # Separate features and target variable
-    X = df.drop(columns=['job_level'])
-    y = df['job_level']
+        # Separate features and target variable
+        X = df.drop(columns=['job_level'])
+        y = df['job_level']
 
-    # Convert all columns to numeric, coercing errors to NaN
-    X = X.apply(pd.to_numeric, errors='coerce')
+        # Convert all columns to numeric, coercing errors to NaN
+        X = X.apply(pd.to_numeric, errors='coerce')
 
-    # Drop rows with NaN values in any column
-    X.dropna(inplace=True)
-    y = y[X.index]  # Ensure target variable matches the filtered features
+        # Drop rows with NaN values in any column
+        X.dropna(inplace=True)
+        y = y[X.index]  # Ensure target variable matches the filtered features
 
-    # Encode the target variable if it contains categorical data
-    if y.dtype == 'object':
-        le = LabelEncoder()
-        y = le.fit_transform(y)
+    # Encode the target variable with the training classes, so codes match even if a class is missing here
+    if y.dtype == 'object' and bundle.label_encoder is not None:
+        y = bundle.label_encoder.transform(y)
 
     # Make predictions on the test set
     y_pred = model.predict(X)
@@ -38,8 +45,9 @@ def evaluate_model(model_path, test_csv):
     print(f"Model precision: {precision}")
     print(f"Model recall: {recall}")
     print(f"Model F1 score: {f1}")
+    return {'accuracy': accuracy, 'precision': precision, 'recall': recall, 'f1': f1}
 
 if __name__ == "__main__":
     model_path = '../models/job_matching_model.pkl'
-    test_csv = '../data/job_listings_features_encoded.csv'
+    test_csv = '../data/job_listings_features.npz'
     evaluate_model(model_path, test_csv)
@@ -1,37 +1,135 @@
-import pandas as pd
+import argparse
+import collections
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
+from scripts.columnar_store import iter_table_chunks, read_table
+from scripts.sparse_features import hashing_vectorizer, part_files, save_document_frequencies, save_features
+
+FEATURE_COLUMNS = ['job_title', 'grade', 'jurisdictional_classification', 'negotiating_unit', 'job_level',
+                   'agency_description']
 
-def extract_features(input_csv, output_csv):
-    # Read the preprocessed CSV file
-    df = pd.read_csv(input_csv)
+DEFAULT_HASH_FEATURES = 2 ** 18
+DEFAULT_CHUNKSIZE = 100000
 
+def combine_text(df):
     # Convert relevant columns to strings
-    df['job_title'] = df['job_title'].astype(str)
-    df['jurisdictional_classification'] = df['jurisdictional_classification'].astype(str)
-    df['negotiating_unit'] = df['negotiating_unit'].astype(str)
-    df['agency_description'] = df['agency_description'].astype(str)
+    text_columns = ['job_title', 'jurisdictional_classification', 'negotiating_unit', 'agency_description']
+    text = df[text_columns].astype(str)
 
     # Combine relevant text columns into a single column for feature extraction
-    df['combined_text'] = df['job_title'] + ' ' + df['jurisdictional_classification'] + ' ' + df['negotiating_unit'] + ' ' + df['agency_description']
+    return text['job_title'] + ' ' + text['jurisdictional_classification'] + ' ' + text['negotiating_unit'] + ' ' + text['agency_description']
+
+def extract_features(input_csv, output_path):
+    # Read only the columns used below from the preprocessed CSV file or Parquet dataset
+    df = read_table(input_csv, columns=FEATURE_COLUMNS)
 
     # Initialize the TF-IDF vectorizer
     vectorizer = TfidfVectorizer(max_features=1000)
 
     # Fit and transform the combined text data
-    X = vectorizer.fit_transform(df['combined_text'])
+    X = vectorizer.fit_transform(combine_text(df))
+
+    # Save the sparse TF-IDF matrix with its vocabulary, and the grade and job level of every row
+    save_features(output_path, X, vectorizer.get_feature_names_out(), vectorizer.idf_,
+                  grade=df['grade'], job_level=df['job_level'])
+    print(f"Features extracted and saved to {output_path}")
+
+def _part_path(output_dir, index):
+    return os.path.join(output_dir, f"part-{index:05d}.npz")
+
+def featurize_chunk(chunk, part_path, n_features=DEFAULT_HASH_FEATURES):
+    """
+    Hash the text of one chunk into raw term counts and save them as a feature part.
+
+    Needs nothing but the chunk, so any process can featurize any chunk.
 
-    # Convert the TF-IDF matrix to a DataFrame
-    feature_df = pd.DataFrame(X.toarray(), columns=vectorizer.get_feature_names_out())
+    Returns:
+        tuple: The number of rows, and the columns present in the chunk with the number of rows each occurs in.
+    """
+    X = hashing_vectorizer(n_features).transform(combine_text(chunk))
+    save_features(part_path, X, None, grade=chunk['grade'], job_level=chunk['job_level'])
+    # Every row lists a column at most once, so counting indices counts documents
+    columns, document_counts = np.unique(X.indices, return_counts=True)
+    return X.shape[0], columns, document_counts
 
-    # Add the grade and job level columns to the feature DataFrame
-    feature_df['grade'] = df['grade']
-    feature_df['job_level'] = df['job_level']
+def extract_features_out_of_core(input_path, output_dir, n_features=DEFAULT_HASH_FEATURES,
+                                 chunksize=DEFAULT_CHUNKSIZE, workers=None, max_pending=None):
+    """
+    Extract hashed TF-IDF features chunk by chunk, without a fit over the whole corpus.
 
-    # Save the feature DataFrame to a new CSV file
-    feature_df.to_csv(output_csv, index=False)
-    print(f"Features extracted and saved to {output_csv}")
+    Each chunk of the CSV file or Parquet dataset is hashed into term counts
+    and written as `part-NNNNN.npz` in `output_dir`; the document frequencies
+    of all chunks so far are updated after every chunk. load_features on the
+    directory applies the resulting IDF, so only the chunks being featurized
+    are ever in memory. With `workers`, chunks are featurized in a process
+    pool, at most `max_pending` at a time.
+
+    Args:
+        input_path (str): The preprocessed CSV file or Parquet dataset.
+        output_dir (str): The directory that receives the feature parts.
+        n_features (int): The number of hashed columns.
+        chunksize (int): The number of rows per chunk.
+        workers (int): The number of processes featurizing chunks; None or 1 featurizes in this process.
+        max_pending (int): The maximum number of chunks submitted but not yet counted; defaults to 2 * workers.
+
+    Returns:
+        int: The number of rows featurized.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Part files of an earlier, possibly longer, run would otherwise be loaded with this one
+    for part_path in part_files(output_dir):
+        os.remove(part_path)
+    start = time.perf_counter()
+    n_documents = 0
+    document_frequencies = np.zeros(n_features, dtype=np.int64)
+    save_document_frequencies(output_dir, n_documents, document_frequencies)
+
+    def count(result):
+        nonlocal n_documents
+        rows, columns, document_counts = result
+        n_documents += rows
+        document_frequencies[columns] += document_counts
+        save_document_frequencies(output_dir, n_documents, document_frequencies)
+
+    chunks = iter_table_chunks(input_path, columns=FEATURE_COLUMNS, chunksize=chunksize)
+    if workers and workers > 1:
+        max_pending = max_pending or 2 * workers
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for index, chunk in enumerate(chunks):
+                # Wait for the oldest chunk before reading further, so memory stays bounded
+                if len(pending) >= max_pending:
+                    count(pending.popleft().result())
+                pending.append(executor.submit(featurize_chunk, chunk, _part_path(output_dir, index), n_features))
+            while pending:
+                count(pending.popleft().result())
+    else:
+        for index, chunk in enumerate(chunks):
+            count(featurize_chunk(chunk, _part_path(output_dir, index), n_features))
+
+    elapsed = time.perf_counter() - start
+    print(f"Featurized {n_documents} rows into {output_dir} in {elapsed:.2f}s "
+          f"({n_documents / elapsed if elapsed else 0:.0f} rows/sec)")
+    return n_documents
 
 if __name__ == "__main__":
-    input_csv = '../data/preprocessed_job_listings.csv'
-    output_csv = '../data/job_listings_features.csv'
-    extract_features(input_csv, output_csv)
+    arg_parser = argparse.ArgumentParser(description="Extract TF-IDF features from the preprocessed job listings.")
+    arg_parser.add_argument('input', nargs='?', default='../data/preprocessed_job_listings.csv')
+    arg_parser.add_argument('output', nargs='?', default=None,
+                            help="Defaults to job_listings_features.npz, or job_listings_features/ with --out-of-core")
+    arg_parser.add_argument('--out-of-core', action='store_true',
+                            help="Hash chunks of the input instead of fitting a vocabulary on all of it")
+    arg_parser.add_argument('--n-features', type=int, default=DEFAULT_HASH_FEATURES)
+    arg_parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = arg_parser.parse_args()
+
+    if args.out_of_core:
+        extract_features_out_of_core(args.input, args.output or '../data/job_listings_features',
+                                     args.n_features, args.chunksize, args.workers)
+    else:
+        extract_features(args.input, args.output or '../data/job_listings_features.npz')
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_FINGERPRINT_PATH = os.path.join(os.path.dirname(__file__), '../data/fingerprints.db')
+
+# Stands in for the body of a page that is byte-for-byte the same as last time
+UnchangedPage = namedtuple('UnchangedPage', ['listing_count'])
+
+def page_fingerprint(content):
+    """
+    Return the hash of a page body.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def listing_fingerprint(listing):
+    """
+    Return a canonical hash of a listing.
+
+    Keys are sorted and string values are lowercased with their whitespace
+    collapsed, so a listing re-rendered with different spacing or key order
+    has the same fingerprint.
+    """
+    canonical = {
+        key: ' '.join(value.split()).casefold() if isinstance(value, str) else value
+        for key, value in listing.items()
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class FingerprintStore:
+    """
+    Persistent store of page and listing fingerprints for incremental crawls.
+
+    filter_page() replaces the body of a page that has not changed since it
+    was last recorded with an UnchangedPage, so the crawler can skip parsing
+    it, and new_listings() drops listings that were already emitted by an
+    earlier run. A daily crawl then only parses and passes on what changed.
+
+    Recorded pages and listings are staged in memory and only stored by
+    commit(), which the consumer calls once the listings are safely written,
+    for example through write_listings(checkpoints=[store]). rollback()
+    forgets them, so a failed write leaves them to be crawled again. Leaving
+    the store as a context manager commits, or rolls back on an exception.
+    """
+
+    def __init__(self, path=DEFAULT_FINGERPRINT_PATH):
+        """
+        Args:
+            path (str): The SQLite file the fingerprints are stored in.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending_pages = {}
+        self._staged_pages = {}
+        self._staged_listings = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                listing_count INTEGER NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS listings (
+                fingerprint TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def filter_page(self, key, content):
+        """
+        Return the page body, or an UnchangedPage if it is the same as the one recorded for `key`.
+
+        The fingerprint of a changed page is kept in memory until record_page()
+        stages it, once its listings have been handed on.
+
+        Args:
+            key (str): Identifies the page, for example its URL.
+            content (bytes): The page body.
+        """
+        fingerprint = page_fingerprint(content)
+        with self._lock:
+            row = self._staged_pages.get(key) or self._conn.execute(
+                "SELECT fingerprint, listing_count FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] == fingerprint:
+                return UnchangedPage(row[1])
+            self._pending_pages[key] = fingerprint
+        return content
+
+    def record_page(self, key, listing_count):
+        """
+        Stage the fingerprint of a page passed by filter_page() together with the number of listings on it.
+        """
+        with self._lock:
+            fingerprint = self._pending_pages.pop(key, None)
+            if fingerprint is not None:
+                self._staged_pages[key] = (fingerprint, listing_count)
+
+    def new_listings(self, listings):
+        """
+        Yield the listings whose fingerprint has not been seen before, staging each one.
+        """
+        for listing in listings:
+            fingerprint = listing_fingerprint(listing)
+            with self._lock:
+                if fingerprint in self._staged_listings or self._conn.execute(
+                    "SELECT 1 FROM listings WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone() is not None:
+                    continue
+                self._staged_listings.add(fingerprint)
+            yield listing
+
+    def commit(self):
+        """
+        Store the staged page and listing fingerprints.
+        """
+        with self._lock:
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (key, fingerprint, listing_count, recorded_at) VALUES (?, ?, ?, ?)",
+                ((key, fingerprint, listing_count, now)
+                 for key, (fingerprint, listing_count) in self._staged_pages.items())
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO listings (fingerprint, first_seen) VALUES (?, ?)",
+                ((fingerprint, now) for fingerprint in self._staged_listings)
+            )
+            self._conn.commit()
+            self._staged_pages.clear()
+            self._staged_listings.clear()
+
+    def rollback(self):
+        """
+        Forget the staged fingerprints, so their pages and listings are handed on again by the next crawl.
+        """
+        with self._lock:
+            self._staged_pages.clear()
+            self._staged_listings.clear()
+
+    def close(self):
+        """
+        Close the store; fingerprints staged since the last commit() are not stored.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
@@ -1,38 +1,73 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
+import json
 import logging
 import os
-import re
-import json
+import warnings
+from datetime import date
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from scripts import http_client
+from scripts.columnar_store import append_listings
+from scripts.crawl_frontier import CrawlFrontier
+from scripts.dedup_gate import DedupGate
+from scripts.fingerprint_store import FingerprintStore, UnchangedPage
+from scripts.job_level_categorizer import categorize_job_title
+from scripts.jsonl_store import JsonlStore
+from scripts.rate_limiter import AdaptiveRateLimiter
+from scripts.response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(filename='/home/ubuntu/jobsearching-agent/logs/job_search.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def google_job_search(query, num_pages=5):
-    job_listings = []
-    base_url = "https://www.google.com/search?q="
-
-    for page in range(num_pages):
-        start = page * 10
-        url = f"{base_url}{query}&start={start}"
-        logging.info(f"Fetching URL: {url}")
+# Google blocks aggressive clients quickly, so start at one request every two seconds
+GOOGLE_RATE = 0.5
+GOOGLE_SEARCH_URL = "https://www.google.com/search?q="
+
+def iter_google_job_search(query, num_pages=5, cache=None, rate_limiter=None, frontier=None, fingerprints=None,
+                           base_url=GOOGLE_SEARCH_URL, dedup_gate=None):
+    """
+    Search Google for job listings, yielding them one at a time as each results page is parsed.
+
+    With a CrawlFrontier, each results page is checkpointed with its listings
+    once it is parsed, and a search that was interrupted only fetches the
+    pages that were not finished. With a FingerprintStore, results pages that
+    have not changed since the last run are not parsed and listings that were
+    already found are not yielded again. `base_url` can point the search at
+    another server, such as the local mock board used for benchmarks. With a
+    DedupGate, a listing with the same title, company, location and URL as one
+    already found, in this run or an earlier one, is not yielded again.
+    """
+    if rate_limiter is None:
+        rate_limiter = AdaptiveRateLimiter(rate=GOOGLE_RATE, max_rate=2.0)
+    page_urls = [f"{base_url}{query}&start={page * 10}" for page in range(num_pages)]
+    if frontier is not None:
+        page_urls = frontier.pending(page_urls)
+
+    for page_url in page_urls:
+        logging.info(f"Fetching URL: {page_url}")
+        page_listings = []
 
         try:
-            response = requests.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
+            response = http_client.get(page_url, cache=cache, rate_limiter=rate_limiter)
             if response.status_code != 200:
-                logging.error(f"Failed to retrieve page {page}. Status code: {response.status_code}")
+                logging.error(f"Failed to retrieve {page_url}. Status code: {response.status_code}")
+                if frontier is not None:
+                    frontier.release(page_url)
                 break
 
             html_content = response.content
+            if fingerprints is not None:
+                html_content = fingerprints.filter_page(page_url, html_content)
+                if isinstance(html_content, UnchangedPage):
+                    logging.info(f"{page_url} is unchanged since the last run, skipped parsing")
+                    if frontier is not None:
+                        frontier.complete(page_url, [])
+                    continue
+
             logging.info(f"HTML content: {html_content[:5000]}")  # Log the first 5000 characters of the HTML content
             soup = BeautifulSoup(html_content, 'html.parser')
             results = soup.select('div[jsname="Q4LuWd"]')
@@ -58,69 +93,112 @@ def google_job_search(query, num_pages=5):
                     logging.info(f"Extracted URL: {url}")
 
                     # Exclude irrelevant elements
-                    if job_title != 'N/A' and company_name != 'N/A' and location != 'N/A' and url.startswith("http") and "More results" not in job_title and "Try again" not in job_title:
-                        job_listings.append({
-                            'job_title': job_title,
-                            'company_name': company_name,
-                            'location': location,
-                            'url': url,
-                            'job_level': categorize_job_title(job_title)
-                        })
+                    if not (job_title != 'N/A' and company_name != 'N/A' and location != 'N/A' and url.startswith("http") and "More results" not in job_title and "Try again" not in job_title):
+                        continue
+
+                    page_listings.append({
+                        'job_title': job_title,
+                        'company_name': company_name,
+                        'location': location,
+                        'url': url,
+                        'job_level': categorize_job_title(job_title)
+                    })
 
                 except Exception as e:
                     logging.warning(f"Error processing result: {e}")
-
-            time.sleep(2)  # Sleep to avoid being blocked
+                    continue
 
         except Exception as e:
-            logging.error(f"Error fetching URL: {url} - {e}")
+            logging.error(f"Error fetching URL: {page_url} - {e}")
+            if frontier is not None:
+                frontier.fail(page_url)
             continue
 
+        listing_count = len(page_listings)
+        if fingerprints is not None:
+            page_listings = list(fingerprints.new_listings(page_listings))
+        if dedup_gate is not None:
+            page_listings = list(dedup_gate.new_listings(page_listings))
+        if frontier is not None:
+            frontier.complete(page_url, page_listings)
+        yield from page_listings
+        if fingerprints is not None:
+            fingerprints.record_page(page_url, listing_count)
+
+    logging.info(f"Rate limiter metrics: {rate_limiter.metrics()}")
+
+def google_job_search(query, num_pages=5, cache=None, rate_limiter=None, frontier=None, fingerprints=None,
+                      base_url=GOOGLE_SEARCH_URL, dedup_gate=None):
+    """
+    Search Google for job listings and return them as a list.
+
+    With a frontier, the result also includes the listings checkpointed by
+    earlier, interrupted runs of the same crawl.
+    """
+    job_listings = list(iter_google_job_search(
+        query, num_pages, cache, rate_limiter, frontier, fingerprints, base_url, dedup_gate
+    ))
+    if frontier is not None:
+        job_listings = list(frontier.listings())
     return job_listings
 
-def categorize_job_title(title):
-    title = title.lower()
-    if re.search(r'\b(intern|junior|entry|assistant|trainee)\b', title):
-        return 'Entry-level'
-    elif re.search(r'\b(mid|senior|lead|manager|specialist)\b', title):
-        return 'Mid-level'
-    elif re.search(r'\b(director|vp|vice president|chief|head|principal)\b', title):
-        return 'Advanced-level'
-    else:
-        return 'Unknown'
-
 def save_to_csv(job_listings, filename='../data/google_job_listings.csv'):
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    df = pd.DataFrame(job_listings)
     if os.path.exists(filename) and os.path.getsize(filename) > 0:
-        existing_df = pd.read_csv(filename)
-        new_df = pd.DataFrame(job_listings)
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df.to_csv(filename, index=False)
+        # Append under the existing header instead of reading and rewriting the whole file
+        header = pd.read_csv(filename, nrows=0).columns
+        dropped = [column for column in df.columns if column not in header]
+        if dropped:
+            logging.warning(f"Columns {dropped} are not in the header of {filename} and were not saved")
+        df.reindex(columns=header).to_csv(filename, mode='a', header=False, index=False)
     else:
-        df = pd.DataFrame(job_listings)
         df.to_csv(filename, index=False)
     logging.info(f"Job listings saved to {filename}")
 
+def save_to_parquet(job_listings, root='../data/google_job_listings', source='google'):
+    # Each run adds a new file to today's partition; nothing already written is read back
+    count = append_listings(job_listings, root, source)
+    logging.info(f"{count} job listings saved to {root}")
+
+def save_to_jsonl(job_listings, filename='../data/job_listings.jsonl'):
+    # One append per run instead of reloading and rewriting the whole history
+    count = JsonlStore(filename).append(job_listings)
+    logging.info(f"{count} job listings saved to {filename}")
+
+def save_jsonl_to_csv(jsonl_filename, csv_filename):
+    save_to_csv(list(JsonlStore(jsonl_filename)), csv_filename)
+
+def _jsonl_filename(json_filename):
+    return os.path.splitext(json_filename)[0] + '.jsonl'
+
 def save_to_json(job_listings, filename='../data/job_listings.json'):
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    if os.path.exists(filename):
-        with open(filename, 'r') as json_file:
-            existing_data = json.load(json_file)
-        existing_data.extend(job_listings)
-        with open(filename, 'w') as json_file:
-            json.dump(existing_data, json_file, indent=4)
-    else:
-        with open(filename, 'w') as json_file:
-            json.dump(job_listings, json_file, indent=4)
-    logging.info(f"Job listings saved to {filename}")
+    # Deprecated: rewriting one JSON array reloads the whole history on every run
+    warnings.warn("save_to_json is deprecated; use save_to_jsonl or save_to_parquet", DeprecationWarning,
+                  stacklevel=2)
+    save_to_jsonl(job_listings, _jsonl_filename(filename))
 
 def save_json_to_csv(json_filename, csv_filename):
-    with open(json_filename, 'r') as json_file:
-        job_listings = json.load(json_file)
+    # Deprecated: reads a JSON array written by earlier versions, followed by the JSON Lines store next to it
+    warnings.warn("save_json_to_csv is deprecated; use save_jsonl_to_csv", DeprecationWarning, stacklevel=2)
+    job_listings = []
+    if os.path.exists(json_filename) and not json_filename.endswith('.jsonl'):
+        with open(json_filename, 'r') as json_file:
+            job_listings.extend(json.load(json_file))
+    jsonl_filename = _jsonl_filename(json_filename)
+    if os.path.exists(jsonl_filename):
+        job_listings.extend(JsonlStore(jsonl_filename))
     save_to_csv(job_listings, csv_filename)
 
 if __name__ == "__main__":
     query = "software engineer jobs"
-    job_listings = google_job_search(query)
-    save_to_json(job_listings)
-    save_json_to_csv('../data/job_listings.json', '../data/google_job_listings.csv')
+    # One crawl per query and day: rerunning after a crash resumes it, tomorrow's run starts fresh
+    crawl_id = f"{query}:{date.today().isoformat()}"
+    with ResponseCache() as cache, CrawlFrontier(crawl_id=crawl_id) as frontier, FingerprintStore() as fingerprints, \
+            DedupGate() as dedup_gate:
+        job_listings = google_job_search(query, cache=cache, frontier=frontier, fingerprints=fingerprints,
+                                         dedup_gate=dedup_gate)
+        save_to_jsonl(job_listings)
+        save_to_parquet(job_listings)
+        frontier.clear()
@@ -0,0 +1,137 @@
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_POOL_SIZE = 10
+# Number of per-host pools an adapter keeps alive at once
+MAX_POOLED_HOSTS = 100
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_JITTER = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class JitteredRetry(Retry):
+    """
+    Retry policy that adds random jitter to the exponential backoff so that
+    concurrent workers do not retry a struggling host in lockstep.
+    """
+
+    def __init__(self, *args, jitter=DEFAULT_BACKOFF_JITTER, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.jitter)
+
+def _make_adapter(pool_size, retries, backoff_factor, backoff_jitter):
+    retry = JitteredRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False
+    )
+    # pool_block keeps the number of open connections to a host at pool_size
+    return HTTPAdapter(pool_connections=MAX_POOLED_HOSTS, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+
+def build_session(pool_size=DEFAULT_POOL_SIZE, host_pool_sizes=None, retries=DEFAULT_RETRIES,
+                  backoff_factor=DEFAULT_BACKOFF_FACTOR, backoff_jitter=DEFAULT_BACKOFF_JITTER, headers=None):
+    """
+    Build a requests session with keep-alive connection pooling and retries.
+
+    Args:
+        pool_size (int): The default number of pooled connections per host.
+        host_pool_sizes (dict): Optional mapping of host name to pool size, overriding pool_size for that host.
+        retries (int): The number of retries for connection errors and retryable status codes.
+        backoff_factor (float): The exponential backoff factor between retries, in seconds.
+        backoff_jitter (float): The maximum random jitter added to each backoff, in seconds.
+        headers (dict): Optional headers sent with every request, in addition to DEFAULT_HEADERS.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+
+    adapter = _make_adapter(pool_size, retries, backoff_factor, backoff_jitter)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # requests picks the adapter with the longest matching prefix, so these win over the defaults; the
+    # trailing slash keeps look-alike hosts such as example.com.evil.org on the default adapter
+    for host, host_pool_size in (host_pool_sizes or {}).items():
+        host_adapter = _make_adapter(host_pool_size, retries, backoff_factor, backoff_jitter)
+        session.mount(f'http://{host}/', host_adapter)
+        session.mount(f'https://{host}/', host_adapter)
+
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    Return the shared session, creating it with the default settings on first use.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
+
+def configure(**kwargs):
+    """
+    Replace the shared session with one built from the given build_session arguments.
+
+    Returns:
+        requests.Session: The new shared session.
+    """
+    global _session
+    session = build_session(**kwargs)
+    with _session_lock:
+        previous, _session = _session, session
+    if previous is not None:
+        previous.close()
+    return session
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, cache=None, rate_limiter=None, **kwargs):
+    """
+    Send a GET request through the shared session.
+
+    Args:
+        url (str): The URL to fetch.
+        params (dict): Optional query string parameters.
+        headers (dict): Optional headers for this request only.
+        timeout (float or tuple): The request timeout, or a (connect, read) tuple.
+        cache (ResponseCache): Optional response cache used to revalidate and store the response.
+        rate_limiter (AdaptiveRateLimiter): Optional per-host rate limiter the request waits on.
+
+    Returns:
+        requests.Response: The response.
+    """
+    fetch = get_session().get
+    if rate_limiter is not None:
+        fetch = rate_limiter.limit(fetch)
+    if cache is not None:
+        return cache.get(url, params=params, headers=headers, fetch=fetch, timeout=timeout, **kwargs)
+    return fetch(url, params=params, headers=headers, timeout=timeout, **kwargs)
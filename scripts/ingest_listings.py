@@ -0,0 +1,54 @@
+import argparse
+import time
+
+from scripts.columnar_store import iter_table_chunks
+from scripts.jsonl_store import JsonlStore
+from scripts.listing_sinks import DEFAULT_BATCH_SIZE, JobsTableSink, write_listings
+
+def ingest_listings(listings, engine=None, database_url=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Bulk upsert scraped listings into the `jobs` table.
+
+    Listings are written in batches of `batch_size`, each as one executemany
+    of an INSERT ... ON CONFLICT (listing_key) DO UPDATE statement in its
+    own transaction, so a failure only rolls back the current batch.
+
+    Args:
+        listings (iterable): The listings to ingest, for example a scraper generator.
+        engine: SQLAlchemy engine; defaults to one for `database_url` or DATABASE_URL.
+        database_url (str): Used when no engine is given.
+        batch_size (int): The number of listings per statement and transaction.
+
+    Returns:
+        dict: The number of listings ingested and rejected, the elapsed seconds and the rows per second.
+    """
+    sink = JobsTableSink(engine, database_url)
+    start = time.perf_counter()
+    rows = write_listings(listings, sink, batch_size) - sink.rejected
+    elapsed = time.perf_counter() - start
+    rows_per_sec = rows / elapsed if elapsed else 0.0
+    print(f"Ingested {rows} job listings in {elapsed:.2f}s ({rows_per_sec:.0f} rows/sec)")
+    if sink.rejected:
+        print(f"Rejected {sink.rejected} job listings missing a required field")
+    return {'rows': rows, 'rejected': sink.rejected, 'elapsed': elapsed, 'rows_per_sec': rows_per_sec}
+
+def iter_listings_file(path, chunksize=100000):
+    """
+    Stream listings from a JSON Lines store, a CSV file or a Parquet dataset.
+
+    CSV and Parquet are read `chunksize` rows at a time, so the file never has to fit in memory.
+    """
+    if path.endswith('.jsonl'):
+        yield from JsonlStore(path)
+        return
+    for chunk in iter_table_chunks(path, chunksize=chunksize):
+        yield from chunk.to_dict('records')
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Upsert scraped job listings into the jobs table.")
+    arg_parser.add_argument('path', help="A .jsonl listing store, a CSV file or a Parquet dataset")
+    arg_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    arg_parser.add_argument('--database-url', default=None, help="Defaults to the DATABASE_URL environment variable")
+    args = arg_parser.parse_args()
+
+    ingest_listings(iter_listings_file(args.path), database_url=args.database_url, batch_size=args.batch_size)
@@ -0,0 +1,103 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_LEVEL = 'Unknown'
+
+# Levels in priority order: a title with keywords of several levels gets the first of them
+DEFAULT_KEYWORD_TABLE = (
+    ('Entry-level', ('intern', 'junior', 'entry', 'assistant', 'trainee')),
+    ('Mid-level', ('mid', 'senior', 'lead', 'manager', 'specialist')),
+    ('Advanced-level', ('director', 'vp', 'vice president', 'chief', 'head', 'principal')),
+)
+
+class JobLevelCategorizer:
+    """
+    Categorize job titles into levels by the whole-word keywords they contain.
+
+    All levels are matched by one compiled pattern. Every level is an
+    alternative of the form `(?=.*\\b(?:keyword|...)\\b)(?P<levelN>)`, anchored at
+    the start of the lowercased title, so the first level in the table
+    whose keywords occur anywhere in the title wins, the same priority as
+    checking the levels one after the other.
+    """
+
+    def __init__(self, keyword_table=DEFAULT_KEYWORD_TABLE, default=UNKNOWN_LEVEL):
+        """
+        Args:
+            keyword_table (iterable): (level, keywords) pairs in priority order.
+            default (str): The level of titles that match no keyword.
+        """
+        self.keyword_table = tuple((level, tuple(keywords)) for level, keywords in keyword_table)
+        self.levels = [level for level, _ in self.keyword_table]
+        self.default = default
+        alternatives = [
+            r'(?=.*?\b(?:{})\b)(?P<level{}>)'.format('|'.join(re.escape(keyword) for keyword in keywords), i)
+            for i, (_, keywords) in enumerate(self.keyword_table)
+        ]
+        self.pattern = re.compile(r'^(?:{})'.format('|'.join(alternatives)), re.DOTALL)
+
+    def categorize(self, title):
+        """
+        Return the level of a single job title.
+        """
+        match = self.pattern.match(title.lower())
+        if match is None:
+            return self.default
+        return self.levels[int(match.lastgroup[len('level'):])]
+
+    def categorize_series(self, titles):
+        """
+        Return the levels of many job titles at once.
+
+        Each distinct title is matched only once, with pandas' vectorized
+        str.extract, and the results are mapped back to every row. Missing
+        titles get the default level.
+
+        Args:
+            titles (pd.Series or iterable): The job titles.
+
+        Returns:
+            pd.Series: The level of every title, with the index of `titles`.
+        """
+        titles = titles if isinstance(titles, pd.Series) else pd.Series(list(titles), dtype=object)
+        codes, uniques = pd.factorize(titles)
+        matches = pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str).str.lower() \
+            .str.extract(self.pattern).notna().to_numpy()
+        unique_levels = np.where(
+            matches.any(axis=1), np.asarray(self.levels, dtype=object)[matches.argmax(axis=1)], self.default
+        )
+        # factorize gives missing titles the code -1, which picks the default appended last
+        unique_levels = np.append(unique_levels.astype(object), self.default)
+        return pd.Series(unique_levels[codes], index=titles.index, name=titles.name, dtype=object)
+
+_default_categorizer = JobLevelCategorizer()
+
+def categorize_job_title(title):
+    """
+    Return the level of a job title with the default keyword table.
+    """
+    return _default_categorizer.categorize(title)
+
+def categorize_job_titles(titles):
+    """
+    Return the levels of a Series of job titles with the default keyword table.
+    """
+    return _default_categorizer.categorize_series(titles)
+
+def legacy_categorize_job_title(title):
+    """
+    Categorize a title with one regex search per level, the row-by-row version JobLevelCategorizer replaced.
+
+    Kept as the reference the categorizer must agree with and as the benchmark baseline.
+    """
+    title = title.lower()
+    if re.search(r'\b(intern|junior|entry|assistant|trainee)\b', title):
+        return 'Entry-level'
+    elif re.search(r'\b(mid|senior|lead|manager|specialist)\b', title):
+        return 'Mid-level'
+    elif re.search(r'\b(director|vp|vice president|chief|head|principal)\b', title):
+        return 'Advanced-level'
+    else:
+        return UNKNOWN_LEVEL
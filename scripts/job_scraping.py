@@ -1,53 +1,160 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+from scripts import http_client
 
-def scrape_job_listings(content, title_selector, description_selector, is_url=True):
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# The package each optional parser backend needs
+PARSER_PACKAGES = {'selectolax': 'selectolax', 'lxml': 'lxml'}
+
+# Only the listing subtrees are built into the tree; the rest of the page is skipped
+LISTING_STRAINER = SoupStrainer('div', class_='job-listing')
+
+def available_parsers():
     """
-    Scrape job listings from the given URL or HTML content and return a list of job details.
+    Return the installed parser backends, fastest first.
+
+    'selectolax' and 'lxml' are used when their packages are installed;
+    'html.parser' is always available.
+    """
+    parsers = []
+    if HTMLParser is not None:
+        parsers.append('selectolax')
+    if builder_registry.lookup('lxml') is not None:
+        parsers.append('lxml')
+    parsers.append('html.parser')
+    return parsers
+
+def _check_parser(parser):
+    parsers = available_parsers()
+    if parser in parsers:
+        return
+    if parser in PARSER_PACKAGES:
+        raise ValueError(f"The '{parser}' parser needs the {PARSER_PACKAGES[parser]} package, which is not installed; "
+                         f"install it or use one of {parsers}")
+    raise ValueError(f"Unknown parser '{parser}'; use one of {parsers} or 'auto'")
+
+def _select_listings(html_content, title_selector, description_selector, parser):
+    if parser == 'selectolax':
+        tree = HTMLParser(html_content)
+        for job_listing in tree.css("div.job-listing"):
+            title_element = job_listing.css_first(title_selector)
+            description_element = job_listing.css_first(description_selector)
+            yield (
+                title_element.text() if title_element is not None else None,
+                description_element.text() if description_element is not None else None
+            )
+    else:
+        soup = BeautifulSoup(html_content, parser, parse_only=LISTING_STRAINER)
+        for job_listing in soup.select("div.job-listing"):
+            title_element = job_listing.select_one(title_selector)
+            description_element = job_listing.select_one(description_selector)
+            yield (
+                title_element.text if title_element else None,
+                description_element.text if description_element else None
+            )
+
+def fetch_page_content(url):
+    """
+    Fetch the raw HTML content of a job listings page.
 
     Args:
-        content (str): The URL of the job listings page to scrape or HTML content.
+        url (str): The URL of the job listings page to fetch.
+
+    Returns:
+        bytes: The raw page content, or None if the request failed.
+    """
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()  # Raise an HTTPError for bad responses
+        return response.content
+    except requests.RequestException as e:
+        print(f"Error fetching the URL: {e}")
+        return None
+
+def iter_job_listings(html_content, title_selector, description_selector, parser='auto'):
+    """
+    Parse job listings out of the given HTML content, yielding them one at a time.
+
+    Args:
+        html_content (str or bytes): The HTML content of a job listings page.
         title_selector (str): The CSS selector for job titles.
         description_selector (str): The CSS selector for job descriptions.
-        is_url (bool): Flag indicating whether the content is a URL or HTML content.
+        parser (str): The parser backend, one of available_parsers(), or 'auto' for the fastest one.
+
+    Yields:
+        dict: The details of one job listing.
+    """
+    if parser == 'auto':
+        parser = available_parsers()[0]
+    _check_parser(parser)
+
+    # Extract job titles and descriptions from the page
+    for title_text, description_text in _select_listings(html_content, title_selector, description_selector, parser):
+        title = title_text.strip() if title_text is not None else "No title provided."
+        description = description_text.strip() if description_text is not None else "No description provided."
+        print(f"Debug: Found job listing - Title: {title}, Description: {description}")
+
+        yield {
+            'title': title,
+            'description': description
+        }
+
+def parse_job_listings(html_content, title_selector, description_selector, parser='auto'):
+    """
+    Parse job listings out of the given HTML content.
+
+    Args:
+        html_content (str or bytes): The HTML content of a job listings page.
+        title_selector (str): The CSS selector for job titles.
+        description_selector (str): The CSS selector for job descriptions.
+        parser (str): The parser backend, one of available_parsers(), or 'auto' for the fastest one.
 
     Returns:
         list: A list of dictionaries containing job details.
     """
+    job_listings = list(iter_job_listings(html_content, title_selector, description_selector, parser))
+    print(f"Debug: Parsed {len(job_listings)} job listings")
+    return job_listings
+
+def iter_scrape_job_listings(content, title_selector, description_selector, is_url=True, parser='auto'):
+    """
+    Scrape job listings from the given URL or HTML content, yielding them one at a time.
+
+    Takes the same arguments as scrape_job_listings.
+
+    Yields:
+        dict: The details of one job listing.
+    """
     if is_url:
-        try:
-            response = requests.get(content)
-            response.raise_for_status()  # Raise an HTTPError for bad responses
-            html_content = response.content
-        except requests.RequestException as e:
-            print(f"Error fetching the URL: {e}")
-            return []
+        html_content = fetch_page_content(content)
+        if html_content is None:
+            return
     else:
         html_content = content
 
-    soup = BeautifulSoup(html_content, 'html.parser')
-    print(f"Debug: Soup object created - {soup.prettify()}")
+    yield from iter_job_listings(html_content, title_selector, description_selector, parser)
 
-    job_listings = []
+def scrape_job_listings(content, title_selector, description_selector, is_url=True, parser='auto'):
+    """
+    Scrape job listings from the given URL or HTML content and return a list of job details.
 
-    # Extract job titles and descriptions from the page
-    for job_listing in soup.select("div.job-listing"):
-        try:
-            title_element = job_listing.select_one(title_selector)
-            description_element = job_listing.select_one(description_selector)
-            title = title_element.text.strip() if title_element else "No title provided."
-            description = description_element.text.strip() if description_element else "No description provided."
-            print(f"Debug: Found job listing - Title: {title}, Description: {description}")
-        except AttributeError:
-            print("Error parsing job element, skipping...")
-            continue
-
-        job_listings.append({
-            'title': title,
-            'description': description
-        })
+    Args:
+        content (str): The URL of the job listings page to scrape or HTML content.
+        title_selector (str): The CSS selector for job titles.
+        description_selector (str): The CSS selector for job descriptions.
+        is_url (bool): Flag indicating whether the content is a URL or HTML content.
+        parser (str): The parser backend, one of available_parsers(), or 'auto' for the fastest one.
 
-    print(f"Debug: Final job listings - {job_listings}")
+    Returns:
+        list: A list of dictionaries containing job details.
+    """
+    job_listings = list(iter_scrape_job_listings(content, title_selector, description_selector, is_url, parser))
+    print(f"Debug: Scraped {len(job_listings)} job listings")
     return job_listings
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+import json
+import os
+import struct
+
+# Offsets in the sidecar index are unsigned 64-bit little-endian integers
+_OFFSET = struct.Struct('<Q')
+
+def _is_json(line):
+    try:
+        json.loads(line)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+class JsonlStore:
+    """
+    Append-only store of listings as JSON Lines, one listing per line.
+
+    Saving a batch is a single O_APPEND write, so it costs the size of the
+    batch rather than the size of the history, and concurrent writers never
+    interleave inside a line. With `index=True` the byte offset of every line
+    is kept in a `.idx` sidecar file, which gives random access by position;
+    once the sidecar exists, every instance keeps it up to date.
+    Filtering is done by compact(), which streams the store into a new file
+    and swaps it in atomically.
+    """
+
+    def __init__(self, path, index=False):
+        """
+        Args:
+            path (str): The JSON Lines file.
+            index (bool): Create the `<path>.idx` offset index if it is missing; an existing one is always
+                maintained.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.index_path = path + '.idx'
+        self.index = index
+        if index and not os.path.exists(self.index_path):
+            self.build_index()
+
+    def append(self, listings):
+        """
+        Append listings to the store in one atomic write.
+
+        Returns:
+            int: The number of listings written.
+        """
+        lines = [(json.dumps(listing, ensure_ascii=False) + '\n').encode('utf-8') for listing in listings]
+        if not lines:
+            return 0
+        data = b''.join(lines)
+
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # A line torn by a crash has no newline; start on a new line so it does not swallow the first listing
+            size = os.fstat(fd).st_size
+            lead = b'\n' if size and os.pread(fd, 1, size - 1) != b'\n' else b''
+            data = lead + data
+            written = os.write(fd, data)
+            # Regular files take the whole buffer in one write; finish the rare short write
+            while written < len(data):
+                written += os.write(fd, data[written:])
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+
+        if self._indexed():
+            offset = end - len(data) + len(lead)
+            offsets = []
+            for line in lines:
+                offsets.append(_OFFSET.pack(offset))
+                offset += len(line)
+            self._append_index(b''.join(offsets))
+        return len(lines)
+
+    def __iter__(self):
+        """
+        Stream the listings in the order they were appended.
+
+        A line that is not valid JSON, such as a write cut short by a crash, is skipped.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as jsonl_file:
+            for line in jsonl_file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed line in {self.path}")
+
+    def __len__(self):
+        if self.index:
+            return os.path.getsize(self.index_path) // _OFFSET.size if os.path.exists(self.index_path) else 0
+        return sum(1 for _ in self)
+
+    def __getitem__(self, position):
+        """
+        Return the listing at `position`, reading only its line through the index.
+        """
+        if not self.index:
+            raise TypeError("Random access requires a store opened with index=True")
+        if position < 0:
+            position += len(self)
+        if position < 0 or not os.path.exists(self.index_path):
+            raise IndexError(position)
+        with open(self.index_path, 'rb') as index_file:
+            index_file.seek(position * _OFFSET.size)
+            packed = index_file.read(_OFFSET.size)
+        if len(packed) < _OFFSET.size:
+            raise IndexError(position)
+        with open(self.path, 'rb') as jsonl_file:
+            jsonl_file.seek(_OFFSET.unpack(packed)[0])
+            return json.loads(jsonl_file.readline())
+
+    def build_index(self):
+        """
+        Rebuild the offset index from the store.
+        """
+        offsets = []
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as jsonl_file:
+                offset = 0
+                for line in jsonl_file:
+                    # Skip what __iter__ skips, so positions match the order of iteration
+                    if line.strip() and _is_json(line):
+                        offsets.append(_OFFSET.pack(offset))
+                    offset += len(line)
+        temporary_path = self.index_path + '.tmp'
+        with open(temporary_path, 'wb') as index_file:
+            index_file.write(b''.join(offsets))
+        os.replace(temporary_path, self.index_path)
+
+    def compact(self, keep=None, transform=None):
+        """
+        Rewrite the store, streaming, with only the listings `keep` accepts.
+
+        The listings are written to a temporary file next to the store, which
+        then replaces it atomically, so readers see either the old or the new
+        store. Listings appended while the compaction runs may be lost, so
+        run it when no scraper is writing.
+
+        Args:
+            keep (callable): Called with each listing; the listing is kept if it returns True.
+            transform (callable): Optional function applied to each kept listing.
+
+        Returns:
+            tuple: The number of listings kept and the number dropped.
+        """
+        kept = dropped = 0
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as compacted_file:
+            for listing in self:
+                if keep is not None and not keep(listing):
+                    dropped += 1
+                    continue
+                if transform is not None:
+                    listing = transform(listing)
+                compacted_file.write(json.dumps(listing, ensure_ascii=False) + '\n')
+                kept += 1
+        indexed = self._indexed()
+        os.replace(temporary_path, self.path)
+        if indexed:
+            self.build_index()
+        return kept, dropped
+
+    def _indexed(self):
+        return self.index or os.path.exists(self.index_path)
+
+    def _append_index(self, data):
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
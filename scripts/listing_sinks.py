@@ -0,0 +1,193 @@
+import csv
+import itertools
+import json
+import os
+
+from sqlalchemy import create_engine
+
+from scripts.create_db_schema import Job
+from scripts.dedup_gate import listing_field, listing_key
+
+DEFAULT_BATCH_SIZE = 500
+
+def iter_batches(listings, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Group an iterable of listings into lists of at most batch_size items.
+    """
+    listings = iter(listings)
+    while True:
+        batch = list(itertools.islice(listings, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def write_listings(listings, sink, batch_size=DEFAULT_BATCH_SIZE, dedup_gate=None, checkpoints=()):
+    """
+    Stream listings into a sink in batches, without holding more than one batch in memory.
+
+    The dedup gate and the checkpoints are committed after every batch the
+    sink has written, so a listing is only remembered once it is stored. If
+    writing fails, what they recorded for the unwritten batch is rolled
+    back before the error is raised.
+
+    Args:
+        listings (iterable): The job listings to write, for example a scraper generator.
+        sink: A CsvSink, JsonlSink or JobsTableSink.
+        batch_size (int): The number of listings written at a time.
+        dedup_gate (DedupGate): Optional gate; listings it has seen before are not written.
+        checkpoints (iterable): Other stores with commit() and rollback() that the listings
+            passed through, such as the FingerprintStore of the scraper producing them.
+
+    Returns:
+        int: The number of listings written.
+    """
+    checkpoints = list(checkpoints)
+    if dedup_gate is not None:
+        listings = dedup_gate.new_listings(listings)
+        checkpoints.append(dedup_gate)
+    count = 0
+    try:
+        for batch in iter_batches(listings, batch_size):
+            sink.write_batch(batch)
+            count += len(batch)
+            for checkpoint in checkpoints:
+                checkpoint.commit()
+    except BaseException:
+        for checkpoint in checkpoints:
+            checkpoint.rollback()
+        raise
+    # Pages recorded after the last listing was handed on
+    for checkpoint in checkpoints:
+        checkpoint.commit()
+    return count
+
+class _Sink:
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class CsvSink(_Sink):
+    """
+    Writes listings as rows of a CSV file.
+
+    The columns are taken from `fieldnames`, or from the keys of the first
+    listing written. Keys outside those columns are ignored.
+    """
+
+    def __init__(self, path, fieldnames=None, append=True):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._has_header = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if self._has_header and fieldnames is None:
+            with open(path, newline='') as existing_file:
+                fieldnames = next(csv.reader(existing_file))
+        self.fieldnames = fieldnames
+        self._file = open(path, 'a' if append else 'w', newline='')
+        self._writer = None
+
+    def write_batch(self, batch):
+        if self._writer is None:
+            self.fieldnames = self.fieldnames or list(batch[0].keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction='ignore')
+            if not self._has_header:
+                self._writer.writeheader()
+        self._writer.writerows(batch)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class JsonlSink(_Sink):
+    """
+    Writes listings as JSON Lines, one listing per line.
+    """
+
+    def __init__(self, path, append=True):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write_batch(self, batch):
+        self._file.write(''.join(json.dumps(listing, ensure_ascii=False) + '\n' for listing in batch))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# Columns refreshed when a listing that is already in the jobs table is scraped again
+UPSERT_COLUMNS = ('title', 'description', 'location', 'company', 'url')
+
+def upsert_statement(dialect_name):
+    """
+    Return an INSERT into `jobs` that updates the existing row when the listing_key is already there.
+    """
+    table = Job.__table__
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        return statement.on_duplicate_key_update({column: statement.inserted[column] for column in UPSERT_COLUMNS})
+    else:
+        raise ValueError(f"Upserts are not supported for the {dialect_name} dialect")
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=['listing_key'],
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+    )
+
+class JobsTableSink(_Sink):
+    """
+    Upserts listings into the `jobs` table, one statement and one transaction per batch.
+
+    Listings are keyed by their canonical listing_key, so a listing scraped
+    again updates its row instead of adding a copy. Listings without a value
+    for a required column, such as the title, are skipped and counted in
+    `rejected`, so they do not fail the statement for the rest of the batch.
+    """
+
+    def __init__(self, engine=None, database_url=None):
+        if engine is None:
+            database_url = database_url or os.getenv('DATABASE_URL')
+            if not database_url:
+                raise RuntimeError("DATABASE_URL environment variable is not set.")
+            engine = create_engine(database_url)
+        self.engine = engine
+        self._statement = upsert_statement(engine.dialect.name)
+        self._required = [column.name for column in Job.__table__.columns
+                          if not column.nullable and not column.primary_key]
+        self.rejected = 0
+
+    @staticmethod
+    def to_row(listing):
+        return {
+            'title': listing_field(listing, 'job_title', 'title', 'jobTitle'),
+            'description': listing_field(listing, 'description'),
+            'location': listing_field(listing, 'location'),
+            'company': listing_field(listing, 'company', 'company_name', 'companyName'),
+            'url': listing_field(listing, 'url'),
+            'listing_key': listing_key(listing)
+        }
+
+    def write_batch(self, batch):
+        # A key may only be upserted once per statement; the last copy in the batch wins
+        rows = {}
+        for listing in batch:
+            row = self.to_row(listing)
+            if any(row.get(column) is None for column in self._required):
+                self.rejected += 1
+                continue
+            rows[row['listing_key']] = row
+        if not rows:
+            return
+        with self.engine.begin() as connection:
+            connection.execute(self._statement, list(rows.values()))
@@ -0,0 +1,193 @@
+import argparse
+import html
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TITLES = ('Software Engineer', 'Senior Data Scientist', 'Junior QA Analyst', 'Engineering Manager',
+          'Director of Product', 'Intern, Machine Learning')
+COMPANIES = ('Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli')
+LOCATIONS = ('Remote', 'Austin, TX', 'Boston, MA', 'New York, NY', 'Seattle, WA')
+
+class MockJobBoard:
+    """
+    Local job board served over HTTP, for load-testing the scrapers without the internet.
+
+    Paths:
+        /jobs?page=N: a board page in the markup scrape_job_listings, job_scraping
+            and collect_job_listings expect (div.job-listing inside an article).
+        /search?q=...&start=N: a results page in Google's job search markup.
+
+    Pages past `pages` have no listings, which is how the paginated scrapers
+    detect the end of the board. Every request waits `latency` seconds, fails
+    with a 500 with probability `error_rate`, and is answered with a 429 and a
+    Retry-After header when it exceeds `rate_limit` requests per second.
+    """
+
+    def __init__(self, pages=20, listings_per_page=20, latency=0.0, error_rate=0.0, rate_limit=None,
+                 host='127.0.0.1', port=0, seed=0):
+        """
+        Args:
+            pages (int): The number of pages with listings.
+            listings_per_page (int): The number of listings on each page.
+            latency (float): Seconds every response is delayed by.
+            error_rate (float): The fraction of requests answered with a 500.
+            rate_limit (float): Requests per second served before answering 429; None for no limit.
+            host (str): The interface to listen on.
+            port (int): The port to listen on; 0 picks a free port.
+            seed (int): Seed for the error injection, so runs are repeatable.
+        """
+        self.pages = pages
+        self.listings_per_page = listings_per_page
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _admit(self):
+        """
+        Decide how to answer the next request: None to serve it, or (status, retry_after).
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    self.stats['throttled'] += 1
+                    return 429, math.ceil((1 - self._tokens) / self.rate_limit)
+                self._tokens -= 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 500, None
+        return None
+
+    def listings(self, page):
+        """
+        Return the listings shown on a page, starting at page 1.
+        """
+        if not 1 <= page <= self.pages:
+            return []
+        first = (page - 1) * self.listings_per_page
+        return [{
+            'job_title': TITLES[number % len(TITLES)],
+            'company': COMPANIES[number % len(COMPANIES)],
+            'location': LOCATIONS[number % len(LOCATIONS)],
+            'description': f"Listing {number} on page {page}.",
+            'url': f"https://jobs.example.com/{number}"
+        } for number in range(first, first + self.listings_per_page)]
+
+    def render_board_page(self, page):
+        items = ''.join(
+            '<article><div class="job-listing">'
+            f'<h2 class="job-title">{html.escape(listing["job_title"])}</h2>'
+            f'<div class="company">{html.escape(listing["company"])}</div>'
+            f'<div class="location">{html.escape(listing["location"])}</div>'
+            f'<div class="description job-description">{html.escape(listing["description"])}</div>'
+            '</div></article>'
+            for listing in self.listings(page)
+        )
+        return f"<html><body><h1>Jobs, page {page}</h1>{items}</body></html>"
+
+    def render_search_page(self, start):
+        items = ''.join(
+            '<div jsname="Q4LuWd">'
+            f'<div role="heading">{html.escape(listing["job_title"])}</div>'
+            f'<div class="BjJfJf">{html.escape(listing["company"])}</div>'
+            f'<div class="Qk80Jf">{html.escape(listing["location"])}</div>'
+            f'<a href="{listing["url"]}">Apply</a>'
+            '</div>'
+            for listing in self.listings(start // 10 + 1)
+        )
+        return f"<html><body>{items}</body></html>"
+
+    def _make_handler(self):
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if board.latency:
+                    time.sleep(board.latency)
+                rejection = board._admit()
+                if rejection is not None:
+                    status, retry_after = rejection
+                    headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+                    return self._send(status, b'', headers)
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == '/jobs':
+                    body = board.render_board_page(int(query.get('page', ['1'])[0]))
+                elif url.path == '/search':
+                    body = board.render_search_page(int(query.get('start', ['0'])[0]))
+                else:
+                    return self._send(404, b'')
+                self._send(200, body.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Serve a local mock job board.")
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('--pages', type=int, default=20)
+    arg_parser.add_argument('--listings-per-page', type=int, default=20)
+    arg_parser.add_argument('--latency', type=float, default=0.0, help="Seconds each response is delayed by")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500")
+    arg_parser.add_argument('--rate-limit', type=float, default=None, help="Requests per second before answering 429")
+    args = arg_parser.parse_args()
+
+    with MockJobBoard(args.pages, args.listings_per_page, args.latency, args.error_rate, args.rate_limit,
+                      port=args.port) as board:
+        print(f"Serving mock job board on {board.url}/jobs and {board.url}/search")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
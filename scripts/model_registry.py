@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import joblib
+from sklearn.preprocessing import LabelEncoder
+
+DEFAULT_MODELS_DIR = os.path.join(os.path.dirname(__file__), '../models')
+
+MODEL_FILE = 'job_matching_model.pkl'
+VECTORIZER_FILE = 'tfidf_vectorizer.pkl'
+LABEL_CLASSES_FILE = 'label_encoder_classes.pkl'
+# Written last by save_bundle; names the artifacts of one training run under a new stamp
+MANIFEST_FILE = 'model_manifest.json'
+
+# How often bundle() re-reads a manifest whose artifacts are still being replaced
+LOAD_ATTEMPTS = 50
+LOAD_RETRY_DELAY = 0.1
+
+# Everything a prediction needs, loaded from one model directory
+ModelBundle = namedtuple('ModelBundle', ['version', 'model', 'vectorizer', 'label_encoder'])
+
+def _replace(path, write):
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def save_bundle(directory, model, vectorizer, classes=None, model_file=MODEL_FILE):
+    """
+    Save a model with its vectorizer and label classes as one unit of a models directory.
+
+    Every artifact is written to a temporary file and moved into place, and
+    the manifest naming them is replaced last under a new stamp, so a
+    ModelRegistry never serves the model of one training run with the
+    vectorizer of another.
+
+    Args:
+        directory (str): The models directory, or the subdirectory of a version.
+        model: The trained classifier.
+        vectorizer: The vectorizer that turns listings into the model's features.
+        classes (np.ndarray): The label encoder classes, if the model predicts encoded labels.
+        model_file (str): The file name of the model within `directory`.
+
+    Returns:
+        str: The stamp of the new manifest.
+    """
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    artifacts = {'model': (model_file, model), 'vectorizer': (VECTORIZER_FILE, vectorizer)}
+    if classes is not None:
+        artifacts['label_classes'] = (LABEL_CLASSES_FILE, classes)
+    files = {}
+    for role, (name, artifact) in artifacts.items():
+        path = os.path.join(directory, name)
+        _replace(path, lambda tmp_path: joblib.dump(artifact, tmp_path))
+        stat = os.stat(path)
+        files[role] = [name, stat.st_size, stat.st_mtime_ns]
+    manifest = {'stamp': uuid.uuid4().hex, 'created_at': time.time(), 'files': files}
+
+    def write_manifest(tmp_path):
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+    _replace(os.path.join(directory, MANIFEST_FILE), write_manifest)
+    return manifest['stamp']
+
+def read_manifest(directory):
+    """
+    Return the stamp and the artifact files of a model directory.
+
+    Without a manifest, as for models saved before manifests were written,
+    the stamp is made of the sizes and modification times of the default
+    artifact files.
+
+    Returns:
+        tuple: The stamp and a dict from role to [file name, size, mtime_ns], or to [file name] without a manifest.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as manifest_file:
+            manifest = json.load(manifest_file)
+        return manifest['stamp'], manifest['files']
+    except FileNotFoundError:
+        files = {'model': [MODEL_FILE], 'vectorizer': [VECTORIZER_FILE], 'label_classes': [LABEL_CLASSES_FILE]}
+        stats = [os.stat(os.path.join(directory, name)) for name, in files.values()]
+        return tuple((stat.st_size, stat.st_mtime_ns) for stat in stats), files
+
+class ModelRegistry:
+    """
+    Keep model bundles loaded in the process and reload them when a new one is saved.
+
+    A version is a subdirectory of `models_dir` holding the model, the
+    vectorizer and the label classes; version None is `models_dir`
+    itself. Every version that has been asked for stays loaded, so several
+    can serve side by side. Each access stats the version's manifest, parses
+    it only when the file was replaced, and reloads the whole bundle only
+    when its stamp changed, so a retrained
+    model is picked up without restarting the process and is never mixed
+    with the artifacts of another training run. Loading happens outside the
+    registry's lock, so a slow load of one version does not stall the
+    others.
+    """
+
+    def __init__(self, models_dir=DEFAULT_MODELS_DIR):
+        """
+        Args:
+            models_dir (str): The directory of the default version and of the versioned subdirectories.
+        """
+        self.models_dir = models_dir
+        self._artifacts = {}
+        self._bundles = {}
+        self._manifests = {}
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self.stats = {'loads': 0, 'hits': 0}
+
+    def _directory(self, version):
+        return self.models_dir if version is None else os.path.join(self.models_dir, str(version))
+
+    def _load_lock(self, key):
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def _manifest(self, directory):
+        # Parse the manifest again only when it was replaced; save_bundle always writes a new file
+        try:
+            stat = os.stat(os.path.join(directory, MANIFEST_FILE))
+        except FileNotFoundError:
+            return read_manifest(directory)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._manifests.get(directory)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        manifest = read_manifest(directory)
+        with self._lock:
+            self._manifests[directory] = (signature, manifest)
+        return manifest
+
+    def _load_file(self, path, expected=None):
+        # Returns None if the file is not the one the manifest describes, i.e. it is being replaced
+        with open(path, 'rb') as artifact_file:
+            stat = os.fstat(artifact_file.fileno())
+            if expected is not None and [stat.st_size, stat.st_mtime_ns] != list(expected):
+                return None
+            artifact = joblib.load(artifact_file)
+        with self._lock:
+            self.stats['loads'] += 1
+        return artifact
+
+    def load(self, path):
+        """
+        Return the object in a joblib file, loading it again only if the file changed.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._artifacts.get(path)
+            if cached is not None and cached[0] == signature:
+                self.stats['hits'] += 1
+                return cached[1]
+        with self._load_lock(path):
+            with self._lock:
+                cached = self._artifacts.get(path)
+            if cached is None or cached[0] != signature:
+                cached = (signature, self._load_file(path))
+                with self._lock:
+                    self._artifacts[path] = cached
+            return cached[1]
+
+    def artifact(self, name, version=None):
+        """
+        Return one artifact of a version, such as VECTORIZER_FILE, reloading it if it changed.
+
+        The model, vectorizer and label classes come from the version's bundle.
+        """
+        if name in (MODEL_FILE, VECTORIZER_FILE, LABEL_CLASSES_FILE):
+            bundle = self.bundle(version)
+            if name == MODEL_FILE:
+                return bundle.model
+            if name == VECTORIZER_FILE:
+                return bundle.vectorizer
+            return bundle.label_encoder.classes_
+        return self.load(os.path.join(self._directory(version), name))
+
+    def _load_bundle(self, version, directory, files):
+        artifacts = {}
+        for role, (name, *expected) in files.items():
+            artifact = self._load_file(os.path.join(directory, name), expected or None)
+            if artifact is None:
+                return None
+            artifacts[role] = artifact
+        label_encoder = None
+        if 'label_classes' in artifacts:
+            label_encoder = LabelEncoder()
+            label_encoder.classes_ = artifacts['label_classes']
+        return ModelBundle(version, artifacts['model'], artifacts['vectorizer'], label_encoder)
+
+    def bundle(self, version=None):
+        """
+        Return the model, vectorizer and label encoder of a version, reloading them if a new bundle was saved.
+
+        Args:
+            version (str): A subdirectory of the models directory; None for the directory itself.
+
+        Returns:
+            ModelBundle: The loaded artifacts.
+        """
+        directory = self._directory(version)
+        stamp, files = self._manifest(directory)
+        with self._lock:
+            cached = self._bundles.get(version)
+            if cached is not None and cached[0] == stamp:
+                self.stats['hits'] += 1
+                return cached[1]
+
+        with self._load_lock(directory):
+            for _ in range(LOAD_ATTEMPTS):
+                with self._lock:
+                    cached = self._bundles.get(version)
+                # Another thread may have loaded this stamp while we waited for the lock
+                if cached is not None and cached[0] == stamp:
+                    return cached[1]
+                bundle = self._load_bundle(version, directory, files)
+                if bundle is not None:
+                    with self._lock:
+                        self._bundles[version] = (stamp, bundle)
+                    return bundle
+                # A newer bundle is being saved; its manifest comes last
+                time.sleep(LOAD_RETRY_DELAY)
+                stamp, files = self._manifest(directory)
+        raise RuntimeError(f"The artifacts in {directory} do not match its {MANIFEST_FILE}")
+
+    def versions(self):
+        """
+        Return the versions that have a model, None first if the models directory has one.
+        """
+        def has_model(directory):
+            return any(os.path.isfile(os.path.join(directory, name)) for name in (MANIFEST_FILE, MODEL_FILE))
+
+        versions = [None] if has_model(self.models_dir) else []
+        for name in sorted(os.listdir(self.models_dir)):
+            if has_model(os.path.join(self.models_dir, name)):
+                versions.append(name)
+        return versions
+
+    def evict(self, version=None):
+        """
+        Drop a version's artifacts from memory; it is loaded again on next use.
+        """
+        directory = self._directory(version)
+        with self._lock:
+            self._bundles.pop(version, None)
+            self._manifests.pop(directory, None)
+            for path in list(self._artifacts):
+                if os.path.dirname(path) == directory:
+                    del self._artifacts[path]
+
+default_registry = ModelRegistry()
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), '../data/near_duplicates.db')
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+def listing_text(listing):
+    """
+    Return the title, company and description of a listing as one normalized string.
+    """
+    parts = (
+        listing.get('job_title') or listing.get('title') or listing.get('jobTitle'),
+        listing.get('company') or listing.get('company_name') or listing.get('companyName'),
+        listing.get('description'),
+    )
+    text = ' '.join(str(part) for part in parts if part)
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Return the set of word `size`-grams of a text; a shorter text is a single shingle.
+    """
+    words = text.split()
+    if len(words) <= size:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class MinHasher:
+    """
+    Computes MinHash signatures whose agreement estimates the Jaccard similarity of shingle sets.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        generator = np.random.RandomState(seed)
+        # Coefficients below 2**32 keep a * hash inside 64 bits
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+             for shingle in shingle_set],
+            dtype=np.uint64
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of listings, stored in SQLite.
+
+    Each listing's signature is cut into `bands` bands and every band is
+    stored under its hash, so a new listing is only compared with listings
+    that share at least one band bucket instead of with every listing seen.
+    Candidates are confirmed by estimating their Jaccard similarity from the
+    full signatures.
+
+    Signatures added since the last commit() stay in the open SQLite
+    transaction: later checks already see them, but they are only stored by
+    commit(), which the consumer calls once the listings are written, for
+    example through write_listings(checkpoints=[index]). rollback() drops
+    them. Leaving the index as a context manager commits, or rolls back on
+    an exception. Listings without any text are never indexed, since they
+    would all share one signature.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 threshold=DEFAULT_THRESHOLD, seed=1):
+        """
+        Args:
+            path (str): The SQLite file the index is stored in.
+            num_perm (int): The number of MinHash permutations per signature.
+            bands (int): The number of LSH bands; must divide num_perm.
+            threshold (float): The estimated Jaccard similarity from which two listings are near-duplicates.
+            seed (int): Seed of the MinHash permutations.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS signatures (id INTEGER PRIMARY KEY, signature BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS buckets (band INTEGER NOT NULL, hash INTEGER NOT NULL, id INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS buckets_band_hash ON buckets (band, hash);
+        """)
+        # Signatures are only comparable when they were built with the same permutations and bands
+        settings = {'num_perm': num_perm, 'bands': bands, 'seed': seed}
+        self._conn.executemany("INSERT OR IGNORE INTO settings (name, value) VALUES (?, ?)", settings.items())
+        stored = dict(self._conn.execute("SELECT name, value FROM settings"))
+        self._conn.commit()
+        if stored != settings:
+            self._conn.close()
+            raise ValueError(f"{path} was built with {stored}, not {settings}")
+
+    def _band_hashes(self, signature):
+        return [
+            int.from_bytes(hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(),
+                                           digest_size=8).digest(), 'little', signed=True)
+            for band in range(self.bands)
+        ]
+
+    def _query(self, signature, band_hashes):
+        candidates = set()
+        for band, band_hash in enumerate(band_hashes):
+            candidates.update(row[0] for row in self._conn.execute(
+                "SELECT id FROM buckets WHERE band = ? AND hash = ?", (band, band_hash)
+            ))
+        matches = []
+        for candidate in candidates:
+            stored = self._conn.execute("SELECT signature FROM signatures WHERE id = ?", (candidate,)).fetchone()[0]
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint32) == signature))
+            if similarity >= self.threshold:
+                matches.append((candidate, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def query(self, listing):
+        """
+        Return the (id, estimated similarity) of indexed listings that are near-duplicates of `listing`.
+        """
+        if not listing_text(listing):
+            return []
+        signature = self.hasher.signature(shingles(listing_text(listing)))
+        with self._lock:
+            return self._query(signature, self._band_hashes(signature))
+
+    def add(self, listing):
+        """
+        Index a listing and return its id, or None if it has no text to index.
+        """
+        if not listing_text(listing):
+            return None
+        signature = self.hasher.signature(shingles(listing_text(listing)))
+        with self._lock:
+            return self._add(signature, self._band_hashes(signature))
+
+    def _add(self, signature, band_hashes):
+        listing_id = self._conn.execute(
+            "INSERT INTO signatures (signature) VALUES (?)", (signature.tobytes(),)
+        ).lastrowid
+        self._conn.executemany(
+            "INSERT INTO buckets (band, hash, id) VALUES (?, ?, ?)",
+            ((band, band_hash, listing_id) for band, band_hash in enumerate(band_hashes))
+        )
+        return listing_id
+
+    def check(self, listing):
+        """
+        Return the id of the closest near-duplicate of `listing`, or index it and return None if it is new.
+
+        A listing without text is let through without being indexed.
+        """
+        text = listing_text(listing)
+        if not text:
+            return None
+        signature = self.hasher.signature(shingles(text))
+        band_hashes = self._band_hashes(signature)
+        with self._lock:
+            matches = self._query(signature, band_hashes)
+            if matches:
+                return matches[0][0]
+            self._add(signature, band_hashes)
+            return None
+
+    def unique_listings(self, listings):
+        """
+        Yield the listings that are not near-duplicates of an indexed listing, indexing each one.
+
+        Near-duplicates within `listings` are caught as well, since each new
+        listing is indexed before the next one is checked. The new signatures
+        are only stored by commit().
+        """
+        for listing in listings:
+            if self.check(listing) is None:
+                yield listing
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def commit(self):
+        """
+        Store the signatures added since the last commit(), once their listings are safely written.
+        """
+        with self._lock:
+            self._conn.commit()
+
+    def rollback(self):
+        """
+        Drop the signatures added since the last commit(), so their listings count as new again.
+        """
+        with self._lock:
+            self._conn.rollback()
+
+    def close(self):
+        """
+        Close the index; signatures added since the last commit() are not stored.
+        """
+        with self._lock:
+            self._conn.rollback()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from scripts import (columnar_store, dataset_cache, evaluate_model, feature_extraction, job_level_categorizer,
+                     model_registry, preprocess_job_listings, redefine_job_levels, sparse_features, train_model)
+from scripts.columnar_store import write_table
+from scripts.dataset_cache import file_digest
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+MODELS_DIR = os.path.join(ROOT_DIR, 'models')
+DEFAULT_STATE_PATH = os.path.join(DATA_DIR, '.cache', 'pipeline_state.json')
+
+class Stage(namedtuple('Stage', ['name', 'func', 'inputs', 'outputs', 'params', 'code'])):
+    """
+    One step of the pipeline: `func(*inputs, *outputs, **params)`.
+
+    Attributes:
+        name (str): The name of the stage.
+        func (callable): A module-level function, so it can run in another process.
+        inputs (tuple): The files or directories the stage reads.
+        outputs (tuple): The files or directories the stage writes.
+        params (dict): Extra keyword arguments for func.
+        code (tuple): The modules whose source, together with func's, decides whether the stage is stale.
+    """
+    __slots__ = ()
+
+def _redefine(input_csv, output_csv):
+    write_table(redefine_job_levels.redefine_job_levels(input_csv), output_csv)
+
+def _train(features_path, model_path, *bundle_paths):
+    # train_model writes the rest of the bundle next to the model itself
+    train_model.train_model(features_path, model_path)
+
+def _evaluate(model_path, manifest_path, features_path, metrics_path):
+    # The manifest is an input so a retrained vectorizer or label classes re-run the evaluation
+    metrics = evaluate_model.evaluate_model(model_path, features_path)
+    with open(metrics_path, 'w') as metrics_file:
+        json.dump(metrics, metrics_file, indent=2)
+
+def default_stages(data_dir=DATA_DIR, models_dir=MODELS_DIR):
+    """
+    Return the preprocess -> features -> train -> evaluate pipeline, with paths from the repository root.
+    """
+    raw = os.path.join(data_dir, 'title_and_salary_listing.csv')
+    preprocessed = os.path.join(data_dir, 'preprocessed_job_listings.csv')
+    features = os.path.join(data_dir, 'job_listings_features.npz')
+    model = os.path.join(models_dir, model_registry.MODEL_FILE)
+    manifest = os.path.join(models_dir, model_registry.MANIFEST_FILE)
+    model_bundle = (model, os.path.join(models_dir, model_registry.VECTORIZER_FILE),
+                    os.path.join(models_dir, model_registry.LABEL_CLASSES_FILE), manifest)
+    return [
+        Stage('preprocess', preprocess_job_listings.preprocess_job_listings, (raw,), (preprocessed,), {},
+              (preprocess_job_listings, dataset_cache, columnar_store)),
+        Stage('redefine_job_levels', _redefine, (preprocessed,),
+              (os.path.join(data_dir, 'preprocessed_job_listings_updated.csv'),), {},
+              (redefine_job_levels, dataset_cache, job_level_categorizer, columnar_store)),
+        Stage('features', feature_extraction.extract_features, (preprocessed,), (features,), {},
+              (feature_extraction, sparse_features, columnar_store)),
+        Stage('train', _train, (features,), model_bundle, {},
+              (train_model, sparse_features, columnar_store, model_registry)),
+        Stage('evaluate', _evaluate, (model, manifest, features), (os.path.join(models_dir, 'metrics.json'),), {},
+              (evaluate_model, sparse_features, columnar_store, model_registry)),
+    ]
+
+def _dependencies(stages):
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"{output} is written by both {producers[output]} and {stage.name}")
+            producers[output] = stage.name
+    return {stage.name: {producers[path] for path in stage.inputs if path in producers} for stage in stages}
+
+def _topological_order(stages, dependencies):
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"The pipeline has a cycle through {name}")
+        visiting.add(name)
+        for dependency in sorted(dependencies[name]):
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for stage in stages:
+        visit(stage.name)
+    return order
+
+class ContentHasher:
+    """
+    Hash files and directories by content, rehashing a file only when its size or mtime changed.
+    """
+
+    def __init__(self, known=None):
+        # path -> [size, mtime_ns, digest], kept in the pipeline state between runs
+        self.known = known if known is not None else {}
+
+    def file(self, path):
+        stat = os.stat(path)
+        entry = self.known.get(path)
+        if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+            entry = [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+            self.known[path] = entry
+        return entry[2]
+
+    def path(self, path):
+        """
+        Return the digest of a file or directory, or None if it does not exist.
+        """
+        if os.path.isfile(path):
+            return self.file(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.sha256()
+        for directory, subdirectories, names in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(names):
+                file_path = os.path.join(directory, name)
+                digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+                digest.update(self.file(file_path).encode('ascii'))
+        return digest.hexdigest()
+
+def _code_digest(stage):
+    digest = hashlib.sha256(inspect.getsource(stage.func).encode('utf-8'))
+    for module in stage.code:
+        with open(inspect.getsourcefile(module), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+def stage_key(stage, hasher):
+    """
+    Return the hash of a stage's code, parameters and input contents; None while an input is missing.
+    """
+    inputs = [hasher.path(path) for path in stage.inputs]
+    if None in inputs:
+        return None
+    text = json.dumps([stage.name, _code_digest(stage), sorted(stage.params.items()), inputs], default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _load_state(path):
+    try:
+        with open(path) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {'stages': {}, 'files': {}}
+
+def _save_state(state, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as state_file:
+        json.dump(state, state_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _run_stage(func, inputs, outputs, params):
+    for output in outputs:
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+    func(*inputs, *outputs, **params)
+
+def run_pipeline(stages=None, state_path=DEFAULT_STATE_PATH, workers=None, force=()):
+    """
+    Run the stages that are out of date, independent ones in parallel.
+
+    A stage is up to date when the hash of its code, parameters and input
+    contents equals the one recorded after its last successful run and its
+    outputs still have the contents it wrote. Stages are run in separate
+    processes as soon as every stage they read from has finished, so a
+    change to one stage only re-runs it and the stages downstream of it.
+
+    Args:
+        stages (list): The stages; defaults to default_stages().
+        state_path (str): The JSON file that records the hashes of the last runs.
+        workers (int): The maximum number of stages running at once; defaults to the number of CPUs.
+        force (iterable): Names of stages to run even when they are up to date.
+
+    Returns:
+        dict: The status of every stage, 'ran' or 'up to date'.
+    """
+    stages = list(stages if stages is not None else default_stages())
+    by_name = {stage.name: stage for stage in stages}
+    dependencies = _dependencies(stages)
+    order = _topological_order(stages, dependencies)
+    state = _load_state(state_path)
+    hasher = ContentHasher(state['files'])
+    statuses = {}
+    keys = {}
+
+    def is_current(name):
+        stage = by_name[name]
+        record = state['stages'].get(name)
+        if name in force or record is None:
+            return False
+        keys[name] = stage_key(stage, hasher)
+        return record['key'] == keys[name] and \
+            record['outputs'] == [hasher.path(path) for path in stage.outputs]
+
+    def finish(name):
+        stage = by_name[name]
+        state['stages'][name] = {
+            'key': stage_key(stage, hasher),
+            'outputs': [hasher.path(path) for path in stage.outputs],
+        }
+        _save_state(state, state_path)
+        statuses[name] = 'ran'
+        print(f"{name}: ran")
+
+    pending = list(order)
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        while pending or running:
+            for name in list(pending):
+                if dependencies[name] - set(statuses):
+                    continue
+                pending.remove(name)
+                # Stages downstream of a stage that ran have new inputs, which the key picks up
+                if is_current(name):
+                    statuses[name] = 'up to date'
+                    print(f"{name}: up to date")
+                else:
+                    stage = by_name[name]
+                    running[executor.submit(_run_stage, stage.func, stage.inputs, stage.outputs, stage.params)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                future.result()
+                finish(name)
+    return statuses
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run the out-of-date stages of the job level pipeline.")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Maximum number of stages run at once")
+    arg_parser.add_argument('--force', nargs='*', default=[], help="Stages to run even if they are up to date")
+    arg_parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="Where the hashes of the last runs are kept")
+    args = arg_parser.parse_args()
+
+    run_pipeline(state_path=args.state, workers=args.workers, force=args.force)
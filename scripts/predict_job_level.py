@@ -1,50 +1,66 @@
+import itertools
+
 import pandas as pd
-import joblib
-from sklearn.preprocessing import LabelEncoder
+from scripts.feature_extraction import combine_text
+from scripts.model_registry import VECTORIZER_FILE, default_registry
 
-def preprocess_input_data(input_data):
-    # Convert input data to DataFrame
-    df = pd.DataFrame([input_data])
+DEFAULT_BATCH_SIZE = 10000
 
-    # Select relevant columns
-    df = df[['job_title', 'jurisdictional_classification', 'negotiating_unit', 'agency_description']]
+def preprocess_input_data(input_data, vectorizer=None):
+    # Convert input data to DataFrame
+    df = input_data if isinstance(input_data, pd.DataFrame) else pd.DataFrame([input_data])
 
     # Combine relevant text columns into a single column for feature extraction
-    df['combined_text'] = df['job_title'] + ' ' + df['jurisdictional_classification'] + ' ' + df['negotiating_unit'] + ' ' + df['agency_description']
-
-    # Initialize the TF-IDF vectorizer
-    vectorizer = joblib.load('models/tfidf_vectorizer.pkl')
-
-    # Transform the combined text data
-    X = vectorizer.transform(df['combined_text'])
-
-    # Convert the TF-IDF matrix to a DataFrame
-    feature_df = pd.DataFrame(X.toarray(), columns=vectorizer.get_feature_names_out())
-
-    # Convert all columns to numeric, coercing errors to NaN
-    feature_df = feature_df.apply(pd.to_numeric, errors='coerce')
-
-    # Drop rows with NaN values in any column
-    feature_df.dropna(inplace=True)
-
-    return feature_df
-
-def predict_job_level(input_data):
-    # Load the trained model
-    model = joblib.load('models/job_matching_model.pkl')
-
-    # Preprocess the input data
-    preprocessed_data = preprocess_input_data(input_data)
-
-    # Make predictions
-    job_level_pred = model.predict(preprocessed_data)
-
-    # Decode the predicted job level if it was encoded
-    le = LabelEncoder()
-    le.classes_ = joblib.load('models/label_encoder_classes.pkl')
-    job_level_pred = le.inverse_transform(job_level_pred)
-
-    return job_level_pred[0]
+    combined_text = combine_text(df)
+
+    # Use the TF-IDF vectorizer already loaded in the model registry
+    if vectorizer is None:
+        vectorizer = default_registry.artifact(VECTORIZER_FILE)
+
+    # Transform the combined text data; keep the TF-IDF matrix sparse, the model predicts from it directly
+    return vectorizer.transform(combined_text)
+
+def _batches(listings, batch_size):
+    if isinstance(listings, pd.DataFrame):
+        for start in range(0, len(listings), batch_size):
+            yield listings.iloc[start:start + batch_size]
+        return
+    listings = iter(listings)
+    while True:
+        batch = list(itertools.islice(listings, batch_size))
+        if not batch:
+            return
+        yield pd.DataFrame(batch)
+
+def predict_job_levels(listings, batch_size=DEFAULT_BATCH_SIZE, version=None, registry=default_registry):
+    """
+    Predict the job level of many listings, a batch at a time.
+
+    Every batch is vectorized with one sparse transform and classified with
+    one model.predict call, and its levels are yielded before the next batch
+    is read, so an unbounded iterable can be relabeled in constant memory.
+    The model is looked up in the registry once per batch, so a retrained
+    model is picked up between batches.
+
+    Args:
+        listings (iterable or pd.DataFrame): Dicts or rows with job_title, jurisdictional_classification,
+            negotiating_unit and agency_description.
+        batch_size (int): The number of listings vectorized and predicted together.
+        version (str): The model version to use; None for the default one.
+        registry (ModelRegistry): Where the model artifacts are loaded from.
+
+    Yields:
+        str: The predicted job level of every listing, in input order.
+    """
+    for batch in _batches(listings, batch_size):
+        bundle = registry.bundle(version)
+        X = preprocess_input_data(batch, bundle.vectorizer)
+        levels = bundle.model.predict(X)
+        yield from levels if bundle.label_encoder is None else bundle.label_encoder.inverse_transform(levels)
+
+def predict_job_level(input_data, version=None, registry=default_registry):
+    # Predict a single listing as a batch of one
+    return next(predict_job_levels([input_data], 1, version, registry))
 
 if __name__ == "__main__":
     # Sample input data
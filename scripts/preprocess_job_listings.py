@@ -1,8 +1,9 @@
-import pandas as pd
+from scripts.columnar_store import write_table
+from scripts.dataset_cache import RAW_LISTING_SCHEMA, read_cached_csv
 
 def preprocess_job_listings(input_csv, output_csv):
-    # Read the CSV file
-    df = pd.read_csv(input_csv)
+    # Read the CSV file through its typed cache, or the Parquet dataset
+    df = read_cached_csv(input_csv, RAW_LISTING_SCHEMA)
 
     # Drop rows with missing values
     df.dropna(inplace=True)
@@ -20,8 +21,8 @@ def preprocess_job_listings(input_csv, output_csv):
         'Agency Description': 'agency_description'
     }, inplace=True)
 
-    # Save the preprocessed data to a new CSV file
-    df.to_csv(output_csv, index=False)
+    # Save the preprocessed data as CSV or Parquet, depending on the output path
+    write_table(df, output_csv)
     print(f"Preprocessed data saved to {output_csv}")
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+import email.utils
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_RATE = 1.0  # requests per second
+DEFAULT_MIN_RATE = 0.05
+DEFAULT_MAX_RATE = 10.0
+THROTTLE_STATUS_CODES = (429, 503)
+
+def parse_retry_after(value, now=None):
+    """
+    Return the number of seconds a Retry-After header asks the client to wait.
+
+    Args:
+        value (str): The header value, either a number of seconds or an HTTP date.
+        now (float): The current time as a UNIX timestamp; defaults to time.time().
+
+    Returns:
+        float: The delay in seconds, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - (now if now is not None else time.time()))
+
+class _HostState:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.healthy_streak = 0
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with one bucket per host.
+
+    Each host starts at `rate` requests per second. A 429 or 503 response
+    (including ones urllib3 already retried) multiplies the host's rate by
+    `decrease_factor`, and a Retry-After header blocks the host for the
+    requested time. After `increase_after` healthy responses in a row the
+    rate grows by `increase_step`, up to `max_rate`.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE, burst=1,
+                 increase_step=0.1, increase_after=10, decrease_factor=0.5):
+        """
+        Args:
+            rate (float): The initial number of requests per second for each host.
+            min_rate (float): The rate is never lowered below this.
+            max_rate (float): The rate is never raised above this.
+            burst (int): The number of requests a host may receive back to back after being idle.
+            increase_step (float): How much the rate grows after a healthy streak, in requests per second.
+            increase_after (int): The number of consecutive healthy responses needed to raise the rate.
+            decrease_factor (float): The factor the rate is multiplied by when the host pushes back.
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self.decrease_factor = decrease_factor
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate, self.burst)
+        return state
+
+    def acquire(self, host, cancel_event=None):
+        """
+        Block until a request to `host` is allowed.
+
+        Args:
+            host (str): The host the request is sent to.
+            cancel_event (threading.Event): Optional event that abandons the wait when set.
+
+        Returns:
+            bool: True once the request may be sent, False if the wait was cancelled.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                state = self._state(host)
+                now = time.monotonic()
+                state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if now < state.blocked_until:
+                    delay = state.blocked_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    state.requests += 1
+                    state.total_wait += waited
+                    state.last_wait = waited
+                    return True
+                else:
+                    delay = (1 - state.tokens) / state.rate
+            if cancel_event is not None:
+                if cancel_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+            waited += delay
+
+    def record(self, host, response):
+        """
+        Adjust the rate for `host` from the response to a request that acquire() allowed.
+        """
+        retry_history = getattr(getattr(getattr(response, 'raw', None), 'retries', None), 'history', None) or ()
+        throttled = response.status_code in THROTTLE_STATUS_CODES or any(
+            attempt.status in THROTTLE_STATUS_CODES for attempt in retry_history
+        )
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+
+        with self._lock:
+            state = self._state(host)
+            if throttled:
+                state.throttled += 1
+                state.healthy_streak = 0
+                state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+                if retry_after:
+                    state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+            elif response.status_code < 400:
+                state.healthy_streak += 1
+                if state.healthy_streak >= self.increase_after:
+                    state.healthy_streak = 0
+                    state.rate = min(self.max_rate, state.rate + self.increase_step)
+            else:
+                state.healthy_streak = 0
+
+    def limit(self, fetch):
+        """
+        Wrap a requests.get-like function so every call is rate limited and recorded.
+        """
+        def limited_fetch(url, **kwargs):
+            host = urlparse(url).netloc
+            self.acquire(host)
+            response = fetch(url, **kwargs)
+            self.record(host, response)
+            return response
+        return limited_fetch
+
+    def metrics(self):
+        """
+        Return the current rate and wait statistics for every host seen so far.
+
+        Returns:
+            dict: Mapping of host to a dictionary with the current rate (requests/sec),
+            the number of requests and throttled responses, the total, average and
+            last wait in seconds, and how many seconds the host is still blocked for.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    'rate': state.rate,
+                    'requests': state.requests,
+                    'throttled': state.throttled,
+                    'total_wait': state.total_wait,
+                    'average_wait': state.total_wait / state.requests if state.requests else 0.0,
+                    'last_wait': state.last_wait,
+                    'blocked_for': max(0.0, state.blocked_until - now)
+                }
+                for host, state in self._hosts.items()
+            }
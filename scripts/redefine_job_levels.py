@@ -1,9 +1,10 @@
-import pandas as pd
-import re
+from scripts.columnar_store import write_table
+from scripts.dataset_cache import PREPROCESSED_SCHEMA, read_cached_csv
+from scripts.job_level_categorizer import categorize_job_titles
 
 def redefine_job_levels(input_csv):
-    # Read the CSV file
-    df = pd.read_csv(input_csv, low_memory=False)
+    # Read the CSV file through its typed cache, or the Parquet dataset
+    df = read_cached_csv(input_csv, PREPROCESSED_SCHEMA)
 
     # Define the mapping for job levels
     job_level_mapping = {
@@ -27,20 +28,8 @@ def redefine_job_levels(input_csv):
     # Apply the mapping to the 'job_level' column
     df['job_level'] = df['grade'].map(job_level_mapping)
 
-    # Dynamic categorization based on job title keywords
-    def categorize_job_title(title):
-        title = title.lower()
-        if re.search(r'\b(intern|junior|entry|assistant|trainee)\b', title):
-            return 'Entry-level'
-        elif re.search(r'\b(mid|senior|lead|manager|specialist)\b', title):
-            return 'Mid-level'
-        elif re.search(r'\b(director|vp|vice president|chief|head|principal)\b', title):
-            return 'Advanced-level'
-        else:
-            return 'Unknown'
-
-    # Apply dynamic categorization to job titles
-    df['dynamic_job_level'] = df['job_title'].apply(categorize_job_title)
+    # Dynamic categorization based on job title keywords, matched once per distinct title
+    df['dynamic_job_level'] = categorize_job_titles(df['job_title'])
 
     return df
 
@@ -48,5 +37,5 @@ if __name__ == "__main__":
     input_csv = './data/preprocessed_job_listings.csv'
     output_csv = './data/preprocessed_job_listings_updated.csv'
     df = redefine_job_levels(input_csv)
-    df.to_csv(output_csv, index=False)
+    write_table(df, output_csv)
     print(f"Updated job levels saved to {output_csv}")
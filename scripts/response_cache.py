@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '../data/http_cache.db')
+DEFAULT_TTL = 7 * 24 * 60 * 60  # one week, in seconds
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # bytes of cached bodies
+
+# Bodies are stored decoded, so these no longer describe them
+UNCACHED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache stored in SQLite.
+
+    Responses are keyed by URL and query parameters. Cached entries are
+    revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+    costs a 304 round trip instead of a full download. Entries older than
+    `ttl` are evicted, and the least recently used entries are evicted once
+    the cached bodies exceed `max_size` bytes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE, max_age=0):
+        """
+        Args:
+            path (str): The SQLite file the cache is stored in.
+            ttl (float): Seconds after which an entry that has not been refreshed is evicted.
+            max_size (int): The maximum total size of cached bodies, in bytes.
+            max_age (float): Seconds during which an entry is served without revalidation.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_size = 0
+        self.evict()
+
+    @staticmethod
+    def cache_key(url, params=None):
+        """
+        Return the cache key for a URL and its query parameters.
+        """
+        canonical_params = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}\n{canonical_params}".encode('utf-8')).hexdigest()
+
+    def get(self, url, params=None, headers=None, fetch=None, **kwargs):
+        """
+        Fetch a URL, answering from the cache when the server confirms the cached copy is current.
+
+        Args:
+            url (str): The URL to fetch.
+            params (dict): Optional query string parameters.
+            headers (dict): Optional request headers.
+            fetch (callable): The function performing the request, called like requests.get.
+            **kwargs: Passed through to fetch.
+
+        Returns:
+            requests.Response: The live response, or a response rebuilt from the cache.
+            Responses served from the cache have `from_cache` set to True.
+        """
+        fetch = fetch or requests.get
+        key = self.cache_key(url, params)
+        entry = self._lookup(key)
+        now = time.time()
+
+        if entry is not None and now - entry['stored_at'] < self.max_age:
+            self._touch(key, now, refreshed=False)
+            return self._to_response(entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = fetch(url, params=params, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, now, refreshed=True)
+            return self._to_response(entry)
+
+        response.from_cache = False
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self._store(key, url, response, now)
+        return response
+
+    def evict(self):
+        """
+        Remove expired entries, then the least recently used ones until the cache fits in max_size.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+            self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if self._total_size > self.max_size:
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC")
+                doomed = []
+                for key, size in rows:
+                    if self._total_size <= self.max_size:
+                        break
+                    doomed.append((key,))
+                    self._total_size -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self._conn.commit()
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_size = 0
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, etag, last_modified, stored_at = row
+        return {
+            'url': url,
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': stored_at
+        }
+
+    def _touch(self, key, now, refreshed):
+        with self._lock:
+            if refreshed:
+                self._conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+    def _store(self, key, url, response, now):
+        body = response.content
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in UNCACHED_HEADERS}
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, url, response.status_code, json.dumps(headers), body,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body)
+                )
+            )
+            self._conn.commit()
+            self._total_size += len(body) - (previous[0] if previous else 0)
+            over_budget = self._total_size > self.max_size
+        if over_budget:
+            self.evict()
+
+    @staticmethod
+    def _to_response(entry):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry['body']
+        response.from_cache = True
+        return response
@@ -1,48 +1,175 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import requests
+import collections
+import itertools
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from urllib.parse import urlparse
+from scripts import http_client
+from scripts.crawl_pipeline import run_pipeline
+from scripts.fingerprint_store import FingerprintStore, UnchangedPage
+from scripts.listing_sinks import CsvSink, write_listings
+from scripts.rate_limiter import AdaptiveRateLimiter
+from scripts.response_cache import ResponseCache
+
+def parse_job_page(html_content):
+    """
+    Parse one page of the job board.
 
-def scrape_job_listings(url):
+    Returns:
+        tuple: The number of job listing elements found on the page, and the
+        list of job listings that could be parsed from them.
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    jobs = soup.find_all('div', class_='job-listing')
     job_listings = []
-    page = 1
 
-    while True:
-        response = requests.get(url, params={'page': page})
+    for job in jobs:
+        try:
+            job_title = job.find('h2', class_='job-title').text.strip()
+            company = job.find('div', class_='company').text.strip()
+            location = job.find('div', class_='location').text.strip()
+            description = job.find('div', class_='description').text.strip()
+
+            job_listings.append({
+                'job_title': job_title,
+                'company': company,
+                'location': location,
+                'description': description
+            })
+        except AttributeError as e:
+            print(f"Error parsing job listing: {e}")
+            continue
+
+    return len(jobs), job_listings
+
+DEFAULT_RATE = 1.0  # requests per second to the board
+
+def _page_key(url, page):
+    return requests.Request('GET', url, params={'page': page}).prepare().url
+
+def _make_fetcher(url, cache, rate_limiter, stopped=None, fingerprints=None):
+    host = urlparse(url).netloc
+
+    def fetch(page):
+        # Be polite and avoid overwhelming the server
+        if not rate_limiter.acquire(host, cancel_event=stopped):
+            return None
+        response = http_client.get(url, params={'page': page}, cache=cache)
+        rate_limiter.record(host, response)
         if response.status_code != 200:
             print(f"Failed to retrieve page {page}. Status code: {response.status_code}")
-            break
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        jobs = soup.find_all('div', class_='job-listing')
-
-        if not jobs:
-            print(f"No more job listings found on page {page}.")
-            break
-
-        for job in jobs:
-            try:
-                job_title = job.find('h2', class_='job-title').text.strip()
-                company = job.find('div', class_='company').text.strip()
-                location = job.find('div', class_='location').text.strip()
-                description = job.find('div', class_='description').text.strip()
-
-                job_listings.append({
-                    'job_title': job_title,
-                    'company': company,
-                    'location': location,
-                    'description': description
-                })
-            except AttributeError as e:
-                print(f"Error parsing job listing: {e}")
-                continue
-
-        print(f"Scraped {len(jobs)} job listings from page {page}.")
-        page += 1
-        time.sleep(1)  # Be polite and avoid overwhelming the server
-
-    return job_listings
+            return None
+        if fingerprints is not None:
+            return fingerprints.filter_page(_page_key(url, page), response.content)
+        return response.content
+    return fetch
+
+def _parse_fetched(html_content):
+    if html_content is None:
+        return None
+    if isinstance(html_content, UnchangedPage):
+        return html_content.listing_count, None
+    return parse_job_page(html_content)
+
+def _prefetch_pages(url, cache, rate_limiter, prefetch, fingerprints=None):
+    """
+    Yield (page, parsed page) in page order while up to `prefetch` later pages are fetched in the background.
+    """
+    stopped = threading.Event()
+    fetch = _make_fetcher(url, cache, rate_limiter, stopped, fingerprints)
+    window = collections.deque()
+    pages = itertools.count(1)
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        while True:
+            while len(window) <= prefetch:
+                page = next(pages)
+                window.append((page, executor.submit(fetch, page)))
+            page, future = window.popleft()
+            yield page, _parse_fetched(future.result())
+    finally:
+        # Past the last page: drop queued fetches and skip the ones still waiting on the rate limiter
+        stopped.set()
+        for _, future in window:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def iter_scrape_job_listings(url, cache=None, parse_workers=None, prefetch=0, rate_limiter=None, fingerprints=None):
+    """
+    Scrape every page of a job board, yielding listings one at a time as each page is parsed.
+
+    Takes the same arguments as scrape_job_listings.
+
+    Yields:
+        dict: The details of one job listing.
+    """
+    if rate_limiter is None:
+        rate_limiter = AdaptiveRateLimiter(rate=DEFAULT_RATE)
+
+    # Set once the last page is reached, so fetches still waiting on the rate limiter give up
+    stopped = threading.Event()
+    if parse_workers:
+        # Fetch the next pages in the background while earlier ones are parsed in other processes;
+        # with a one-page queue at most prefetch + 1 pages are in flight, as with _prefetch_pages
+        pages = run_pipeline(
+            itertools.count(1), _parse_fetched,
+            fetch=_make_fetcher(url, cache, rate_limiter, stopped, fingerprints),
+            fetch_workers=max(1, prefetch), parse_workers=parse_workers, queue_size=1
+        )
+    elif prefetch:
+        pages = _prefetch_pages(url, cache, rate_limiter, prefetch, fingerprints)
+    else:
+        fetch = _make_fetcher(url, cache, rate_limiter, fingerprints=fingerprints)
+        pages = ((page, _parse_fetched(fetch(page))) for page in itertools.count(1))
+
+    with closing(pages):
+        try:
+            for page, result in pages:
+                if result is None:
+                    break
+
+                jobs_found, page_listings = result
+                if page_listings is None:
+                    print(f"Page {page} is unchanged since the last run, skipped parsing.")
+                else:
+                    if jobs_found:
+                        print(f"Scraped {jobs_found} job listings from page {page}.")
+                    if fingerprints is not None:
+                        page_listings = fingerprints.new_listings(page_listings)
+                    yield from page_listings
+                    if fingerprints is not None:
+                        fingerprints.record_page(_page_key(url, page), jobs_found)
+
+                if not jobs_found:
+                    print(f"No more job listings found on page {page}.")
+                    break
+        finally:
+            stopped.set()
+
+    print(f"Rate limiter metrics: {rate_limiter.metrics()}")
+
+def scrape_job_listings(url, cache=None, parse_workers=None, prefetch=0, rate_limiter=None, fingerprints=None):
+    """
+    Scrape every page of a job board until a page comes back without listings.
+
+    Args:
+        url (str): The URL of the job board; pages are requested with a `page` query parameter.
+        cache (ResponseCache): Optional response cache used to skip downloading unchanged pages.
+        parse_workers (int): If set, parse pages in this many processes while the next pages are fetched.
+        prefetch (int): The number of pages fetched ahead of the page being parsed.
+        rate_limiter (AdaptiveRateLimiter): The per-host rate limiter requests wait on; defaults to
+            one starting at DEFAULT_RATE requests per second.
+        fingerprints (FingerprintStore): Optional store used to skip parsing pages that have not changed
+            and to drop listings already returned by an earlier run.
+
+    Returns:
+        list: A list of dictionaries containing job details.
+    """
+    return list(iter_scrape_job_listings(url, cache, parse_workers, prefetch, rate_limiter, fingerprints))
 
 def save_job_listings(job_listings, output_file):
     df = pd.DataFrame(job_listings)
@@ -52,6 +179,8 @@ if __name__ == "__main__":
     job_board_url = 'https://example.com/jobs'
     output_file = os.path.join(os.path.dirname(__file__), '../data/job_listings.csv')
 
-    job_listings = scrape_job_listings(job_board_url)
-    save_job_listings(job_listings, output_file)
-    print(f"Scraped {len(job_listings)} job listings and saved to {output_file}")
+    # Stream new listings to the CSV file as pages are parsed instead of collecting them all first
+    with ResponseCache() as cache, FingerprintStore() as fingerprints, CsvSink(output_file) as sink:
+        listings = iter_scrape_job_listings(job_board_url, cache=cache, prefetch=4, fingerprints=fingerprints)
+        count = write_listings(listings, sink, checkpoints=[fingerprints])
+    print(f"Scraped {count} new job listings and saved to {output_file}")
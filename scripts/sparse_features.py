@@ -0,0 +1,167 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import normalize
+
+# The running document frequencies of a directory of hashed feature parts
+STATS_FILE = 'document_frequencies.npz'
+
+def is_npz(path):
+    return str(path).lower().endswith('.npz')
+
+def is_features(path):
+    """
+    Return True for a .npz feature file or a directory of hashed feature parts.
+    """
+    return is_npz(path) or os.path.isfile(os.path.join(str(path), STATS_FILE))
+
+def hashing_vectorizer(n_features):
+    """
+    Return the stateless vectorizer that maps text to raw term counts in `n_features` hashed columns.
+    """
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+
+def smooth_idf(n_documents, document_frequencies):
+    """
+    Return the inverse document frequencies TfidfVectorizer computes with its default smooth_idf=True.
+    """
+    return np.log((1 + n_documents) / (1 + np.asarray(document_frequencies, dtype=np.float64))) + 1
+
+class SparseFeatures(namedtuple('SparseFeatures', ['X', 'feature_names', 'idf', 'columns'])):
+    """
+    A CSR feature matrix with its vocabulary and the per-row columns stored next to it.
+
+    Attributes:
+        X (scipy.sparse.csr_matrix): One row per listing, one column per term.
+        feature_names (np.ndarray): The term of every column, or None for hashed columns.
+        idf (np.ndarray): The inverse document frequency of every term, or None.
+        columns (dict): Per-row arrays such as job_level and grade; missing values are None.
+    """
+    __slots__ = ()
+
+    def vectorizer(self):
+        """
+        Rebuild a vectorizer that transforms new text into the columns of X.
+
+        For hashed columns this is a HashingVectorizer followed by a TfidfTransformer with the stored IDF.
+        """
+        if self.feature_names is None:
+            transformer = TfidfTransformer()
+            transformer.idf_ = self.idf
+            return make_pipeline(hashing_vectorizer(self.X.shape[1]), transformer)
+        vectorizer = TfidfVectorizer(vocabulary={term: i for i, term in enumerate(self.feature_names)})
+        if self.idf is not None:
+            vectorizer.idf_ = self.idf
+        return vectorizer
+
+    def labeled(self, column):
+        """
+        Return the rows of X and the values of `column` for the rows where it is not missing.
+        """
+        values = self.columns[column]
+        keep = np.array([value is not None for value in values], dtype=bool)
+        return self.X[keep], values[keep]
+
+def save_features(path, X, feature_names, idf=None, **columns):
+    """
+    Save a sparse feature matrix, its vocabulary and per-row columns to a single .npz file.
+
+    The matrix is stored in the layout of scipy.sparse.save_npz, so
+    scipy.sparse.load_npz can read the file as well. Text columns are
+    stored as fixed-width strings with a mask of missing values, so the
+    file can be loaded without pickle.
+
+    Args:
+        path (str): The .npz file to write.
+        X (scipy.sparse matrix): The features, one row per listing.
+        feature_names (iterable): The term of every column of X, or None for hashed columns.
+        idf (np.ndarray): The inverse document frequencies of the terms, if X is TF-IDF weighted.
+        **columns: Per-row values such as job_level and grade, each with one value per row of X.
+    """
+    X = sp.csr_matrix(X)
+    arrays = {
+        'format': np.array('csr'),
+        'shape': np.array(X.shape),
+        'data': X.data,
+        'indices': X.indices,
+        'indptr': X.indptr,
+    }
+    if feature_names is not None:
+        arrays['feature_names'] = np.asarray(feature_names, dtype=str)
+    if idf is not None:
+        arrays['idf'] = np.asarray(idf, dtype=np.float64)
+    for name, values in columns.items():
+        values = pd.Series(np.asarray(values, dtype=object))
+        missing = values.isna().to_numpy()
+        arrays[f'column.{name}'] = np.asarray(values.where(~missing, '').astype(str), dtype=str)
+        arrays[f'missing.{name}'] = missing
+    with open(path, 'wb') as npz_file:
+        np.savez_compressed(npz_file, **arrays)
+
+def save_document_frequencies(directory, n_documents, document_frequencies):
+    """
+    Replace the document frequency statistics of a directory of hashed feature parts.
+    """
+    tmp_path = os.path.join(directory, f"{STATS_FILE}.tmp")
+    with open(tmp_path, 'wb') as npz_file:
+        np.savez_compressed(npz_file, n_documents=np.array(n_documents),
+                            document_frequencies=np.asarray(document_frequencies, dtype=np.int64))
+    os.replace(tmp_path, os.path.join(directory, STATS_FILE))
+
+def load_document_frequencies(directory):
+    """
+    Return the number of documents and the per-column document frequencies of a directory of parts.
+    """
+    with np.load(os.path.join(directory, STATS_FILE), allow_pickle=False) as npz:
+        return int(npz['n_documents']), npz['document_frequencies']
+
+def part_files(directory):
+    """
+    Return the feature part files of a directory in the order they were written.
+    """
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith('part-') and is_npz(name))
+
+def load_features(path):
+    """
+    Load a file written by save_features, or a directory of hashed feature parts.
+
+    The parts of a directory hold raw term counts; they are stacked and
+    TF-IDF weighted with the IDF of the directory's document frequencies,
+    then every row is L2 normalized, as TfidfVectorizer would.
+
+    Returns:
+        SparseFeatures: The CSR matrix, its vocabulary, the IDF weights and the per-row columns.
+    """
+    if os.path.isdir(path):
+        parts = [_load_file(part_path) for part_path in part_files(path)]
+        n_documents, document_frequencies = load_document_frequencies(path)
+        idf = smooth_idf(n_documents, document_frequencies)
+        if parts:
+            counts = sp.vstack([part.X for part in parts], format='csr')
+        else:
+            counts = sp.csr_matrix((0, len(idf)))
+        X = normalize(counts @ sp.diags(idf), norm='l2', copy=False).tocsr()
+        names = parts[0].columns if parts else {}
+        columns = {name: np.concatenate([part.columns[name] for part in parts]) for name in names}
+        return SparseFeatures(X, None, idf, columns)
+    return _load_file(path)
+
+def _load_file(path):
+    with np.load(path, allow_pickle=False) as npz:
+        X = sp.csr_matrix((npz['data'], npz['indices'], npz['indptr']), shape=tuple(npz['shape']))
+        columns = {}
+        for key in npz.files:
+            if key.startswith('column.'):
+                name = key[len('column.'):]
+                values = npz[key].astype(object)
+                values[npz[f'missing.{name}']] = None
+                columns[name] = values
+        feature_names = npz['feature_names'] if 'feature_names' in npz.files else None
+        idf = npz['idf'] if 'idf' in npz.files else None
+        return SparseFeatures(X, feature_names, idf, columns)
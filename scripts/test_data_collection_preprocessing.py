@@ -1,11 +1,45 @@
+import json
 import unittest
 import pandas as pd
+import requests
 from unittest.mock import patch, Mock
-from scripts.data_collection_preprocessing import fetch_job_listings, preprocess_job_data
+from scripts.data_collection_preprocessing import fetch_job_listings, iter_job_frames, preprocess_job_data
+
+JOBS = [{'title': f'Job {i}', 'description': f'Description {i}', 'qualifications': 'BSc'} for i in range(5)]
+
+def make_response(body, links=None):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    if links:
+        response.headers['Link'] = links
+    return response
+
+def cursor_api(url, params=None, headers=None):
+    start = int(params.get('cursor', 0))
+    end = start + params['limit']
+    return make_response({'jobs': JOBS[start:end], 'next_cursor': str(end) if end < len(JOBS) else None})
+
+def offset_api(url, params=None, headers=None):
+    start = params.get('offset', 0)
+    return make_response(JOBS[start:start + params['limit']])
+
+def capped_offset_api(url, params=None, headers=None):
+    # Serves at most two records per page whatever limit is asked for, and reports the total
+    start = params.get('offset', 0)
+    return make_response({'jobs': JOBS[start:start + min(params['limit'], 2)], 'total': len(JOBS)})
+
+def repeating_cursor_api(url, params=None, headers=None):
+    return make_response({'jobs': JOBS[:2], 'next_cursor': 'same'})
+
+def link_api(url, params=None, headers=None):
+    page = int(url.rsplit('=', 1)[1])
+    links = f'<https://api.example.com/job_listings?page={page + 1}>; rel="next"' if page < 2 else None
+    return make_response({'results': JOBS[page * 2:page * 2 + 2]}, links)
 
 class TestDataCollectionPreprocessing(unittest.TestCase):
 
-    @patch('scripts.data_collection_preprocessing.requests.get')
+    @patch('scripts.data_collection_preprocessing.http_client.get')
     def test_fetch_job_listings_success(self, mock_get):
         mock_response = Mock()
         expected_data = {'jobs': [{'title': 'Software Engineer', 'description': 'Develop software', 'requirements': 'Python', 'qualifications': 'BSc in Computer Science'}]}
@@ -18,7 +52,7 @@ class TestDataCollectionPreprocessing(unittest.TestCase):
         result = fetch_job_listings(api_url, headers)
         self.assertEqual(result, expected_data)
 
-    @patch('scripts.data_collection_preprocessing.requests.get')
+    @patch('scripts.data_collection_preprocessing.http_client.get')
     def test_fetch_job_listings_failure(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -41,5 +75,49 @@ class TestDataCollectionPreprocessing(unittest.TestCase):
         result_df = preprocess_job_data(job_data)
         pd.testing.assert_frame_equal(result_df, expected_df)
 
+    def assert_streams_all_jobs(self, api, api_url, **kwargs):
+        with patch('scripts.data_collection_preprocessing.http_client.get', side_effect=api) as mock_get:
+            chunks = list(iter_job_frames(api_url, **kwargs))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        for chunk in chunks:
+            self.assertEqual(list(chunk.columns), ['title', 'description', 'requirements', 'qualifications'])
+        result_df = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(list(result_df['title']), [job['title'] for job in JOBS])
+        self.assertEqual(set(result_df['requirements']), {''})
+        return mock_get
+
+    def test_iter_job_frames_cursor_pagination(self):
+        self.assert_streams_all_jobs(cursor_api, "https://api.example.com/job_listings", page_size=2)
+
+    def test_iter_job_frames_offset_pagination(self):
+        mock_get = self.assert_streams_all_jobs(
+            offset_api, "https://api.example.com/job_listings", pagination='offset', page_size=2
+        )
+        # Without a total, only the empty page after the last one ends the export
+        self.assertEqual(mock_get.call_count, 4)
+
+    def test_iter_job_frames_offset_pagination_reads_capped_pages_to_the_total(self):
+        mock_get = self.assert_streams_all_jobs(
+            capped_offset_api, "https://api.example.com/job_listings", pagination='offset', page_size=3
+        )
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_iter_job_frames_stops_on_a_repeated_cursor(self):
+        with patch('scripts.data_collection_preprocessing.http_client.get', side_effect=repeating_cursor_api) as mock_get:
+            chunks = list(iter_job_frames("https://api.example.com/job_listings", page_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2])
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_iter_job_frames_link_pagination(self):
+        self.assert_streams_all_jobs(link_api, "https://api.example.com/job_listings?page=0", pagination='link')
+
+    @patch('scripts.data_collection_preprocessing.http_client.get')
+    def test_iter_job_frames_stops_on_error(self, mock_get):
+        mock_get.return_value = Mock(status_code=500)
+
+        self.assertEqual(list(iter_job_frames("https://api.example.com/job_listings")), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,14 +1,17 @@
+import os
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 from sklearn.preprocessing import LabelEncoder
 from sklearn.feature_extraction.text import TfidfVectorizer
-import joblib
+from scripts.columnar_store import read_table
+from scripts.model_registry import save_bundle
+from scripts.sparse_features import is_features, load_features
 
-def train_model(input_csv, model_output):
-    # Read the feature CSV file
-    df = pd.read_csv(input_csv, low_memory=False)
+def _tfidf_from_table(input_csv):
+    # Read the feature CSV file or Parquet dataset
+    df = read_table(input_csv, low_memory=False)
 
     # Separate features and target variable
     X = df.drop(columns=['job_level'])
@@ -25,24 +28,28 @@ def train_model(input_csv, model_output):
     y.dropna(inplace=True)
     y.reset_index(drop=True, inplace=True)
 
-    # Encode the target variable if it contains categorical data
-    if y.dtype == 'object':
-        le = LabelEncoder()
-        y = le.fit_transform(y)
-        # Save the label encoder classes
-        joblib.dump(le.classes_, '../models/label_encoder_classes.pkl')
-
     # Initialize the TF-IDF vectorizer
     vectorizer = TfidfVectorizer(max_features=1000)
     X_combined_text = df.apply(lambda row: ' '.join(row.values.astype(str)), axis=1)
-    X_tfidf = vectorizer.fit_transform(X_combined_text)
-    X_tfidf_df = pd.DataFrame(X_tfidf.toarray(), columns=vectorizer.get_feature_names_out())
-    X = X_tfidf_df.apply(pd.to_numeric, errors='coerce')
-    X.dropna(inplace=True)
-    X.reset_index(drop=True, inplace=True)
+    # Keep the TF-IDF matrix sparse; the classifier accepts it as is
+    X = vectorizer.fit_transform(X_combined_text)
+    return X, y, vectorizer
+
+def train_model(input_csv, model_output):
+    if is_features(input_csv):
+        # Train on the sparse TF-IDF matrix written by feature_extraction, labeled rows only
+        features = load_features(input_csv)
+        X, y = features.labeled('job_level')
+        vectorizer = features.vectorizer()
+    else:
+        X, y, vectorizer = _tfidf_from_table(input_csv)
 
-    # Save the TF-IDF vectorizer
-    joblib.dump(vectorizer, '../models/tfidf_vectorizer.pkl')
+    # Encode the target variable if it contains categorical data
+    classes = None
+    if y.dtype == 'object':
+        le = LabelEncoder()
+        y = le.fit_transform(y)
+        classes = le.classes_
 
     # Split the data into training and test sets
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -60,11 +67,11 @@ def train_model(input_csv, model_output):
     accuracy = accuracy_score(y_test, y_pred)
     print(f"Model accuracy: {accuracy}")
 
-    # Save the trained model to a file
-    joblib.dump(model, model_output)
+    # Save the trained model with the TF-IDF vectorizer and label encoder classes next to it, as one unit
+    save_bundle(os.path.dirname(model_output), model, vectorizer, classes, os.path.basename(model_output))
     print(f"Trained model saved to {model_output}")
 
 if __name__ == "__main__":
-    input_csv = '../data/preprocessed_job_listings.csv'
+    input_csv = '../data/job_listings_features.npz'
     model_output = '../models/job_matching_model.pkl'
     train_model(input_csv, model_output)
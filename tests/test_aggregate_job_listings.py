@@ -0,0 +1,94 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from scripts.aggregate_job_listings import aggregate_job_listings
+
+PAGE_TEMPLATE = """
+<html>
+<body>
+    <div class="job-listing">
+        <h2 class="job-title">{title}</h2>
+        <div class="job-description">{description}</div>
+    </div>
+</body>
+</html>
+"""
+
+
+def make_source(content, is_url):
+    return {
+        'content': content,
+        'title_selector': 'h2.job-title',
+        'description_selector': 'div.job-description',
+        'is_url': is_url
+    }
+
+
+class ConcurrencyTracker:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.active_by_host = {}
+        self.peak_by_host = {}
+
+    def fetch(self, url):
+        host = url.split('/')[2]
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            count = self.active_by_host.get(host, 0) + 1
+            self.active_by_host[host] = count
+            self.peak_by_host[host] = max(
+                self.peak_by_host.get(host, 0), count
+            )
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.active_by_host[host] -= 1
+        return PAGE_TEMPLATE.format(title=url, description=host)
+
+
+def test_concurrent_mode_matches_sequential_mode():
+    sources = [
+        make_source(f"https://board{i % 3}.example.com/jobs/{i}", True)
+        for i in range(9)
+    ]
+    sources.append(make_source(
+        PAGE_TEMPLATE.format(title="Inline", description="Inline job"),
+        False
+    ))
+    tracker = ConcurrencyTracker(delay=0)
+
+    with patch(
+        'scripts.job_scraping.fetch_page_content', side_effect=tracker.fetch
+    ):
+        sequential_df = aggregate_job_listings(sources)
+        concurrent_df = aggregate_job_listings(sources, concurrent=True)
+
+    assert len(concurrent_df) == len(sources)
+    pd.testing.assert_frame_equal(concurrent_df, sequential_df)
+
+
+def test_concurrent_mode_respects_limits():
+    sources = [
+        make_source(f"https://board{i % 2}.example.com/jobs/{i}", True)
+        for i in range(12)
+    ]
+    tracker = ConcurrencyTracker()
+
+    with patch(
+        'scripts.job_scraping.fetch_page_content', side_effect=tracker.fetch
+    ):
+        df = aggregate_job_listings(
+            sources, concurrent=True, max_concurrency=3, per_host_limit=2
+        )
+
+    assert len(df) == len(sources)
+    assert tracker.peak <= 3
+    assert max(tracker.peak_by_host.values()) <= 2
+    assert tracker.peak > 1
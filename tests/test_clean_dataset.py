@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from scripts.clean_dataset import clean_data
+from scripts.columnar_store import read_table
+
+
+def make_features(path, rows=1000):
+    generator = np.random.RandomState(0)
+    df = pd.DataFrame({
+        'engineer': generator.rand(rows),
+        'analyst': generator.rand(rows),
+        'grade': generator.randint(1, 20, rows).astype(float),
+        'job_level': generator.choice(['Entry-level', 'Mid-level'], rows),
+    })
+    # Some rows are missing a numeric value and must be dropped
+    df.loc[::7, 'grade'] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_streaming_clean_drops_incomplete_rows(tmp_path):
+    source = make_features(tmp_path / 'features.csv')
+    output = str(tmp_path / 'cleaned.csv')
+
+    assert clean_data(str(tmp_path / 'features.csv'), output,
+                      chunksize=100) == output
+
+    cleaned = pd.read_csv(output)
+    assert len(cleaned) == source['grade'].notna().sum()
+    assert list(cleaned.columns) == list(source.columns)
+
+
+def test_parallel_clean_keeps_input_order(tmp_path):
+    make_features(tmp_path / 'features.csv')
+    sequential = str(tmp_path / 'sequential.csv')
+    parallel = str(tmp_path / 'parallel.csv')
+
+    clean_data(str(tmp_path / 'features.csv'), sequential, chunksize=50)
+    clean_data(str(tmp_path / 'features.csv'), parallel, chunksize=50,
+               workers=2, max_pending=3)
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(parallel), pd.read_csv(sequential)
+    )
+
+
+def test_clean_to_parquet_parts(tmp_path):
+    make_features(tmp_path / 'features.csv')
+    output = str(tmp_path / 'cleaned')
+
+    clean_data(str(tmp_path / 'features.csv'), output, chunksize=300)
+    clean_data(str(tmp_path / 'features.csv'), output, chunksize=500)
+    clean_data(str(tmp_path / 'features.csv'), str(tmp_path / 'cleaned.csv'))
+
+    # The second run replaces the four part files of the first with two
+    assert len(list((tmp_path / 'cleaned').iterdir())) == 2
+    pd.testing.assert_frame_equal(
+        read_table(output), pd.read_csv(str(tmp_path / 'cleaned.csv')),
+        check_dtype=False
+    )
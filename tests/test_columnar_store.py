@@ -0,0 +1,66 @@
+import os
+from datetime import date
+
+import pandas as pd
+
+from scripts.columnar_store import append_listings, read_table, write_table
+from scripts.preprocess_job_listings import preprocess_job_listings
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
+
+
+def test_append_adds_files_to_date_and_source_partitions(tmp_path):
+    root = str(tmp_path / 'listings')
+    append_listings([{'job_title': 'A'}, {'job_title': 'B'}], root, 'google',
+                    date(2024, 1, 1))
+    append_listings([{'job_title': 'C'}], root, 'google', date(2024, 1, 1))
+    append_listings([{'job_title': 'D'}], root, 'monster', date(2024, 1, 2))
+
+    partition = tmp_path / 'listings' / 'date=2024-01-01' / 'source=google'
+    assert len(os.listdir(partition)) == 2
+    assert sorted(read_table(root)['job_title']) == ['A', 'B', 'C', 'D']
+
+
+def test_parquet_projection_and_filters(tmp_path):
+    root = str(tmp_path / 'listings')
+    append_listings([{'job_title': 'A', 'location': 'Remote'}], root, 'google',
+                    date(2024, 1, 1))
+    append_listings([{'job_title': 'B', 'location': 'Boston'}], root, 'google',
+                    date(2024, 1, 2))
+    append_listings([{'job_title': 'C', 'location': 'Austin'}], root,
+                    'monster', date(2024, 1, 2))
+
+    df = read_table(root, columns=['job_title'], filters=[
+        ('date', '>=', '2024-01-02'), ('source', 'in', ['google'])
+    ])
+
+    assert list(df.columns) == ['job_title']
+    assert list(df['job_title']) == ['B']
+
+
+def test_csv_projection_and_filters(tmp_path):
+    path = str(tmp_path / 'jobs.csv')
+    write_table(pd.DataFrame({
+        'job_title': ['A', 'B', 'C'], 'grade': [3, 12, 7], 'unused': [1, 2, 3]
+    }), path)
+
+    df = read_table(path, columns=['job_title', 'grade'],
+                    filters=[('grade', '>', 5)])
+
+    assert df.to_dict('records') == [
+        {'job_title': 'B', 'grade': 12}, {'job_title': 'C', 'grade': 7}
+    ]
+
+
+def test_preprocess_writes_the_same_data_to_parquet(tmp_path):
+    input_csv = os.path.join(DATA_DIR, 'title_and_salary_listing.csv')
+    csv_output = str(tmp_path / 'preprocessed.csv')
+    parquet_output = str(tmp_path / 'preprocessed.parquet')
+
+    preprocess_job_listings(input_csv, csv_output)
+    preprocess_job_listings(input_csv, parquet_output)
+
+    from_csv = read_table(csv_output)
+    from_parquet = read_table(parquet_output)
+    assert len(from_parquet) == len(from_csv) > 0
+    assert list(from_parquet['job_title']) == list(from_csv['job_title'])
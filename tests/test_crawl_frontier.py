@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from scripts.collect_job_listings import collect_job_listings
+from scripts.crawl_frontier import CrawlFrontier
+
+URL = 'https://example.com/jobs?q=engineer'
+
+
+def test_claims_urls_in_order_and_tracks_state(tmp_path):
+    with CrawlFrontier(str(tmp_path / 'frontier.db')) as frontier:
+        frontier.enqueue(['a', 'b', 'c'])
+        frontier.enqueue(['b', 'd'])
+
+        assert frontier.claim() == 'a'
+        frontier.complete('a', [{'title': 'A'}])
+        assert frontier.claim() == 'b'
+
+        assert frontier.counts() == {
+            'queued': 2, 'in_flight': 1, 'done': 1, 'failed': 0
+        }
+        assert list(frontier.pending()) == ['c', 'd']
+
+
+def test_reopening_requeues_in_flight_urls(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    frontier = CrawlFrontier(path, checkpoint_every=2)
+    frontier.enqueue(['a', 'b', 'c'])
+    frontier.claim()
+    frontier.complete('a', [{'title': 'A'}])
+    frontier.claim()
+    # Simulate a crash: the connection goes away without a final commit
+    frontier._conn.close()
+
+    with CrawlFrontier(path) as resumed:
+        assert list(resumed.pending()) == ['a', 'b', 'c']
+
+
+def test_crawls_are_isolated(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    with CrawlFrontier(path, crawl_id='one') as one, \
+            CrawlFrontier(path, crawl_id='two') as two:
+        one.enqueue(['a'])
+        one.complete(one.claim(), [{'title': 'A'}])
+
+        assert list(two.pending(['a'])) == ['a']
+        assert list(two.listings()) == []
+        assert list(one.listings()) == [{'title': 'A'}]
+
+
+def make_page(url):
+    page = url.rsplit('=', 1)[1]
+    response = requests.Response()
+    response.status_code = 200
+    response._content = (
+        f'<article><h3>Job {page}</h3><p>Page {page}</p></article>'
+    ).encode()
+    return response
+
+
+def test_interrupted_crawl_resumes_where_it_stopped(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    fetched = []
+
+    def crashing_get(url, **kwargs):
+        fetched.append(url)
+        if url.endswith('page=3'):
+            raise requests.ConnectionError('connection reset')
+        return make_page(url)
+
+    with patch('scripts.http_client.get', side_effect=crashing_get):
+        with CrawlFrontier(path) as frontier, \
+                pytest.raises(requests.ConnectionError):
+            collect_job_listings(URL, 'h3', 'p', frontier=frontier)
+
+    fetched.clear()
+    with patch('scripts.http_client.get', side_effect=lambda url, **kw:
+               fetched.append(url) or make_page(url)):
+        with CrawlFrontier(path) as frontier:
+            listings = collect_job_listings(URL, 'h3', 'p', frontier=frontier)
+
+    assert fetched == [f'{URL}&page={page}' for page in (3, 4, 5)]
+    assert [listing['title'] for listing in listings] == [
+        f'Job {page}' for page in range(1, 6)
+    ]
+
+
+def test_failed_pages_are_not_refetched(tmp_path):
+    def get(url, **kwargs):
+        response = make_page(url)
+        if url.endswith('page=2'):
+            response.status_code = 500
+        return response
+
+    with patch('scripts.http_client.get', side_effect=get):
+        with CrawlFrontier(str(tmp_path / 'frontier.db')) as frontier:
+            collect_job_listings(URL, 'h3', 'p', frontier=frontier)
+
+            assert frontier.counts()['failed'] == 1
+            frontier.requeue_failed()
+            assert list(frontier.pending()) == [f'{URL}&page=2']
@@ -0,0 +1,118 @@
+import random
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from scripts.crawl_pipeline import run_pipeline
+from scripts.rate_limiter import AdaptiveRateLimiter
+from scripts.scrape_job_listings import scrape_job_listings
+
+
+def parse_length(content, multiplier=1):
+    return len(content) * multiplier
+
+
+def slow_fetch(request):
+    time.sleep(random.uniform(0, 0.02))
+    return b'x' * request
+
+
+def make_board_page(page, last_page):
+    listings = ''.join(
+        f"""
+        <div class="job-listing">
+            <h2 class="job-title">Job {page}-{i}</h2>
+            <div class="company">Acme</div>
+            <div class="location">Remote</div>
+            <div class="description">Listing {i} on page {page}</div>
+        </div>
+        """
+        for i in range(3)
+    ) if page <= last_page else ''
+    response = requests.Response()
+    response.status_code = 200
+    response._content = f"<html><body>{listings}</body></html>".encode()
+    return response
+
+
+def test_pipeline_yields_results_in_request_order():
+    results = list(run_pipeline(
+        range(1, 30), parse_length, (2,), fetch=slow_fetch,
+        fetch_workers=4, parse_workers=2, queue_size=4
+    ))
+
+    assert results == [(n, n * 2) for n in range(1, 30)]
+
+
+def test_pipeline_reports_failed_fetches_as_none():
+    def fetch(request):
+        if request == 2:
+            raise requests.ConnectionError("connection reset")
+        return None if request == 3 else b'page'
+
+    results = list(run_pipeline(
+        [1, 2, 3, 4], parse_length, fetch=fetch, parse_workers=1
+    ))
+
+    assert results == [(1, 4), (2, None), (3, None), (4, 4)]
+
+
+def test_failing_requests_iterable_is_raised_instead_of_hanging():
+    def requests_then_error():
+        yield from range(1, 4)
+        raise RuntimeError("request generator broke")
+
+    results = run_pipeline(requests_then_error(), parse_length,
+                           fetch=slow_fetch, fetch_workers=2, parse_workers=1)
+
+    with pytest.raises(RuntimeError, match="request generator broke"):
+        list(results)
+
+
+def test_closing_pipeline_stops_fetching_unbounded_requests():
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch(request):
+        with lock:
+            fetched.append(request)
+        return b'page'
+
+    def endless():
+        n = 0
+        while True:
+            n += 1
+            yield n
+
+    results = run_pipeline(
+        endless(), parse_length, fetch=fetch,
+        fetch_workers=2, parse_workers=1, queue_size=3
+    )
+    for request, _ in results:
+        if request == 5:
+            break
+    results.close()
+
+    # Backpressure bounds how far the fetchers ran ahead of the consumer
+    assert len(fetched) <= 5 + 3 + 2
+
+
+def test_scrape_job_listings_with_parse_workers_matches_sequential():
+    def get(url, params=None, **kwargs):
+        return make_board_page(params['page'], last_page=4)
+
+    with patch('scripts.http_client.get', side_effect=get):
+        sequential = scrape_job_listings(
+            'https://example.com/jobs',
+            rate_limiter=AdaptiveRateLimiter(rate=1000)
+        )
+        pipelined = scrape_job_listings(
+            'https://example.com/jobs', parse_workers=2,
+            rate_limiter=AdaptiveRateLimiter(rate=1000)
+        )
+
+    assert len(sequential) == 12
+    assert pipelined == sequential
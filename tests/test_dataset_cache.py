@@ -0,0 +1,87 @@
+import os
+
+import pandas as pd
+import pytest
+
+from scripts import dataset_cache
+from scripts.dataset_cache import read_cached_csv
+
+SCHEMA = {
+    'title': 'object',
+    'grade': 'object',
+    'unit': 'category',
+    'agency': 'category',
+}
+CSV = (
+    'title,grade,unit,agency,ignored\n'
+    'Accountant,13,5,Tax,x\n'
+    'Clerk,NS,6,Tax,y\n'
+    'Director,66,5,Health,z\n'
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'listings.csv'
+    path.write_text(CSV)
+    return path
+
+
+def fail_to_parse(*args, **kwargs):
+    raise AssertionError('the CSV was parsed again')
+
+
+def test_first_read_parses_typed_projection(source, tmp_path):
+    df = read_cached_csv(str(source), SCHEMA,
+                         cache_dir=str(tmp_path / 'cache'))
+
+    assert list(df.columns) == list(SCHEMA)
+    assert df['agency'].dtype == 'category'
+    assert df['grade'].tolist() == ['13', 'NS', '66']
+    # Numeric codes stay numeric inside the categorical
+    assert df['unit'].cat.categories.tolist() == [5, 6]
+
+
+def test_unchanged_file_is_not_parsed_again(source, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    expected = read_cached_csv(str(source), SCHEMA, cache_dir=cache_dir)
+    monkeypatch.setattr(dataset_cache.pd, 'read_csv', fail_to_parse)
+
+    pd.testing.assert_frame_equal(
+        read_cached_csv(str(source), SCHEMA, cache_dir=cache_dir), expected
+    )
+    # A new modification time alone only costs a hash of the file
+    os.utime(str(source), ns=(0, 0))
+    projected = read_cached_csv(str(source), SCHEMA, columns=['agency'],
+                                cache_dir=cache_dir)
+    assert projected['agency'].tolist() == ['Tax', 'Tax', 'Health']
+
+
+def test_changed_file_rebuilds_cache(source, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    read_cached_csv(str(source), SCHEMA, cache_dir=str(cache_dir))
+
+    source.write_text(CSV + 'Chief,67,7,Parks,w\n')
+    df = read_cached_csv(str(source), SCHEMA, cache_dir=str(cache_dir))
+
+    assert df['title'].tolist()[-1] == 'Chief'
+    # The cache of the old content is removed
+    assert len(list(cache_dir.glob('*.parquet'))) == 1
+
+
+def test_blank_counts_in_the_raw_listing_are_missing(tmp_path):
+    columns = list(dataset_cache.RAW_LISTING_SCHEMA)
+    rows = [dict.fromkeys(columns, '') for _ in range(3)]
+    for i, row in enumerate(rows):
+        row.update({'Title Name': f'Title {i}', 'Title Code': str(100 + i),
+                    'Filled Positions': str(i)})
+    rows[1]['Title Code'] = ''
+    rows[2]['Filled Positions'] = ''
+    path = str(tmp_path / 'raw.csv')
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+
+    for _ in range(2):
+        df = read_cached_csv(path, dataset_cache.RAW_LISTING_SCHEMA,
+                             cache_dir=str(tmp_path / 'cache'))
+        assert df['Title Code'].tolist() == [100, pd.NA, 102]
+        assert df['Filled Positions'].tolist() == [0, 1, pd.NA]
@@ -0,0 +1,98 @@
+import json
+
+from scripts.dedup_gate import BloomFilter, DedupGate, canonical_key
+from scripts.listing_sinks import JsonlSink, write_listings
+
+LISTING = {
+    'job_title': 'Software Engineer', 'company_name': 'Acme',
+    'location': 'Remote', 'url': 'https://Jobs.Example.com/123/?utm_source=g'
+}
+SAME_LISTING = {
+    'jobTitle': 'software  engineer', 'companyName': 'ACME',
+    'location': 'Remote', 'url': 'https://jobs.example.com/123#apply'
+}
+
+
+def test_canonical_key_normalizes_fields():
+    assert canonical_key(LISTING) == canonical_key(SAME_LISTING)
+    assert canonical_key(LISTING) != canonical_key(
+        dict(LISTING, location='Boston, MA')
+    )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'key-{i}')
+
+    assert all(f'key-{i}' in bloom for i in range(1000))
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_gate_admits_each_listing_once_across_runs(tmp_path):
+    path = str(tmp_path / 'gate.db')
+    with DedupGate(path) as gate:
+        assert gate.add(LISTING) is True
+        assert gate.add(SAME_LISTING) is False
+        assert gate.stats['duplicates'] == 1
+
+    with DedupGate(path) as gate:
+        assert gate.seen(SAME_LISTING)
+        assert list(gate.new_listings(
+            [SAME_LISTING, dict(LISTING, job_title='Data Scientist')]
+        )) == [dict(LISTING, job_title='Data Scientist')]
+
+
+def test_false_positives_are_caught_by_exact_check(tmp_path):
+    # A tiny filter that is quickly saturated answers "maybe" for everything
+    with DedupGate(str(tmp_path / 'gate.db'), initial_capacity=1,
+                   error_rate=0.5) as gate:
+        listings = [dict(LISTING, url=f'https://example.com/{i}')
+                    for i in range(200)]
+        for listing in listings:
+            assert gate.add(listing) is True
+            gate.commit()
+        assert gate.stats['false_positives'] > 0
+        assert len(gate._filters) > 1
+
+
+def test_write_listings_skips_seen_listings(tmp_path):
+    path = str(tmp_path / 'listings.jsonl')
+    with DedupGate(str(tmp_path / 'gate.db')) as gate:
+        for _ in range(2):
+            with JsonlSink(path) as sink:
+                write_listings([LISTING, SAME_LISTING], sink, dedup_gate=gate)
+
+    with open(path) as jsonl_file:
+        assert [json.loads(line) for line in jsonl_file] == [LISTING]
+
+
+class FailingSink:
+    def __init__(self, fail_after):
+        self.written = []
+        self.fail_after = fail_after
+
+    def write_batch(self, batch):
+        if len(self.written) >= self.fail_after:
+            raise OSError('disk full')
+        self.written.extend(batch)
+
+
+def test_listings_are_only_remembered_once_written(tmp_path):
+    path = str(tmp_path / 'gate.db')
+    listings = [dict(LISTING, url=f'https://example.com/{i}')
+                for i in range(5)]
+    sink = FailingSink(fail_after=2)
+    try:
+        with DedupGate(path) as gate:
+            write_listings(listings, sink, batch_size=2, dedup_gate=gate)
+    except OSError:
+        pass
+
+    with DedupGate(path) as gate:
+        # The first batch was stored; the rest is let through again
+        assert [gate.seen(listing) for listing in listings] == \
+            [True, True, False, False, False]
+        sink = FailingSink(fail_after=5)
+        assert write_listings(listings, sink, dedup_gate=gate) == 3
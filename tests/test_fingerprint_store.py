@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+import pytest
+
+from scripts import scrape_job_listings as scraper
+from scripts.fingerprint_store import (
+    FingerprintStore, UnchangedPage, listing_fingerprint
+)
+from scripts.listing_sinks import write_listings
+from tests.test_dedup_gate import FailingSink
+from tests.test_scrape_job_listings import LAST_PAGE, FakeBoard, scrape
+
+
+def test_listing_fingerprint_is_canonical():
+    listing = {'job_title': 'Data  Scientist', 'company': 'Acme'}
+    reordered = {'company': 'ACME ', 'job_title': 'Data Scientist'}
+
+    assert listing_fingerprint(listing) == listing_fingerprint(reordered)
+    assert listing_fingerprint(listing) != listing_fingerprint(
+        {'job_title': 'Data Engineer', 'company': 'Acme'}
+    )
+
+
+def test_page_is_only_recorded_after_its_listings(tmp_path):
+    with FingerprintStore(str(tmp_path / 'fingerprints.db')) as store:
+        assert store.filter_page('page-1', b'<html>1</html>') == \
+            b'<html>1</html>'
+        # Not recorded yet, so a crash before record_page reparses the page
+        assert store.filter_page('page-1', b'<html>1</html>') == \
+            b'<html>1</html>'
+
+        store.record_page('page-1', 3)
+
+        assert store.filter_page('page-1', b'<html>1</html>') == \
+            UnchangedPage(3)
+        assert store.filter_page('page-1', b'<html>2</html>') == \
+            b'<html>2</html>'
+
+
+def test_new_listings_persist_between_runs(tmp_path):
+    path = str(tmp_path / 'fingerprints.db')
+    listings = [{'job_title': 'A'}, {'job_title': 'B'}, {'job_title': 'A'}]
+    with FingerprintStore(path) as store:
+        assert list(store.new_listings(listings)) == listings[:2]
+    with FingerprintStore(path) as store:
+        assert list(store.new_listings(
+            [{'job_title': 'B'}, {'job_title': 'C'}]
+        )) == [{'job_title': 'C'}]
+
+
+class ChangingBoard(FakeBoard):
+    """Serves page 2 with one extra listing."""
+
+    def get(self, url, params=None, **kwargs):
+        response = super().get(url, params, **kwargs)
+        if params['page'] == 2:
+            response._content = response._content.replace(
+                b'</body>',
+                b'<div class="job-listing"><h2 class="job-title">New</h2>'
+                b'<div class="company">Acme</div>'
+                b'<div class="location">Remote</div>'
+                b'<div class="description">Fresh</div></div></body>'
+            )
+        return response
+
+
+def test_second_crawl_only_parses_and_returns_changes(tmp_path):
+    path = str(tmp_path / 'fingerprints.db')
+    with FingerprintStore(path) as fingerprints:
+        first = scrape(FakeBoard(), fingerprints=fingerprints)
+    assert len(first) == LAST_PAGE * 2
+
+    with FingerprintStore(path) as fingerprints, \
+            patch.object(scraper, 'parse_job_page',
+                         wraps=scraper.parse_job_page) as parse:
+        unchanged = scrape(FakeBoard(), fingerprints=fingerprints)
+        assert unchanged == []
+        assert parse.call_count == 0
+
+        changed = scrape(ChangingBoard(), fingerprints=fingerprints)
+        assert parse.call_count == 1
+
+    assert changed == [{'job_title': 'New', 'company': 'Acme',
+                        'location': 'Remote', 'description': 'Fresh'}]
+
+
+def test_listings_of_a_failed_write_are_crawled_again(tmp_path):
+    path = str(tmp_path / 'fingerprints.db')
+    sink = FailingSink(fail_after=4)
+    with pytest.raises(OSError), FingerprintStore(path) as fingerprints, \
+            patch('scripts.http_client.get', side_effect=FakeBoard().get):
+        listings = scraper.iter_scrape_job_listings(
+            'https://example.com/jobs', fingerprints=fingerprints
+        )
+        write_listings(listings, sink, batch_size=4,
+                       checkpoints=[fingerprints])
+    assert len(sink.written) == 4
+
+    # Only the listings that reached the sink are skipped by the next run
+    with FingerprintStore(path) as fingerprints:
+        again = scrape(FakeBoard(), fingerprints=fingerprints)
+    assert again == scrape(FakeBoard())[4:]
@@ -0,0 +1,52 @@
+from scripts import http_client
+from scripts.http_client import DEFAULT_HEADERS, JitteredRetry, build_session
+
+
+def test_build_session_sets_default_headers():
+    session = build_session(headers={'Accept': 'text/html'})
+
+    assert session.headers['User-Agent'] == DEFAULT_HEADERS['User-Agent']
+    assert session.headers['Accept'] == 'text/html'
+
+
+def test_build_session_uses_per_host_pool_sizes():
+    session = build_session(
+        pool_size=8, host_pool_sizes={'strict.example.com': 2}
+    )
+
+    strict_adapter = session.get_adapter('https://strict.example.com/jobs')
+    default_adapter = session.get_adapter('https://other.example.com/jobs')
+
+    assert strict_adapter._pool_maxsize == 2
+    assert default_adapter._pool_maxsize == 8
+    assert strict_adapter._pool_block
+
+
+def test_look_alike_hosts_use_the_default_pool():
+    session = build_session(pool_size=8, host_pool_sizes={'example.com': 2})
+
+    assert session.get_adapter('http://example.com/')._pool_maxsize == 2
+    for url in ('https://example.com.evil.org/jobs',
+                'https://example.community/jobs'):
+        assert session.get_adapter(url)._pool_maxsize == 8
+
+
+def test_retry_backoff_includes_bounded_jitter():
+    retry = JitteredRetry(total=5, backoff_factor=1, jitter=0.25)
+    retry = retry.increment(method='GET', url='/jobs')
+    retry = retry.increment(method='GET', url='/jobs')
+
+    assert isinstance(retry, JitteredRetry)
+    assert retry.jitter == 0.25
+    for _ in range(20):
+        backoff = retry.get_backoff_time()
+        assert 2 <= backoff <= 2.25
+
+
+def test_configure_replaces_shared_session():
+    first = http_client.configure(pool_size=4)
+    second = http_client.configure(pool_size=6)
+
+    assert http_client.get_session() is second
+    assert second is not first
+    assert second.get_adapter('https://example.com')._pool_maxsize == 6
@@ -0,0 +1,124 @@
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+
+from scripts.create_db_schema import Base, Job, migrate_jobs_table
+from scripts.dedup_gate import listing_key
+from scripts.ingest_listings import ingest_listings, iter_listings_file
+from scripts.listing_sinks import upsert_statement
+
+
+def make_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def make_listing(i, description='Build things'):
+    return {
+        'job_title': f'Engineer {i}', 'company_name': 'Acme',
+        'location': 'Remote', 'url': f'https://example.com/jobs/{i}',
+        'description': description
+    }
+
+
+def test_ingest_reports_throughput(tmp_path):
+    engine = make_engine(tmp_path)
+
+    report = ingest_listings(
+        (make_listing(i) for i in range(250)), engine, batch_size=100
+    )
+
+    with engine.connect() as connection:
+        count = connection.execute(select(func.count(Job.id))).scalar()
+    assert count == 250
+    assert report['rows'] == 250
+    assert report['rows_per_sec'] > 0
+
+
+def test_reingesting_updates_rows_instead_of_duplicating(tmp_path):
+    engine = make_engine(tmp_path)
+    ingest_listings([make_listing(i) for i in range(3)], engine)
+
+    ingest_listings([
+        make_listing(1, 'Old copy'),
+        make_listing(1, 'Updated description'),
+        make_listing(3),
+    ], engine)
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(Job.title, Job.company, Job.description).order_by(Job.id)
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        ('Engineer 0', 'Acme', 'Build things'),
+        ('Engineer 1', 'Acme', 'Updated description'),
+        ('Engineer 2', 'Acme', 'Build things'),
+        ('Engineer 3', 'Acme', 'Build things'),
+    ]
+
+
+def test_upsert_statement_for_postgresql():
+    from sqlalchemy.dialects import postgresql
+
+    sql = str(upsert_statement('postgresql').compile(
+        dialect=postgresql.dialect()
+    ))
+
+    assert 'ON CONFLICT (listing_key) DO UPDATE' in sql
+
+
+def test_migration_upgrades_an_old_jobs_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY,"
+            " title VARCHAR NOT NULL, description VARCHAR, location VARCHAR)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO jobs (title) VALUES ('Clerk')"
+        )
+
+    migrate_jobs_table(engine)
+    migrate_jobs_table(engine)
+    ingest_listings([make_listing(1), make_listing(1, 'Updated')], engine)
+    ingest_listings([make_listing(1, 'Again')], engine)
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(Job.title, Job.company, Job.description).order_by(Job.id)
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        ('Clerk', None, None), ('Engineer 1', 'Acme', 'Again')
+    ]
+
+
+def test_csv_rows_get_the_same_key_as_json_listings(tmp_path):
+    listing = {'job_title': 'Engineer', 'company': 'Acme',
+               'location': 'Remote', 'url': 'https://example.com/1'}
+    sparse = {'job_title': 'Clerk', 'company_name': 'Acme'}
+    path = str(tmp_path / 'listings.csv')
+    pd.DataFrame([listing, sparse] * 3).to_csv(path, index=False)
+
+    rows = iter_listings_file(path, chunksize=2)
+
+    assert not isinstance(rows, list)
+    assert [listing_key(row) for row in rows] == \
+        [listing_key(listing), listing_key(sparse)] * 3
+
+
+def test_incomplete_listings_do_not_fail_the_batch(tmp_path):
+    engine = make_engine(tmp_path)
+    untitled = dict(make_listing(1), job_title=None)
+    undescribed = dict(make_listing(2), description=None)
+
+    report = ingest_listings(
+        [make_listing(0), untitled, {'job_title': float('nan')}, undescribed],
+        engine
+    )
+
+    with engine.connect() as connection:
+        titles = connection.execute(
+            select(Job.title).order_by(Job.id)
+        ).scalars().all()
+    assert titles == ['Engineer 0', 'Engineer 2']
+    assert report['rows'] == 2 and report['rejected'] == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from scripts.job_level_categorizer import (
+    JobLevelCategorizer, categorize_job_title, categorize_job_titles,
+    legacy_categorize_job_title
+)
+
+TITLE_WORDS = [
+    'intern', 'junior', 'assistant', 'mid', 'senior', 'lead', 'manager',
+    'director', 'vp', 'vice', 'president', 'chief', 'head', 'principal',
+    'engineer', 'analyst', 'clerk', 'internal', 'leader', 'headquarters',
+]
+
+
+def make_titles(count, unique, seed=0):
+    generator = np.random.RandomState(seed)
+    pool = [' '.join(generator.choice(TITLE_WORDS, generator.randint(1, 5)))
+            .title() + f' {i}' for i in range(unique)]
+    return pd.Series([pool[i] for i in generator.randint(0, unique, count)])
+
+
+def test_first_level_in_table_wins():
+    # "Senior" comes first in the title but entry-level keywords rank higher
+    assert categorize_job_title('Senior Assistant') == 'Entry-level'
+    assert categorize_job_title('Head of Vice President Office') == \
+        'Advanced-level'
+    assert categorize_job_title('Internal Auditor') == 'Unknown'
+    assert categorize_job_title('MID-LEVEL Analyst') == 'Mid-level'
+
+
+def test_series_matches_row_by_row_legacy_version():
+    titles = make_titles(2000, unique=300)
+
+    expected = titles.map(legacy_categorize_job_title)
+    assert categorize_job_titles(titles).tolist() == expected.tolist()
+
+
+def test_series_keeps_index_and_fills_missing_titles():
+    titles = pd.Series(['Junior Clerk', np.nan, 'Chief Counsel'],
+                       index=[10, 20, 30])
+
+    levels = categorize_job_titles(titles)
+
+    assert levels.index.tolist() == [10, 20, 30]
+    assert levels.tolist() == ['Entry-level', 'Unknown', 'Advanced-level']
+
+
+def test_custom_keyword_table():
+    categorizer = JobLevelCategorizer(
+        [('Executive', ['c.e.o', 'chief']), ('Staff', ['engineer'])],
+        default='Other'
+    )
+
+    assert categorizer.categorize('Chief Engineer') == 'Executive'
+    # Keywords are matched literally, not as patterns
+    assert categorizer.categorize('cxeyo') == 'Other'
+    assert categorizer.categorize_series(
+        ['C.E.O', 'Engineer', 'Clerk']
+    ).tolist() == ['Executive', 'Staff', 'Other']
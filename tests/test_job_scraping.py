@@ -1,7 +1,10 @@
 import sys
 import os
 import pytest
-from scripts.job_scraping import scrape_job_listings
+from scripts import job_scraping
+from scripts.job_scraping import (
+    available_parsers, parse_job_listings, scrape_job_listings
+)
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -94,5 +97,56 @@ def test_scrape_job_listings_with_error():
     assert job_listings == expected_job_listings
 
 
+@pytest.mark.parametrize("parser", available_parsers())
+def test_parsers_agree_on_fixture_page(parser):
+    fixture_path = os.path.join(
+        os.path.dirname(__file__), "fixtures", "job_board_page_1.html"
+    )
+    with open(fixture_path, "rb") as fixture_file:
+        html_content = fixture_file.read()
+
+    job_listings = parse_job_listings(
+        html_content, "h2.job-title", "div.job-description", parser
+    )
+    expected_job_listings = parse_job_listings(
+        html_content, "h2.job-title", "div.job-description", "html.parser"
+    )
+
+    assert len(job_listings) == 120
+    assert job_listings == expected_job_listings
+
+
+@pytest.mark.parametrize("parser", available_parsers())
+def test_parsers_handle_missing_elements(parser):
+    mock_html = """
+    <html>
+    <body>
+        <div class="header"><h2 class="job-title">Not a listing</h2></div>
+        <div class="job-listing">
+            <div class="job-description">Untitled role.</div>
+        </div>
+    </body>
+    </html>
+    """
+
+    job_listings = parse_job_listings(
+        mock_html, "h2.job-title", "div.job-description", parser
+    )
+
+    assert job_listings == [
+        {'title': 'No title provided.', 'description': 'Untitled role.'}
+    ]
+
+
+def test_missing_parser_package_is_named(monkeypatch):
+    monkeypatch.setattr(job_scraping, 'HTMLParser', None)
+
+    with pytest.raises(ValueError, match='selectolax package'):
+        parse_job_listings('<html></html>', 'h2', 'div', 'selectolax')
+    with pytest.raises(ValueError, match="Unknown parser 'html5'"):
+        parse_job_listings('<html></html>', 'h2', 'div', 'html5')
+    assert parse_job_listings('<html></html>', 'h2', 'div') == []
+
+
 if __name__ == "__main__":
     pytest.main()
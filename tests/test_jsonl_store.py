@@ -0,0 +1,113 @@
+import json
+import threading
+
+from scripts.clean_job_listings import (
+    clean_job_listings, convert_json_to_jsonl
+)
+from scripts.jsonl_store import JsonlStore
+
+LISTINGS = [
+    {'job_title': 'Software Engineer', 'company_name': 'Acme'},
+    {'job_title': 'More results', 'company_name': 'Google'},
+    {'jobTitle': 'Data Scientist', 'companyName': 'Globex'},
+    {'jobTitle': 'Try again later', 'companyName': 'Google'},
+]
+
+
+def test_append_and_stream(tmp_path):
+    store = JsonlStore(str(tmp_path / 'listings.jsonl'))
+
+    assert store.append(LISTINGS[:2]) == 2
+    assert store.append([]) == 0
+    assert store.append(LISTINGS[2:]) == 2
+
+    assert list(store) == LISTINGS
+    assert len(store) == 4
+
+
+def test_index_gives_random_access(tmp_path):
+    path = str(tmp_path / 'listings.jsonl')
+    store = JsonlStore(path, index=True)
+    store.append(LISTINGS[:3])
+    store.append(LISTINGS[3:])
+
+    assert len(store) == 4
+    assert store[2] == LISTINGS[2]
+    assert store[-1] == LISTINGS[3]
+
+    # An index missing on open is rebuilt from the store
+    (tmp_path / 'listings.jsonl.idx').unlink()
+    assert JsonlStore(path, index=True)[1] == LISTINGS[1]
+
+
+def test_concurrent_appends_do_not_interleave(tmp_path):
+    store = JsonlStore(str(tmp_path / 'listings.jsonl'), index=True)
+    batch = [{'job_title': 'x' * 5000, 'n': n} for n in range(20)]
+
+    threads = [
+        threading.Thread(target=store.append, args=(batch,)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(list(store)) == 160
+    assert [store[i]['n'] for i in range(0, 160, 20)] == [0] * 8
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'listings.jsonl'
+    store = JsonlStore(str(path))
+    store.append(LISTINGS[:1])
+    with open(path, 'a') as jsonl_file:
+        jsonl_file.write('{"job_title": "Half wri')
+
+    assert list(store) == LISTINGS[:1]
+
+
+def test_append_after_torn_line_keeps_every_listing(tmp_path):
+    path = tmp_path / 'listings.jsonl'
+    store = JsonlStore(str(path), index=True)
+    store.append(LISTINGS[:1])
+    with open(path, 'a') as jsonl_file:
+        jsonl_file.write('{"job_title": "Half wri')
+
+    store.append(LISTINGS[1:3])
+
+    assert list(store) == LISTINGS[:3]
+    assert store[1] == LISTINGS[1]
+    # A rebuilt index leaves the torn line out as well
+    (tmp_path / 'listings.jsonl.idx').unlink()
+    assert JsonlStore(str(path), index=True)[2] == LISTINGS[2]
+
+
+def test_clean_job_listings_compacts_both_title_keys(tmp_path):
+    path = str(tmp_path / 'listings.jsonl')
+    store = JsonlStore(path, index=True)
+    store.append(LISTINGS)
+
+    assert clean_job_listings(path) == (2, 2)
+    assert list(JsonlStore(path)) == [LISTINGS[0], LISTINGS[2]]
+    assert JsonlStore(path, index=True)[1] == LISTINGS[2]
+
+
+def test_existing_index_is_kept_up_to_date_without_the_flag(tmp_path):
+    path = str(tmp_path / 'listings.jsonl')
+    JsonlStore(path, index=True).append(LISTINGS + LISTINGS[:1])
+
+    clean_job_listings(path)
+    JsonlStore(path).append(LISTINGS[2:3])
+
+    store = JsonlStore(path, index=True)
+    assert len(store) == 4
+    assert [store[i] for i in range(4)] == list(store)
+
+
+def test_convert_legacy_json(tmp_path):
+    json_path = tmp_path / 'listings.json'
+    json_path.write_text(json.dumps(LISTINGS, indent=4))
+    jsonl_path = str(tmp_path / 'listings.jsonl')
+
+    assert convert_json_to_jsonl(str(json_path), jsonl_path) == 4
+    assert list(JsonlStore(jsonl_path)) == LISTINGS
@@ -0,0 +1,111 @@
+import csv
+import json
+
+from sqlalchemy import create_engine, select
+
+from scripts.create_db_schema import Base, Job
+from scripts.job_scraping import iter_scrape_job_listings
+from scripts.listing_sinks import (
+    CsvSink, JobsTableSink, JsonlSink, iter_batches, write_listings
+)
+
+LISTINGS = [
+    {'job_title': 'Software Engineer', 'company': 'Acme',
+     'location': 'Remote', 'description': 'Build things'},
+    {'job_title': 'Data Scientist', 'company': 'Globex',
+     'location': 'Austin, TX', 'description': 'Analyze data'},
+    {'job_title': 'QA Analyst', 'company': 'Initech',
+     'location': 'Boston, MA', 'description': 'Test things'},
+]
+
+
+def test_iter_batches():
+    batches = list(iter_batches(range(7), batch_size=3))
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_write_listings_consumes_generator_in_batches():
+    consumed = []
+    written = []
+
+    def listings():
+        for listing in LISTINGS:
+            consumed.append(listing)
+            yield listing
+
+    class RecordingSink:
+        def write_batch(self, batch):
+            # Only the current batch has been pulled from the generator
+            assert len(consumed) == len(written) + len(batch)
+            written.extend(batch)
+
+    count = write_listings(listings(), RecordingSink(), batch_size=2)
+
+    assert count == 3
+    assert written == LISTINGS
+
+
+def test_csv_sink_appends_under_existing_header(tmp_path):
+    path = str(tmp_path / 'listings.csv')
+    with CsvSink(path, append=False) as sink:
+        write_listings(LISTINGS[:2], sink, batch_size=1)
+    with CsvSink(path) as sink:
+        write_listings(LISTINGS[2:], sink)
+
+    with open(path, newline='') as csv_file:
+        rows = list(csv.DictReader(csv_file))
+
+    assert rows == LISTINGS
+
+
+def test_jsonl_sink(tmp_path):
+    path = str(tmp_path / 'listings.jsonl')
+    with JsonlSink(path) as sink:
+        write_listings(LISTINGS, sink, batch_size=2)
+
+    with open(path, encoding='utf-8') as jsonl_file:
+        rows = [json.loads(line) for line in jsonl_file]
+
+    assert rows == LISTINGS
+
+
+def test_jobs_table_sink(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+
+    with JobsTableSink(engine) as sink:
+        count = write_listings(LISTINGS, sink, batch_size=2)
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(Job.title, Job.location).order_by(Job.id)
+        ).fetchall()
+
+    assert count == 3
+    assert [tuple(row) for row in rows] == [
+        ('Software Engineer', 'Remote'),
+        ('Data Scientist', 'Austin, TX'),
+        ('QA Analyst', 'Boston, MA'),
+    ]
+
+
+def test_scraper_generator_streams_into_sink(tmp_path):
+    mock_html = """
+    <div class="job-listing">
+        <h2 class="job-title">Software Engineer</h2>
+        <div class="job-description">Build things</div>
+    </div>
+    """
+    path = str(tmp_path / 'listings.jsonl')
+    with JsonlSink(path) as sink:
+        write_listings(iter_scrape_job_listings(
+            mock_html, 'h2.job-title', 'div.job-description', is_url=False
+        ), sink)
+
+    with open(path, encoding='utf-8') as jsonl_file:
+        rows = [json.loads(line) for line in jsonl_file]
+
+    assert rows == [
+        {'title': 'Software Engineer', 'description': 'Build things'}
+    ]
@@ -0,0 +1,69 @@
+import argparse
+
+import requests
+
+from scripts.benchmark_scrapers import measure_scraper, percentile
+from scripts.collect_job_listings import collect_job_listings
+from scripts.mock_job_board import MockJobBoard
+from scripts.rate_limiter import AdaptiveRateLimiter
+from scripts.scrape_job_listings import scrape_job_listings
+
+
+def test_scrapers_read_every_listing_from_the_board():
+    with MockJobBoard(pages=3, listings_per_page=4) as board:
+        scraped = scrape_job_listings(
+            f'{board.url}/jobs', rate_limiter=AdaptiveRateLimiter(rate=1000)
+        )
+        collected = collect_job_listings(
+            f'{board.url}/jobs?q=engineer', 'h2.job-title', 'div.description',
+            max_pages=3
+        )
+
+    expected = [
+        listing for page in (1, 2, 3) for listing in board.listings(page)
+    ]
+    assert scraped == [
+        {key: listing[key] for key in
+         ('job_title', 'company', 'location', 'description')}
+        for listing in expected
+    ]
+    assert [listing['title'] for listing in collected] == [
+        listing['job_title'] for listing in expected
+    ]
+
+
+def test_board_injects_errors_and_rate_limits():
+    with MockJobBoard(error_rate=1.0) as board:
+        assert requests.get(f'{board.url}/jobs').status_code == 500
+
+    with MockJobBoard(rate_limit=0.5) as board:
+        assert requests.get(f'{board.url}/jobs').status_code == 200
+        throttled = requests.get(f'{board.url}/jobs')
+
+    assert throttled.status_code == 429
+    assert throttled.headers['Retry-After'] == '2'
+    assert board.stats == {'requests': 2, 'errors': 0, 'throttled': 1}
+
+
+def test_measure_scraper_reports_throughput_and_latency():
+    args = argparse.Namespace(
+        pages=3, rate=1000, prefetch=2, parse_workers=None
+    )
+    with MockJobBoard(pages=3, listings_per_page=5, latency=0.01) as board:
+        result = measure_scraper('scrape_job_listings', board.url, args)
+
+    assert result['listings'] == 15
+    assert result['pages'] >= 4
+    assert result['p50_ms'] >= 10
+    assert result['p99_ms'] >= result['p50_ms']
+    assert result['listings_per_sec'] > 0
+    assert result['peak_rss_mb'] > 0
+
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) is None
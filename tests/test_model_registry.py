@@ -0,0 +1,117 @@
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.dummy import DummyClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from scripts import model_registry
+from scripts.evaluate_model import evaluate_model
+from scripts.model_registry import (
+    MANIFEST_FILE, MODEL_FILE, ModelRegistry, save_bundle
+)
+from scripts.predict_job_level import predict_job_level, predict_job_levels
+from scripts.sparse_features import save_features
+
+LISTING = {
+    'job_title': 'Accountant Aide', 'jurisdictional_classification': '0.0',
+    'negotiating_unit': '5.0', 'agency_description': 'Multiple Agencies'
+}
+
+
+def save_model(directory, classes, predicted):
+    vectorizer = TfidfVectorizer().fit(['accountant aide', 'tax director'])
+    X = vectorizer.transform(['accountant aide'] * len(classes))
+    model = DummyClassifier(strategy='constant', constant=predicted)
+    model.fit(X, list(range(len(classes))))
+    save_bundle(directory, model, vectorizer,
+                np.array(classes, dtype=object))
+    return model
+
+
+def test_artifacts_are_loaded_once(tmp_path):
+    save_model(str(tmp_path), ['J', 'T'], 1)
+    registry = ModelRegistry(str(tmp_path))
+
+    for _ in range(5):
+        assert predict_job_level(LISTING, registry=registry) == 'T'
+
+    assert registry.stats['loads'] == 3
+    assert registry.bundle() is registry.bundle()
+
+
+def test_changed_files_are_reloaded(tmp_path):
+    save_model(str(tmp_path), ['J', 'T'], 1)
+    registry = ModelRegistry(str(tmp_path))
+    first = registry.bundle()
+
+    save_model(str(tmp_path), ['J', 'T'], 0)
+
+    assert registry.bundle() is not first
+    assert predict_job_level(LISTING, registry=registry) == 'J'
+
+
+def test_versions_are_served_side_by_side(tmp_path):
+    save_model(str(tmp_path), ['J', 'T'], 0)
+    save_model(str(tmp_path / 'v2'), ['A', 'B', 'C'], 2)
+    registry = ModelRegistry(str(tmp_path))
+
+    assert registry.versions() == [None, 'v2']
+    assert predict_job_level(LISTING, registry=registry) == 'J'
+    assert predict_job_level(LISTING, 'v2', registry=registry) == 'C'
+    assert registry.stats['loads'] == 6
+
+    registry.evict('v2')
+    assert predict_job_level(LISTING, 'v2', registry=registry) == 'C'
+    assert registry.stats['loads'] == 9
+
+
+def test_bundle_is_only_reloaded_when_the_manifest_changes(tmp_path):
+    directory = str(tmp_path)
+    save_model(directory, ['J', 'T'], 1)
+    registry = ModelRegistry(directory)
+    first = registry.bundle()
+
+    # A training run that has replaced the model but not yet the manifest
+    new_model = save_model(str(tmp_path / 'next'), ['J', 'T'], 0)
+    joblib.dump(new_model, os.path.join(directory, MODEL_FILE))
+
+    assert registry.bundle() is first
+    assert predict_job_level(LISTING, registry=registry) == 'T'
+
+    save_model(directory, ['J', 'T'], 0)
+    with open(os.path.join(directory, MANIFEST_FILE)) as manifest_file:
+        assert set(json.load(manifest_file)['files']) == \
+            {'model', 'vectorizer', 'label_classes'}
+    assert predict_job_level(LISTING, registry=registry) == 'J'
+
+
+def test_manifest_is_only_parsed_when_replaced(tmp_path, monkeypatch):
+    save_model(str(tmp_path), ['J', 'T'], 1)
+    registry = ModelRegistry(str(tmp_path))
+    reads = []
+    read_manifest = model_registry.read_manifest
+    monkeypatch.setattr(model_registry, 'read_manifest',
+                        lambda directory: reads.append(directory) or
+                        read_manifest(directory))
+
+    levels = predict_job_levels([LISTING] * 10, batch_size=1,
+                                registry=registry)
+    assert list(levels) == ['T'] * 10
+    assert len(reads) == 1
+
+    save_model(str(tmp_path), ['J', 'T'], 0)
+    assert predict_job_level(LISTING, registry=registry) == 'J'
+    assert len(reads) == 2
+
+
+def test_evaluation_encodes_labels_with_the_training_classes(tmp_path):
+    model_path = str(tmp_path / MODEL_FILE)
+    save_model(str(tmp_path), ['A', 'J', 'T'], 2)
+    features_path = str(tmp_path / 'features.npz')
+    # Neither 'A' nor 'J' is in the test split
+    save_features(features_path, np.ones((4, 4)), None,
+                  job_level=['T'] * 4)
+
+    assert evaluate_model(model_path, features_path)['accuracy'] == 1.0
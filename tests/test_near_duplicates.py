@@ -0,0 +1,98 @@
+import pytest
+
+from scripts.aggregate_job_listings import aggregate_job_listings
+from scripts.listing_sinks import write_listings
+from scripts.near_duplicates import NearDuplicateIndex
+from tests.test_dedup_gate import FailingSink
+
+DESCRIPTION = (
+    "Design, build and maintain scalable backend services in Python. "
+    "Work with product managers to ship features, review code, mentor "
+    "junior engineers and keep our data pipelines reliable."
+)
+
+LISTING = {
+    'job_title': 'Senior Software Engineer', 'company': 'Acme',
+    'description': DESCRIPTION
+}
+REPOSTED = {
+    'jobTitle': 'Senior Software Engineer', 'companyName': 'ACME',
+    'description': DESCRIPTION.replace('reliable.', 'reliable!')
+}
+DIFFERENT = {
+    'job_title': 'Data Scientist', 'company': 'Globex',
+    'description': "Analyze experiments and build forecasting models in R."
+}
+
+
+def test_flags_near_duplicates_across_sources(tmp_path):
+    with NearDuplicateIndex(str(tmp_path / 'index.db')) as index:
+        first_id = index.add(LISTING)
+
+        assert index.check(REPOSTED) == first_id
+        assert index.check(DIFFERENT) is None
+        assert len(index) == 2
+        [(match_id, similarity)] = index.query(LISTING)
+        assert match_id == first_id and similarity == 1.0
+
+
+def test_index_persists_between_runs(tmp_path):
+    path = str(tmp_path / 'index.db')
+    with NearDuplicateIndex(path) as index:
+        assert list(index.unique_listings([LISTING, REPOSTED])) == [LISTING]
+
+    with NearDuplicateIndex(path) as index:
+        assert list(index.unique_listings([REPOSTED, DIFFERENT])) == [
+            DIFFERENT
+        ]
+
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(path, num_perm=64)
+
+
+def test_aggregate_drops_near_duplicates(tmp_path):
+    page = """
+    <div class="job-listing">
+        <h2 class="job-title">{title}</h2>
+        <div class="job-description">{description}</div>
+    </div>
+    """
+    sources = [{
+        'content': page.format(title=title, description=description),
+        'title_selector': 'h2.job-title',
+        'description_selector': 'div.job-description',
+        'is_url': False
+    } for title, description in [
+        ('Software Engineer', DESCRIPTION),
+        ('Software  Engineer', DESCRIPTION + ' '),
+        ('Data Scientist', DIFFERENT['description']),
+    ]]
+
+    with NearDuplicateIndex(str(tmp_path / 'index.db')) as index:
+        df = aggregate_job_listings(sources, dedup_index=index)
+
+    assert list(df['title']) == ['Software Engineer', 'Data Scientist']
+
+
+def test_signatures_are_only_stored_once_written(tmp_path):
+    path = str(tmp_path / 'index.db')
+    sink = FailingSink(fail_after=1)
+    with pytest.raises(OSError), NearDuplicateIndex(path) as index:
+        write_listings(index.unique_listings([LISTING, DIFFERENT]), sink,
+                       batch_size=1, checkpoints=[index])
+    assert sink.written == [LISTING]
+
+    # DIFFERENT never reached the sink, so it is not its own near-duplicate
+    with NearDuplicateIndex(path) as index:
+        assert len(index) == 1
+        assert list(index.unique_listings([REPOSTED, DIFFERENT])) == [
+            DIFFERENT
+        ]
+
+
+def test_listings_without_text_are_not_indexed(tmp_path):
+    empty = [{'job_title': ''}, {'description': None}, {'url': 'x'}]
+    with NearDuplicateIndex(str(tmp_path / 'index.db')) as index:
+        assert list(index.unique_listings(empty)) == empty
+        assert len(index) == 0
+        assert index.query({}) == []
@@ -0,0 +1,95 @@
+import os
+
+from scripts import columnar_store
+from scripts.model_registry import (
+    LABEL_CLASSES_FILE, MANIFEST_FILE, MODEL_FILE, VECTORIZER_FILE
+)
+from scripts.pipeline import Stage, default_stages, run_pipeline
+
+
+def copy_upper(input_path, output_path):
+    with open(input_path) as source, open(output_path, 'w') as target:
+        target.write(source.read().upper())
+
+
+def repeat(input_path, output_path, times=2):
+    with open(input_path) as source, open(output_path, 'w') as target:
+        target.write(source.read() * times)
+
+
+def count_lines(input_path, output_path):
+    with open(input_path) as source, open(output_path, 'w') as target:
+        target.write(str(len(source.read().splitlines())))
+
+
+def count_characters(input_path, output_path):
+    with open(input_path) as source, open(output_path, 'w') as target:
+        target.write(str(len(source.read())))
+
+
+def make_stages(tmp_path, times=2, last=count_lines):
+    source, upper, repeated, counted = (
+        str(tmp_path / name)
+        for name in ('source.txt', 'upper.txt', 'repeated.txt', 'count.txt')
+    )
+    return [
+        # Listed out of order: the runner orders stages by their files
+        Stage('count', last, (repeated,), (counted,), {}, ()),
+        Stage('upper', copy_upper, (source,), (upper,), {}, ()),
+        Stage('repeat', repeat, (upper,), (repeated,), {'times': times}, ()),
+        Stage('upper_copy', copy_upper, (source,),
+              (str(tmp_path / 'copy.txt'),), {}, ()),
+    ]
+
+
+def run(tmp_path, **kwargs):
+    return run_pipeline(make_stages(tmp_path, **kwargs),
+                        str(tmp_path / 'state.json'), workers=2)
+
+
+def test_second_run_skips_every_stage(tmp_path):
+    (tmp_path / 'source.txt').write_text('a\nb\n')
+
+    assert set(run(tmp_path).values()) == {'ran'}
+    assert set(run(tmp_path).values()) == {'up to date'}
+    assert (tmp_path / 'count.txt').read_text() == '4'
+
+
+def test_changes_rerun_only_affected_stages(tmp_path):
+    (tmp_path / 'source.txt').write_text('a\nb\n')
+    run(tmp_path)
+
+    # New parameters re-run the stage and, as its output changes, the next
+    statuses = run(tmp_path, times=3)
+    assert statuses == {'upper': 'up to date', 'upper_copy': 'up to date',
+                        'repeat': 'ran', 'count': 'ran'}
+    # New code in the last stage re-runs only that stage
+    statuses = run(tmp_path, times=3, last=count_characters)
+    assert [name for name, status in statuses.items()
+            if status == 'ran'] == ['count']
+    assert (tmp_path / 'count.txt').read_text() == '12'
+
+    (tmp_path / 'source.txt').write_text('c\n')
+    assert set(run(tmp_path, times=3,
+                   last=count_characters).values()) == {'ran'}
+
+
+def test_modified_output_is_rebuilt(tmp_path):
+    (tmp_path / 'source.txt').write_text('a\n')
+    run(tmp_path)
+
+    (tmp_path / 'upper.txt').write_text('edited by hand')
+
+    assert run(tmp_path)['upper'] == 'ran'
+    assert (tmp_path / 'upper.txt').read_text() == 'A\n'
+
+
+def test_default_stages_declare_everything_they_write_and_run(tmp_path):
+    stages = {stage.name: stage for stage in default_stages(
+        str(tmp_path / 'data'), str(tmp_path / 'models'))}
+
+    # A deleted vectorizer or label classes file makes training stale
+    assert [os.path.basename(path) for path in stages['train'].outputs] == \
+        [MODEL_FILE, VECTORIZER_FILE, LABEL_CLASSES_FILE, MANIFEST_FILE]
+    for name in ('preprocess', 'redefine_job_levels', 'features', 'train'):
+        assert columnar_store in stages[name].code
@@ -0,0 +1,63 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from scripts.model_registry import (
+    LABEL_CLASSES_FILE, MODEL_FILE, VECTORIZER_FILE, ModelRegistry
+)
+from scripts.predict_job_level import predict_job_level, predict_job_levels
+
+
+def make_registry(directory):
+    text = ['accountant aide 0.0 5.0 tax', 'chief director 1.0 6.0 health']
+    vectorizer = TfidfVectorizer().fit(text)
+    model = LogisticRegression().fit(vectorizer.transform(text), [0, 1])
+    joblib.dump(model, os.path.join(directory, MODEL_FILE))
+    joblib.dump(vectorizer, os.path.join(directory, VECTORIZER_FILE))
+    joblib.dump(np.array(['T', 'J'], dtype=object),
+                os.path.join(directory, LABEL_CLASSES_FILE))
+    return ModelRegistry(directory)
+
+
+def make_listings(count):
+    return pd.DataFrame({
+        'job_title': ['Accountant Aide', 'Chief Director'] * (count // 2),
+        'jurisdictional_classification': [0.0, 1.0] * (count // 2),
+        'negotiating_unit': [5.0, 6.0] * (count // 2),
+        'agency_description': ['Tax', 'Health'] * (count // 2),
+    })
+
+
+def test_batches_match_single_predictions(tmp_path):
+    registry = make_registry(str(tmp_path))
+    listings = make_listings(10)
+
+    expected = [predict_job_level(listing, registry=registry)
+                for listing in listings.to_dict('records')]
+
+    assert expected[:2] == ['T', 'J']
+    assert list(predict_job_levels(listings, batch_size=3,
+                                   registry=registry)) == expected
+    assert list(predict_job_levels(iter(listings.to_dict('records')),
+                                   batch_size=4,
+                                   registry=registry)) == expected
+
+
+def test_levels_are_streamed_batch_by_batch(tmp_path):
+    registry = make_registry(str(tmp_path))
+    consumed = []
+
+    def listings():
+        for listing in make_listings(100).to_dict('records'):
+            consumed.append(listing)
+            yield listing
+
+    levels = predict_job_levels(listings(), batch_size=10, registry=registry)
+
+    assert next(levels) == 'T'
+    assert len(consumed) == 10
+    assert len(list(levels)) == 99
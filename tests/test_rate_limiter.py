@@ -0,0 +1,95 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import requests
+
+from scripts.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+def make_response(status_code, headers=None, retried_statuses=()):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = SimpleNamespace(retries=SimpleNamespace(history=[
+        SimpleNamespace(status=status) for status in retried_statuses
+    ]))
+    return response
+
+
+def test_acquire_spaces_requests_by_rate():
+    limiter = AdaptiveRateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire('example.com')
+    elapsed = time.monotonic() - start
+
+    # The first request uses the initial token, the other five wait 20ms each
+    assert elapsed >= 0.09
+    assert limiter.metrics()['example.com']['requests'] == 6
+
+
+def test_hosts_have_independent_buckets():
+    limiter = AdaptiveRateLimiter(rate=0.5)
+    limiter.acquire('a.example.com')
+    start = time.monotonic()
+    limiter.acquire('b.example.com')
+
+    assert time.monotonic() - start < 0.1
+
+
+def test_throttled_response_lowers_rate_and_honors_retry_after():
+    limiter = AdaptiveRateLimiter(rate=4, decrease_factor=0.5)
+    limiter.acquire('example.com')
+    limiter.record('example.com', make_response(429, {'Retry-After': '1'}))
+
+    metrics = limiter.metrics()['example.com']
+    assert metrics['rate'] == 2
+    assert metrics['throttled'] == 1
+    assert 0.9 < metrics['blocked_for'] <= 1
+
+
+def test_retried_throttling_is_detected_from_retry_history():
+    limiter = AdaptiveRateLimiter(rate=4)
+    limiter.acquire('example.com')
+    limiter.record('example.com', make_response(200, retried_statuses=[503]))
+
+    assert limiter.metrics()['example.com']['rate'] == 2
+
+
+def test_healthy_responses_slowly_raise_rate():
+    limiter = AdaptiveRateLimiter(
+        rate=1, max_rate=1.2, increase_step=0.1, increase_after=3
+    )
+    for _ in range(9):
+        limiter.record('example.com', make_response(200))
+
+    assert abs(limiter.metrics()['example.com']['rate'] - 1.2) < 1e-9
+
+
+def test_rate_stays_within_bounds():
+    limiter = AdaptiveRateLimiter(rate=1, min_rate=0.25)
+    for _ in range(5):
+        limiter.record('example.com', make_response(503))
+
+    assert limiter.metrics()['example.com']['rate'] == 0.25
+
+
+def test_cancelled_acquire_returns_false():
+    limiter = AdaptiveRateLimiter(rate=0.1)
+    limiter.acquire('example.com')
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+
+    assert limiter.acquire('example.com', cancel_event=cancel) is False
+
+
+def test_parse_retry_after():
+    now = 1700000000.0
+
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after(
+        'Tue, 14 Nov 2023 22:13:40 GMT', now=now
+    ) == 20
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,124 @@
+import time
+
+import requests
+
+from scripts.response_cache import ResponseCache
+
+
+def make_response(status_code, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeServer:
+    """Serves a fixed body and answers 304 when the ETag still matches."""
+
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.requests.append((url, params, dict(headers or {})))
+        if (headers or {}).get('If-None-Match') == self.etag:
+            return make_response(304)
+        return make_response(200, self.body, {
+            'ETag': self.etag,
+            'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT',
+            'Content-Type': 'text/html; charset=utf-8'
+        })
+
+
+def test_revalidates_with_conditional_headers(tmp_path):
+    server = FakeServer(b'<div class="job-listing">Engineer</div>')
+    with ResponseCache(str(tmp_path / 'cache.db')) as cache:
+        first = cache.get('https://example.com/jobs', {'page': 1},
+                          fetch=server.get)
+        second = cache.get('https://example.com/jobs', {'page': 1},
+                           fetch=server.get)
+
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.status_code == 200
+    assert second.content == server.body
+    assert second.text == server.body.decode('utf-8')
+    assert 'If-None-Match' not in server.requests[0][2]
+    assert server.requests[1][2]['If-None-Match'] == '"v1"'
+    assert server.requests[1][2]['If-Modified-Since'] == (
+        'Mon, 01 Jan 2024 00:00:00 GMT'
+    )
+
+
+def test_changed_page_replaces_cached_copy(tmp_path):
+    server = FakeServer(b'old')
+    with ResponseCache(str(tmp_path / 'cache.db')) as cache:
+        cache.get('https://example.com/jobs', fetch=server.get)
+        server.body, server.etag = b'new', '"v2"'
+        changed = cache.get('https://example.com/jobs', fetch=server.get)
+        cached = cache.get('https://example.com/jobs', fetch=server.get)
+
+    assert changed.from_cache is False
+    assert cached.from_cache is True
+    assert cached.content == b'new'
+
+
+def test_cache_is_keyed_by_params(tmp_path):
+    server = FakeServer(b'page')
+    with ResponseCache(str(tmp_path / 'cache.db')) as cache:
+        cache.get('https://example.com/jobs', {'page': 1}, fetch=server.get)
+        other = cache.get('https://example.com/jobs', {'page': 2},
+                          fetch=server.get)
+
+    assert other.from_cache is False
+    assert 'If-None-Match' not in server.requests[1][2]
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    server = FakeServer(b'page')
+    with ResponseCache(path) as cache:
+        cache.get('https://example.com/jobs', fetch=server.get)
+    with ResponseCache(path) as cache:
+        response = cache.get('https://example.com/jobs', fetch=server.get)
+
+    assert response.from_cache is True
+
+
+def test_max_age_skips_revalidation(tmp_path):
+    server = FakeServer(b'page')
+    with ResponseCache(str(tmp_path / 'cache.db'), max_age=60) as cache:
+        cache.get('https://example.com/jobs', fetch=server.get)
+        response = cache.get('https://example.com/jobs', fetch=server.get)
+
+    assert response.from_cache is True
+    assert len(server.requests) == 1
+
+
+def test_evicts_expired_entries(tmp_path):
+    server = FakeServer(b'page')
+    with ResponseCache(str(tmp_path / 'cache.db'), ttl=0.01) as cache:
+        cache.get('https://example.com/jobs', fetch=server.get)
+        time.sleep(0.02)
+        cache.evict()
+        response = cache.get('https://example.com/jobs', fetch=server.get)
+
+    assert response.from_cache is False
+    assert 'If-None-Match' not in server.requests[1][2]
+
+
+def test_evicts_least_recently_used_entries_over_max_size(tmp_path):
+    server = FakeServer(b'x' * 100)
+    with ResponseCache(str(tmp_path / 'cache.db'), max_size=250) as cache:
+        for page in range(1, 4):
+            cache.get('https://example.com/jobs', {'page': page},
+                      fetch=server.get)
+        oldest = cache.get('https://example.com/jobs', {'page': 1},
+                           fetch=server.get)
+        newest = cache.get('https://example.com/jobs', {'page': 3},
+                           fetch=server.get)
+
+    assert oldest.from_cache is False
+    assert newest.from_cache is True
@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+
+from scripts.rate_limiter import AdaptiveRateLimiter
+from scripts.scrape_job_listings import scrape_job_listings
+
+LAST_PAGE = 6
+
+
+class FakeBoard:
+    def __init__(self, last_page=LAST_PAGE, latency=0.0):
+        self.last_page = last_page
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        with self.lock:
+            self.requests.append((params['page'], time.monotonic()))
+        time.sleep(self.latency)
+        page = params['page']
+        listings = ''.join(
+            f"""
+            <div class="job-listing">
+                <h2 class="job-title">Job {page}-{i}</h2>
+                <div class="company">Acme</div>
+                <div class="location">Remote</div>
+                <div class="description">Listing {i}</div>
+            </div>
+            """
+            for i in range(2)
+        ) if page <= self.last_page else ''
+        response = requests.Response()
+        response.status_code = 200
+        response._content = f"<html><body>{listings}</body></html>".encode()
+        return response
+
+
+def scrape(board, rate=1000, **kwargs):
+    with patch('scripts.http_client.get', side_effect=board.get):
+        return scrape_job_listings(
+            'https://example.com/jobs',
+            rate_limiter=AdaptiveRateLimiter(rate=rate, max_rate=rate),
+            **kwargs
+        )
+
+
+def test_prefetch_returns_same_listings_as_sequential():
+    sequential = scrape(FakeBoard())
+    prefetched = scrape(FakeBoard(latency=0.01), prefetch=3)
+
+    assert len(sequential) == LAST_PAGE * 2
+    assert prefetched == sequential
+
+
+def test_prefetch_stops_shortly_after_the_last_page():
+    board = FakeBoard(latency=0.01)
+    scrape(board, rate=100, prefetch=3)
+
+    # Already started fetches may finish, queued ones are dropped
+    requested_pages = sorted(page for page, _ in board.requests)
+    assert requested_pages[:LAST_PAGE + 1] == list(range(1, LAST_PAGE + 2))
+    assert len(requested_pages) <= LAST_PAGE + 1 + 3
+
+
+def test_prefetch_keeps_rate_limit_between_requests():
+    board = FakeBoard(latency=0.02)
+    scrape(board, rate=20, prefetch=4)
+
+    starts = sorted(started for _, started in board.requests)
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+
+def test_prefetch_overlaps_request_latency():
+    sequential_board = FakeBoard(latency=0.05)
+    start = time.monotonic()
+    scrape(sequential_board)
+    sequential_time = time.monotonic() - start
+
+    prefetch_board = FakeBoard(latency=0.05)
+    start = time.monotonic()
+    scrape(prefetch_board, prefetch=4)
+    prefetch_time = time.monotonic() - start
+
+    assert prefetch_time < sequential_time / 2
+
+
+def test_parse_workers_only_prefetch_a_bounded_window():
+    board = FakeBoard(last_page=5)
+    scrape(board, parse_workers=1, prefetch=2)
+
+    # Pages 1-6 plus at most the prefetch window, not a whole queue's worth
+    requested_pages = sorted(page for page, _ in board.requests)
+    assert requested_pages[:6] == list(range(1, 7))
+    assert len(requested_pages) <= 6 + 2 + 1